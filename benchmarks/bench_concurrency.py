@@ -0,0 +1,91 @@
+"""
+Multi-threaded throughput of ConcurrentBTree against a plain BTree behind one global lock, for a mix of lookups,
+inserts and deletes.
+
+Usage: python benchmarks/bench_concurrency.py [--keys N] [--ops N] [--reads FRACTION] [--degree T]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+from concurrent_btree import ConcurrentBTree
+
+
+class LockedBTree:
+    """
+    Baseline wrapping every call to a BTree in one global lock.
+    """
+
+    def __init__(self, tree: BTree) -> None:
+        self.tree = tree
+        self.lock = threading.Lock()
+
+    def contains(self, element: str) -> bool:
+        with self.lock:
+            return self.tree.contains(element)
+
+    def insert(self, element: str) -> bool:
+        with self.lock:
+            return self.tree.insert(element)
+
+    def delete(self, element: str) -> str | None:
+        with self.lock:
+            return self.tree.delete(element)
+
+
+def run(tree, threads: int, ops: int, reads: float, key_space: int) -> float:
+    """
+    Run the workload on a tree from several threads.
+    :param tree: Tree to run on, with contains, insert and delete.
+    :param threads: Number of threads.
+    :param ops: Operations per thread.
+    :param reads: Fraction of the operations that are lookups, the rest are split between inserts and deletes.
+    :param key_space: Number of distinct keys.
+    :return: Operations per second over all threads.
+    """
+    def worker(seed: int) -> None:
+        generator = random.Random(seed)
+        for _ in range(ops):
+            key = f"key{generator.randrange(key_space):09d}"
+            choice = generator.random()
+            if choice < reads:
+                tree.contains(key)
+            elif choice < reads + (1 - reads) / 2:
+                tree.insert(key)
+            else:
+                tree.delete(key)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100_000, help="number of keys loaded before the run")
+    parser.add_argument("--ops", type=int, default=20_000, help="operations per thread")
+    parser.add_argument("--reads", type=float, default=0.9, help="fraction of operations that are lookups")
+    parser.add_argument("--degree", type=int, default=16, help="degree of the trees")
+    args = parser.parse_args()
+
+    keys = [f"key{number:09d}" for number in range(0, 2 * args.keys, 2)]
+
+    print(f"{'threads':>7} {'locked ops/s':>13} {'latched ops/s':>14} {'ratio':>6}")
+    for threads in (1, 2, 4, 8):
+        locked = run(LockedBTree(BTree.bulk_load(keys, args.degree)), threads, args.ops, args.reads, 2 * args.keys)
+        latched = run(ConcurrentBTree.bulk_load(keys, args.degree), threads, args.ops, args.reads, 2 * args.keys)
+        print(f"{threads:>7} {locked:>13.0f} {latched:>14.0f} {latched / locked:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
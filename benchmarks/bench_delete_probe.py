@@ -0,0 +1,78 @@
+"""
+Benchmark of deletes that probe for the element read-only first against the proactive top-down deletes, on workloads
+mixing inserts with deletes of which a growing share miss.
+
+Usage: python benchmarks/bench_delete_probe.py [--keys N] [--operations N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+
+
+def workload(keys: list[str], operations: int, miss_ratio: float) -> list[tuple[str, str]]:
+    """
+    Make a workload of half inserts and half deletes.
+    :param keys: Keys loaded into the tree to start with.
+    :param operations: Number of operations.
+    :param miss_ratio: Fraction of the deletes that target a key that was never inserted.
+    :return: Command and key of each operation.
+    """
+    commands = []
+    for number in range(operations):
+        if random.random() < 0.5:
+            commands.append(("insert", f"new{number:09d}"))
+        elif random.random() < miss_ratio:
+            commands.append(("delete", f"miss{number:09d}"))
+        else:
+            commands.append(("delete", random.choice(keys)))
+    return commands
+
+
+def run(keys: list[str], degree: int, commands: list[tuple[str, str]], probe: bool) -> float:
+    """
+    Time a workload on a freshly loaded tree.
+    :param keys: Sorted keys to load the tree with.
+    :param degree: Degree of the tree.
+    :param commands: Command and key of each operation.
+    :param probe: Whether deletes probe first.
+    :return: Seconds taken.
+    """
+    tree = BTree.bulk_load(keys, degree)
+    tree.probe_deletes = probe
+
+    insert, delete = tree.insert, tree.delete
+    start = time.perf_counter()
+    for command, key in commands:
+        if command == "insert":
+            insert(key)
+        else:
+            delete(key)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000, help="number of keys loaded to start with")
+    parser.add_argument("--operations", type=int, default=200_000, help="number of operations per workload")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keys = sorted(f"key{number:09d}" for number in random.sample(range(10 * args.keys), args.keys))
+
+    print(f"{'degree':>6} {'misses':>7} {'proactive':>10} {'probe':>8} {'speedup':>8}")
+    for degree in (2, 4, 32):
+        for miss_ratio in (0.0, 0.1, 0.5, 0.9):
+            commands = workload(keys, args.operations, miss_ratio)
+            proactive = run(keys, degree, commands, False)
+            probe = run(keys, degree, commands, True)
+            print(f"{degree:>6} {miss_ratio:>7.0%} {proactive:>9.2f}s {probe:>7.2f}s {proactive / probe:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Microbenchmark comparing the iterative insert/delete descent of BTree against the recursive descent it replaced.
+
+Usage: python benchmarks/bench_descent.py [--keys N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTNode, BTree
+
+
+class RecursiveBTree(BTree):
+    """
+    B-Tree using the previous recursive descent, kept here as the baseline.
+    """
+
+    def _finger_leaf(self, element: str) -> BTNode | None:
+        # The recursive descent does not report the leaf bounds, so the finger is never used
+        return None
+
+    def traverse_to_leaf(self, node: BTNode, search_elem: str, path: list[BTNode] | None = None,
+                         bounds: list[str | None] | None = None) -> tuple[None, int] | tuple[BTNode, int]:
+        if node == self.root and len(node.elements) == 2 * self.t - 1:
+            new_node = self.node_class()
+            self.root = new_node
+            new_node.children.append(node)
+            node.split_node(0, new_node)
+            node = new_node
+
+        traverse_index, is_found = node.search(search_elem)
+        if is_found:
+            return None, -1
+
+        if node.is_leaf:
+            return node, traverse_index
+
+        next_node = node.children[traverse_index]
+        if len(next_node.elements) == 2 * self.t - 1:
+            # Search the same node again after the split
+            next_node.split_node(traverse_index, node)
+            return self.traverse_to_leaf(node, search_elem)
+        return self.traverse_to_leaf(next_node, search_elem)
+
+    def traverse_and_find(self, node: BTNode, search_elem: str,
+                          path: list[BTNode] | None = None) -> tuple[BTNode, int] | tuple[None, int]:
+        traverse_index, is_found = node.search(search_elem)
+        if is_found:
+            return node, traverse_index
+
+        if node.is_leaf:
+            return None, -1
+
+        child_node = node.children[traverse_index]
+        if len(child_node.elements) == self.t - 1:
+            if traverse_index != 0 and len(node.children[traverse_index - 1].elements) >= self.t:
+                node.rotate_from_left(traverse_index)
+            elif traverse_index != len(node.elements) and len(node.children[traverse_index + 1].elements) >= self.t:
+                node.rotate_from_right(traverse_index)
+            else:
+                if traverse_index != len(node.elements):
+                    merged_node = node.merge_children(traverse_index)
+                else:
+                    merged_node = node.merge_children(traverse_index - 1)
+                if not self.root.elements:
+                    self.root = merged_node
+                return self.traverse_and_find(merged_node, search_elem)
+
+        return self.traverse_and_find(node.children[traverse_index], search_elem)
+
+    def _delete(self, start_node: BTNode, element: str, path: list[BTNode] | None = None) -> str | None:
+        found_node, found_index = self.traverse_and_find(start_node, element)
+        if not found_node:
+            return None
+
+        if found_node.is_leaf and (len(found_node.elements) >= self.t or found_node == self.root):
+            removed_elem = found_node.elements.pop(found_index)
+            if found_node == self.root and not found_node.elements:
+                self.root = None
+            return removed_elem
+
+        left_node = found_node.children[found_index]
+        if len(left_node.elements) >= self.t:
+            pred_elem = found_node.get_predecessor(found_index)
+            found_node.elements[found_index] = pred_elem
+            return self._delete(left_node, pred_elem)
+
+        right_node = found_node.children[found_index + 1]
+        if len(right_node.elements) >= self.t:
+            succ_elem = found_node.get_successor(found_index + 1)
+            found_node.elements[found_index] = succ_elem
+            return self._delete(right_node, succ_elem)
+
+        merged_node = found_node.merge_children(found_index)
+        if not self.root.elements:
+            self.root = merged_node
+        return self._delete(merged_node, element)
+
+
+def time_operations(tree_class: type[BTree], degree: int, keys: list[str], repeat: int) -> tuple[float, float]:
+    """
+    Time inserting every key and then deleting every key.
+    :param tree_class: B-Tree class to benchmark.
+    :param degree: Degree of the B-Tree.
+    :param keys: Keys to insert and delete, in the order they are applied.
+    :param repeat: Number of runs, the fastest one is reported.
+    :return: Best microseconds per insert and per delete.
+    """
+    best_insert = best_delete = float("inf")
+    for _ in range(repeat):
+        tree = tree_class(degree)
+
+        start = time.perf_counter()
+        for key in keys:
+            tree.insert(key)
+        middle = time.perf_counter()
+        for key in keys:
+            tree.delete(key)
+        end = time.perf_counter()
+
+        best_insert = min(best_insert, (middle - start) / len(keys) * 1e6)
+        best_delete = min(best_delete, (end - middle) / len(keys) * 1e6)
+
+    return best_insert, best_delete
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=100_000, help="number of keys to insert and delete")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per configuration")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keys = [f"key{number:09d}" for number in random.sample(range(10 * args.keys), args.keys)]
+
+    print(f"{'t':>3} {'op':>7} {'recursive us':>13} {'iterative us':>13} {'speedup':>8}")
+    for degree in (2, 3, 4):
+        old_insert, old_delete = time_operations(RecursiveBTree, degree, keys, args.repeat)
+        new_insert, new_delete = time_operations(BTree, degree, keys, args.repeat)
+        print(f"{degree:>3} {'insert':>7} {old_insert:>13.2f} {new_insert:>13.2f} {old_insert / new_insert:>7.2f}x")
+        print(f"{degree:>3} {'delete':>7} {old_delete:>13.2f} {new_delete:>13.2f} {old_delete / new_delete:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
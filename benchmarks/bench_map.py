@@ -0,0 +1,84 @@
+"""
+Throughput of the B-Tree map against a B-Tree of keys next to a dict of values, for puts, gets, pops and ordered
+iteration over the items.
+
+Usage: python benchmarks/bench_map.py [--keys N] [--degree T]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+from btree_map import BTreeMap
+
+
+class TreeAndDict:
+    """
+    Class representing the two structure layout the map replaces, a B-Tree for order and a dict for the values.
+    """
+
+    def __init__(self, degree: int) -> None:
+        self.tree = BTree(degree)
+        self.values = {}
+
+    def put(self, key: str, value: int) -> None:
+        if key not in self.values:
+            self.tree.insert(key)
+        self.values[key] = value
+
+    def get(self, key: str) -> int | None:
+        return self.values.get(key) if self.tree.contains(key) else None
+
+    def pop(self, key: str) -> int | None:
+        self.tree.delete(key)
+        return self.values.pop(key, None)
+
+    def items(self):
+        for key in self.tree:
+            yield key, self.values[key]
+
+
+def timed(operation, keys) -> float:
+    """
+    Run an operation on every key.
+    :param operation: Function to call with each key.
+    :param keys: The keys.
+    :return: Operations per second.
+    """
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000, help="number of keys put into each map")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the B-Trees")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keys = [f"key{number:09d}" for number in random.sample(range(10 * args.keys), args.keys)]
+
+    print(f"{'layout':>12} {'puts/s':>10} {'updates/s':>10} {'gets/s':>10} {'items/s':>10} {'pops/s':>10}")
+    for layout in (TreeAndDict, BTreeMap):
+        tree = layout(args.degree)
+        puts = timed(lambda key: tree.put(key, 1), keys)
+        updates = timed(lambda key: tree.put(key, 2), keys)
+        gets = timed(tree.get, keys)
+
+        start = time.perf_counter()
+        for _ in tree.items():
+            pass
+        items = args.keys / (time.perf_counter() - start)
+
+        pops = timed(tree.pop, keys)
+        print(f"{layout.__name__:>12} {puts:>10.0f} {updates:>10.0f} {gets:>10.0f} {items:>10.0f} {pops:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Memory and lookup speed of a prefix compressed B-Tree against a plain one, for URL-like keys with long shared prefixes.
+Memory counts the nodes and the stored key strings, since the keys are what front coding shrinks.
+
+Usage: python benchmarks/bench_prefix.py [--keys N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+from prefix_btree import PrefixCompressedBTree
+
+
+def build(tree_class: type[BTree], keys: list[str], degree: int) -> tuple[BTree, int]:
+    """
+    Bulk load a tree from fresh copies of the keys, measuring what it allocates.
+    :param tree_class: B-Tree class to build.
+    :param keys: Sorted keys.
+    :param degree: Degree of the tree.
+    :return: The tree and the bytes allocated for it.
+    """
+    tracemalloc.start()
+    # Fresh strings, so that the plain tree is charged for its own copy of the keys like the compressed one
+    tree = tree_class.bulk_load(("".join(key) for key in keys), degree)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000, help="number of keys in each tree")
+    args = parser.parse_args()
+
+    random.seed(0)
+    sections = ["users", "teams", "projects", "issues"]
+    keys = sorted({f"https://api.example.com/v2/{random.choice(sections)}/{random.randrange(10 ** 9):09d}/settings"
+                   for _ in range(args.keys)})
+    lookups = random.sample(keys, min(len(keys), 100_000))
+
+    print(f"{'t':>4} {'plain B/key':>12} {'prefix B/key':>13} {'plain us/get':>13} {'prefix us/get':>14}")
+    for degree in (8, 32, 128):
+        row = []
+        timings = []
+        for tree_class in (BTree, PrefixCompressedBTree):
+            tree, allocated = build(tree_class, keys, degree)
+            row.append(allocated / len(keys))
+
+            get = tree.get
+            start = time.perf_counter()
+            for key in lookups:
+                get(key)
+            timings.append((time.perf_counter() - start) / len(lookups) * 1e6)
+
+        print(f"{degree:>4} {row[0]:>12.1f} {row[1]:>13.1f} {timings[0]:>13.2f} {timings[1]:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Ordered scan throughput of the B+Tree with linked leaves against the B-Tree, for full iteration and for short range
+scans, along with point lookups and tree height.
+
+Usage: python benchmarks/bench_scan.py [--keys N] [--scans N] [--scan-length N]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bplustree import BPlusTree
+from btree import BTree
+
+
+def height(tree) -> int:
+    """
+    Count the levels of a tree.
+    :param tree: A B-Tree or B+Tree.
+    :return: Number of levels.
+    """
+    levels = 0
+    node = tree.root
+    while node is not None:
+        levels += 1
+        node = None if node.is_leaf else node.children[0]
+    return levels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=500_000, help="number of keys in each tree")
+    parser.add_argument("--scans", type=int, default=20_000, help="number of short range scans")
+    parser.add_argument("--scan-length", type=int, default=100, help="number of keys read by each short scan")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keys = [f"key{number:09d}" for number in range(args.keys)]
+    starts = [random.choice(keys) for _ in range(args.scans)]
+
+    print(f"{'tree':>8} {'t':>4} {'height':>6} {'full scan keys/s':>17} {'short scans/s':>14} {'gets/s':>10}")
+    for degree in (4, 32, 128):
+        for tree_class in (BTree, BPlusTree):
+            tree = tree_class.bulk_load(keys, degree)
+
+            start = time.perf_counter()
+            for _ in tree:
+                pass
+            full = args.keys / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for lo in starts:
+                for _ in itertools.islice(tree.range(lo), args.scan_length):
+                    pass
+            short = args.scans / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for lo in starts:
+                tree.get(lo)
+            gets = args.scans / (time.perf_counter() - start)
+
+            print(f"{tree_class.__name__:>8} {degree:>4} {height(tree):>6} {full:>17.0f} {short:>14.0f} {gets:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
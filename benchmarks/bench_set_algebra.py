@@ -0,0 +1,83 @@
+"""
+Time to combine a base tree with a delta tree through the merging set operations against copying the base and
+applying the delta key by key with insert and delete.
+
+Usage: python benchmarks/bench_set_algebra.py [--base N] [--degree T] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+
+
+def key_by_key(base: BTree, delta: BTree, operation: str) -> BTree:
+    """
+    Combine two trees the way it was done before the set operations, copying the base then walking the delta.
+    :param base: The base tree.
+    :param delta: The delta tree.
+    :param operation: "union", "difference" or "intersection".
+    :return: The combined tree.
+    """
+    if operation == "intersection":
+        result = BTree(base.t)
+        for element in delta:
+            if base.contains(element):
+                result.insert(element)
+        return result
+
+    result = BTree.bulk_load(base, base.t)
+    for element in delta:
+        if operation == "union":
+            result.insert(element)
+        else:
+            result.delete(element)
+    return result
+
+
+def timed(build, repeat: int) -> tuple[BTree, float]:
+    """
+    Build a tree several times.
+    :param build: Function building the tree.
+    :param repeat: Number of times to build it.
+    :return: The last tree built and the fastest time taken, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tree = build()
+        best = min(best, time.perf_counter() - start)
+    return tree, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base", type=int, default=500_000, help="number of keys in the base tree")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the B-Trees")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs to take the fastest of")
+    args = parser.parse_args()
+
+    random.seed(0)
+    universe = random.sample(range(10 * args.base), 2 * args.base)
+    base = BTree.bulk_load(sorted(f"key{number:09d}" for number in universe[:args.base]), args.degree)
+
+    print(f"{'delta':>8} {'operation':>12} {'key by key s':>13} {'merge s':>8}")
+    for delta_size in (args.base // 100, args.base // 10, args.base):
+        # Half of the delta is already in the base, half is new
+        delta_keys = universe[:delta_size // 2] + universe[args.base:args.base + delta_size // 2]
+        delta = BTree.bulk_load(sorted(f"key{number:09d}" for number in delta_keys), args.degree)
+
+        for operation in ("union", "difference", "intersection"):
+            expected, slow = timed(lambda: key_by_key(base, delta, operation), args.repeat)
+            result, fast = timed(lambda: getattr(base, operation)(delta), args.repeat)
+
+            assert list(result) == list(expected)
+            print(f"{delta_size:>8} {operation:>12} {slow:>13.3f} {fast:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
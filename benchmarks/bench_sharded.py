@@ -0,0 +1,63 @@
+"""
+Throughput of batched inserts and lookups on a ShardedBTree with a growing number of worker processes, against a
+single in-process BTree.
+
+Usage: python benchmarks/bench_sharded.py [--keys N] [--batch N] [--degree T]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+from sharded_btree import ShardedBTree, boundaries_from_sample
+
+
+def run(tree, keys: list[str], batch: int) -> tuple[float, float]:
+    """
+    Insert every key and then look every key up, in batches.
+    :param tree: Tree with insert_many and a contains_many or contains.
+    :param keys: Keys in the order they are applied.
+    :param batch: Number of keys per batch.
+    :return: Inserts per second and lookups per second.
+    """
+    start = time.perf_counter()
+    for position in range(0, len(keys), batch):
+        tree.insert_many(keys[position:position + batch])
+    middle = time.perf_counter()
+
+    contains_many = getattr(tree, "contains_many", lambda elements: [tree.contains(element) for element in elements])
+    for position in range(0, len(keys), batch):
+        contains_many(keys[position:position + batch])
+    end = time.perf_counter()
+
+    return len(keys) / (middle - start), len(keys) / (end - middle)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000, help="number of keys to insert and look up")
+    parser.add_argument("--batch", type=int, default=50_000, help="number of keys per batch")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the trees")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keys = [f"key{number:09d}" for number in random.sample(range(10 * args.keys), args.keys)]
+
+    print(f"{'shards':>6} {'inserts/s':>11} {'lookups/s':>11}")
+    inserts, lookups = run(BTree(args.degree), keys, args.batch)
+    print(f"{'local':>6} {inserts:>11.0f} {lookups:>11.0f}")
+
+    for shards in (1, 2, 4, 8):
+        if shards > (os.cpu_count() or 1):
+            break
+        with ShardedBTree(args.degree, boundaries_from_sample(keys[:10_000], shards)) as tree:
+            inserts, lookups = run(tree, keys, args.batch)
+        print(f"{shards:>6} {inserts:>11.0f} {lookups:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of persisting a B-Tree with the binary dump/load snapshot against writing the ordered elements and
+inserting them all again.
+
+Usage: python benchmarks/bench_snapshot.py [--keys N] [--degree T]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTree
+
+
+def time_call(function, *args) -> tuple[float, object]:
+    """
+    Time a single call.
+    :param function: Function to call.
+    :param args: Arguments to call it with.
+    :return: Seconds taken and the value returned.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def reinsert_dump(tree: BTree, path: str) -> None:
+    """
+    Write the ordered elements of a tree, one per line.
+    :param tree: Tree to write.
+    :param path: Path of the file.
+    :return: None
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(tree.get_tree_ordered_elems()))
+
+
+def reinsert_load(path: str, degree: int) -> BTree:
+    """
+    Rebuild a tree by inserting every element of a file written by reinsert_dump.
+    :param path: Path of the file.
+    :param degree: Degree of the tree.
+    :return: The rebuilt tree.
+    """
+    tree = BTree(degree)
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            tree.insert(line.rstrip("\n"))
+    return tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=10_000_000, help="number of keys in the tree")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the tree")
+    args = parser.parse_args()
+
+    tree = BTree.bulk_load((f"key{number:010d}" for number in range(args.keys)), args.degree)
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "tree.snapshot")
+        text_path = os.path.join(directory, "tree.txt")
+
+        dump_seconds, _ = time_call(tree.dump, snapshot_path)
+        load_seconds, loaded = time_call(BTree.load, snapshot_path)
+        assert loaded.contains(f"key{args.keys - 1:010d}")
+        del loaded
+
+        text_dump_seconds, _ = time_call(reinsert_dump, tree, text_path)
+        insert_seconds, rebuilt = time_call(reinsert_load, text_path, args.degree)
+        assert rebuilt.contains(f"key{args.keys - 1:010d}")
+
+        print(f"{'method':>10} {'write s':>9} {'read s':>9} {'file MB':>9}")
+        print(f"{'snapshot':>10} {dump_seconds:>9.2f} {load_seconds:>9.2f} "
+              f"{os.path.getsize(snapshot_path) / 1e6:>9.1f}")
+        print(f"{'re-insert':>10} {text_dump_seconds:>9.2f} {insert_seconds:>9.2f} "
+              f"{os.path.getsize(text_path) / 1e6:>9.1f}")
+        print(f"load speedup: {insert_seconds / load_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load generator for btree_server.py, reporting throughput and p50/p99 request latency with many concurrent pipelined
+connections. Starts a server in the same process unless --port or --unix points at a running one.
+
+Usage: python benchmarks/loadgen.py [--port PORT | --unix PATH] [--connections N] [--depth D] [--requests N]
+                                    [--writes FRACTION] [--keys N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import OrderStatisticBTree
+from btree_server import BTreeServer, serve
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """
+    Get a percentile of sorted latencies.
+    :param latencies: Latencies in increasing order.
+    :param fraction: Percentile as a fraction, 0.99 for p99.
+    :return: The latency at that percentile.
+    """
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+async def client(connect, seed: int, requests: int, depth: int, writes: float, keys: int,
+                 latencies: list[float]) -> None:
+    """
+    Send requests on one connection, keeping up to depth of them in flight.
+    :param connect: Coroutine function opening a connection.
+    :param seed: Seed of the request mix.
+    :param requests: Number of requests to send.
+    :param depth: Maximum number of requests in flight.
+    :param writes: Fraction of requests that are inserts or deletes, the rest are gets.
+    :param keys: Number of distinct keys.
+    :param latencies: List to add the latency of every request to.
+    :return: None
+    """
+    generator = random.Random(seed)
+    reader, writer = await connect()
+    sent_times = asyncio.Queue(depth)
+
+    async def receive() -> None:
+        for _ in range(requests):
+            await reader.readline()
+            latencies.append(time.perf_counter() - await sent_times.get())
+
+    receiver = asyncio.create_task(receive())
+    for _ in range(requests):
+        key = f"key{generator.randrange(keys):09d}"
+        choice = generator.random()
+        command = "get" if choice >= writes else "insert" if choice < writes / 2 else "delete"
+
+        # Blocks while depth requests are waiting for their replies
+        await sent_times.put(time.perf_counter())
+        writer.write(f"{command} {key}\n".encode())
+        if sent_times.full():
+            await writer.drain()
+
+    await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="host of a running server")
+    parser.add_argument("--port", type=int, help="port of a running server")
+    parser.add_argument("--unix", help="Unix socket of a running server")
+    parser.add_argument("--connections", type=int, default=64, help="number of concurrent connections")
+    parser.add_argument("--depth", type=int, default=16, help="requests in flight per connection")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per connection")
+    parser.add_argument("--writes", type=float, default=0.2, help="fraction of requests that are writes")
+    parser.add_argument("--keys", type=int, default=100_000, help="number of distinct keys")
+    args = parser.parse_args()
+
+    listener = None
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        port = args.port
+        # Nothing to connect to, serve a fresh tree from this process
+        if port is None:
+            listener = await serve(BTreeServer(OrderStatisticBTree(32)), args.host, 0)
+            port = listener.sockets[0].getsockname()[1]
+        connect = lambda: asyncio.open_connection(args.host, port)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(connect, seed, args.requests, args.depth, args.writes, args.keys, latencies)
+                           for seed in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    if listener:
+        listener.close()
+        await listener.wait_closed()
+
+    latencies.sort()
+    print(f"requests: {len(latencies)}  throughput: {len(latencies) / elapsed:.0f} req/s")
+    print(f"p50: {percentile(latencies, 0.5) * 1e3:.2f} ms  p99: {percentile(latencies, 0.99) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Memory report of the B-Tree node layouts, in bytes of node overhead per key (the key strings themselves are shared
+between the layouts and not counted).
+
+Usage: python benchmarks/node_memory.py [--keys N]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from btree import BTNode, BTree
+
+
+class DictNode:
+    """
+    Original node layout: an instance __dict__, an is_leaf flag and a children list on every node.
+    """
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        self.children = []
+        self.elements = []
+        self.is_leaf = is_leaf
+
+
+class SlotsNode:
+    """
+    Node layout with __slots__ only: is_leaf stays a field and leaves still get an empty children list.
+    """
+
+    __slots__ = ("children", "elements", "is_leaf")
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        self.children = []
+        self.elements = []
+        self.is_leaf = is_leaf
+
+
+def copy_tree(node: BTNode, node_class: type) -> object:
+    """
+    Copy the shape and elements of a tree into nodes of another layout.
+    :param node: Root of the tree to copy.
+    :param node_class: Class of the nodes to create.
+    :return: Root of the copy.
+    """
+    copy = node_class(node.is_leaf)
+    copy.elements = node.elements[:]
+    if not node.is_leaf:
+        copy.children = [copy_tree(child, node_class) for child in node.children]
+    return copy
+
+
+def measure(root: BTNode, node_class: type) -> int:
+    """
+    Measure the memory used by the nodes of a copy of a tree.
+    :param root: Root of the tree to copy.
+    :param node_class: Class of the nodes to create.
+    :return: Bytes allocated for the copy.
+    """
+    tracemalloc.start()
+    copy = copy_tree(root, node_class)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del copy
+    return allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=200_000, help="number of keys in each tree")
+    args = parser.parse_args()
+
+    keys = [f"key{number:09d}" for number in range(args.keys)]
+    layouts = [("dict", DictNode), ("slots", SlotsNode), ("compact", BTNode)]
+
+    print(f"{'t':>4} " + " ".join(f"{name + ' B/key':>14}" for name, _ in layouts))
+    for degree in (2, 3, 8, 32, 128):
+        tree = BTree.bulk_load(keys, degree)
+        sizes = [measure(tree.root, node_class) / args.keys for _, node_class in layouts]
+        print(f"{degree:>4} " + " ".join(f"{size:>14.1f}" for size in sizes))
+
+
+if __name__ == "__main__":
+    main()
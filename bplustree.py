@@ -0,0 +1,402 @@
+from collections.abc import Iterable, Iterator
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, BTNode, check_strictly_increasing, pack_level, take_prefix
+
+
+class BPlusNode(BTNode):
+    """
+    Class representing a B+Tree node. Internal nodes only hold separators, the keys all live in the leaves, which are
+    linked to their neighbours in key order.
+
+    Attributes:
+        prev_leaf: Leaf to the left of this one, None for the leftmost leaf and for internal nodes.
+        next_leaf: Leaf to the right of this one, None for the rightmost leaf and for internal nodes.
+    """
+
+    __slots__ = ("prev_leaf", "next_leaf")
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        """
+        Constructor for B+Tree node.
+        """
+        super().__init__(is_leaf)
+        self.prev_leaf: BPlusNode | None = None
+        self.next_leaf: BPlusNode | None = None
+
+    def child_index(self, search_elem: str) -> int:
+        """
+        Get the child of an internal node to go down to for an element. A separator equal to the element is the
+        first key of the subtree to its right.
+        :param search_elem: Element to search for.
+        :return: Index of the child.
+        """
+        index, is_found = self.search(search_elem)
+        return index + 1 if is_found else index
+
+    def split_node(self, insert_loc: int, parent_node: 'BPlusNode') -> None:
+        """
+        Split B+Tree node into two B+Tree nodes. A leaf keeps every key, copying the first key of its new right half
+        up to the parent and linking the halves in between its neighbours.
+        :param insert_loc: Location to insert the separator into the parent B+Tree node.
+        :param parent_node: Parent B+Tree node.
+        :return: None
+        """
+        # Internal nodes split like B-Tree nodes, moving the median separator up
+        if not self.is_leaf:
+            super().split_node(insert_loc, parent_node)
+            return
+
+        neigh_node = type(self)(True)
+        median_ind = len(self.elements) // 2
+        neigh_node.elements = self.elements[median_ind:]
+        self.elements = self.elements[:median_ind]
+
+        # Link the new leaf in right after this one
+        neigh_node.prev_leaf = self
+        neigh_node.next_leaf = self.next_leaf
+        if self.next_leaf is not None:
+            self.next_leaf.prev_leaf = neigh_node
+        self.next_leaf = neigh_node
+
+        parent_node.elements.insert(insert_loc, neigh_node.elements[0])
+        parent_node.children.insert(insert_loc + 1, neigh_node)
+
+    def merge_children(self, elem_index: int) -> 'BPlusNode':
+        """
+        Merge B+Tree nodes into a B+Tree node. Leaves drop the separator between them instead of taking it in, and
+        the right leaf is unlinked.
+        :param elem_index: Index of the separator between the two children.
+        :return: The merged B+Tree node.
+        """
+        left_node = self.children[elem_index]
+        if not left_node.is_leaf:
+            return super().merge_children(elem_index)
+
+        right_node = self.children[elem_index + 1]
+        left_node.elements += right_node.elements
+
+        # Unlink the right leaf
+        left_node.next_leaf = right_node.next_leaf
+        if right_node.next_leaf is not None:
+            right_node.next_leaf.prev_leaf = left_node
+
+        self.elements.pop(elem_index)
+        self.children.pop(elem_index + 1)
+
+        return left_node
+
+    def rotate_from_left(self, elem_index: int) -> None:
+        """
+        Move the last key of the left sibling into the child. For leaves the separator becomes the moved key.
+        :param elem_index: Index of the child.
+        :return: None
+        """
+        child_node = self.children[elem_index]
+        if not child_node.is_leaf:
+            super().rotate_from_left(elem_index)
+            return
+
+        child_node.elements.insert(0, self.children[elem_index - 1].elements.pop())
+        self.elements[elem_index - 1] = child_node.elements[0]
+
+    def rotate_from_right(self, elem_index: int) -> None:
+        """
+        Move the first key of the right sibling into the child. For leaves the separator becomes the new first key
+        of the sibling.
+        :param elem_index: Index of the child.
+        :return: None
+        """
+        child_node = self.children[elem_index]
+        if not child_node.is_leaf:
+            super().rotate_from_right(elem_index)
+            return
+
+        right_sibling = self.children[elem_index + 1]
+        child_node.elements.append(right_sibling.elements.pop(0))
+        self.elements[elem_index] = right_sibling.elements[0]
+
+
+class BPlusTree:
+    """
+    Class representing a B+Tree. Every key is stored in a leaf and internal nodes only route, so ordered scans are a
+    walk along the linked leaves instead of an in-order traversal. Inserts split full nodes on the way down like
+    BTree does, deletes remove the key from its leaf and then borrow or merge back up the path where a node runs
+    short. Separators are left alone when the key they were copied from is deleted, since they still route correctly.
+
+    Attributes:
+        root: Root of B+Tree.
+        t: Determines the min and max elements and branches of the B+Tree.
+        verbosity: Verbosity level.
+        size: Number of keys in the tree.
+    """
+
+    # Class used to create the nodes of the tree
+    node_class = BPlusNode
+
+    def __init__(self, degree: int, verbosity: int = 0) -> None:
+        """
+        Constructor for B+Tree.
+        :param degree: Degree of the B+Tree.
+        :param verbosity: Verbosity level.
+        """
+        self.root: BPlusNode | None = None
+        self.t = degree
+        self.verbosity = verbosity
+        self.size = 0
+
+    @classmethod
+    def bulk_load(cls, elements: Iterable[str], degree: int, fill_factor: float = 1.0,
+                  verbosity: int = 0) -> 'BPlusTree':
+        """
+        Build a B+Tree bottom-up from elements that are already sorted, without going through insert.
+        :param elements: Elements in strictly increasing order.
+        :param degree: Degree of the B+Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B+Tree.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be greater than 0 and at most 1")
+
+        tree = cls(degree, verbosity)
+        keys = list(elements)
+        check_strictly_increasing(keys)
+
+        if not keys:
+            return tree
+
+        max_elements = 2 * degree - 1
+        leaf_capacity = min(max_elements, max(degree - 1, round(fill_factor * max_elements)))
+
+        # Leaves keep every key, each leaf after the first is routed to by a copy of its first key
+        nodes, separators = pack_level(cls.node_class, keys, None, leaf_capacity, degree, copy_separators=True)
+        for left_leaf, right_leaf in zip(nodes, nodes[1:]):
+            left_leaf.next_leaf = right_leaf
+            right_leaf.prev_leaf = left_leaf
+
+        while len(nodes) > 1:
+            nodes, separators = pack_level(cls.node_class, separators, nodes, max_elements, degree)
+
+        tree.root = nodes[0]
+        tree.size = len(keys)
+        return tree
+
+    def _find_leaf(self, element: str, path: list[tuple[BPlusNode, int]] | None = None) -> BPlusNode:
+        """
+        Walk down to the leaf an element belongs in.
+        :param element: Element to search for.
+        :param path: If given, each internal node passed through and the index of the child taken are appended to it.
+        :return: The leaf.
+        """
+        node = self.root
+        while not node.is_leaf:
+            index = node.child_index(element)
+            if path is not None:
+                path.append((node, index))
+            node = node.children[index]
+        return node
+
+    def _leftmost_leaf(self) -> BPlusNode:
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[0]
+        return node
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        """
+        Look up an element.
+        :param element: Element to search for.
+        :param default: Value to return when the element is not in the tree.
+        :return: The element stored in the tree, default if it is not found.
+        """
+        if not self.root:
+            return default
+
+        leaf_node = self._find_leaf(element)
+        index, is_found = leaf_node.search(element)
+        return leaf_node.elements[index] if is_found else default
+
+    def contains(self, element: str) -> bool:
+        """
+        Check if an element is in the tree.
+        :param element: Element to search for.
+        :return: True if the element is in the tree, False otherwise.
+        """
+        return self.root is not None and self._find_leaf(element).search(element)[1]
+
+    def __contains__(self, element: str) -> bool:
+        return self.contains(element)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, element: str) -> bool:
+        """
+        Insert element into its leaf, splitting full nodes on the way down.
+        :param element: Element to insert.
+        :return: True if the element was inserted, False if it was already in the tree.
+        """
+        max_elements = 2 * self.t - 1
+
+        # An empty tree starts out as a single leaf
+        if not self.root:
+            self.root = self.node_class(True)
+            self.root.elements.append(element)
+            self.size = 1
+            return True
+
+        # A full root is split first, growing the tree by one level
+        if len(self.root.elements) == max_elements:
+            new_root = self.node_class(False)
+            new_root.children.append(self.root)
+            self.root.split_node(0, new_root)
+            self.root = new_root
+
+        node = self.root
+        while not node.is_leaf:
+            index = node.child_index(element)
+            child_node = node.children[index]
+
+            # Split a full child before going down so there is always room for a separator coming up
+            if len(child_node.elements) == max_elements:
+                child_node.split_node(index, node)
+                if element >= node.elements[index]:
+                    index += 1
+                child_node = node.children[index]
+
+            node = child_node
+
+        index, is_found = node.search(element)
+        if is_found:
+            if self.verbosity:
+                print("Element is already in the tree")
+            return False
+
+        node.elements.insert(index, element)
+        self.size += 1
+        return True
+
+    def delete(self, element: str) -> str | None:
+        """
+        Delete element from its leaf, then borrow or merge back up the path wherever a node is left short.
+        :param element: Element to delete.
+        :return: Element that was deleted, None if element was not found.
+        """
+        if not self.root:
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        path = []
+        leaf_node = self._find_leaf(element, path)
+        index, is_found = leaf_node.search(element)
+        if not is_found:
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        removed_elem = leaf_node.elements.pop(index)
+        self.size -= 1
+
+        min_elements = self.t - 1
+        node = leaf_node
+        while path and len(node.elements) < min_elements:
+            parent_node, index = path.pop()
+
+            if index > 0 and len(parent_node.children[index - 1].elements) > min_elements:
+                # The parent keeps its number of separators, so nothing further up changes
+                parent_node.rotate_from_left(index)
+                break
+
+            if index < len(parent_node.elements) and len(parent_node.children[index + 1].elements) > min_elements:
+                parent_node.rotate_from_right(index)
+                break
+
+            # Both neighbours are at the minimum, merge with one of them and check the parent next
+            parent_node.merge_children(index - 1 if index > 0 else index)
+            node = parent_node
+
+        # A root left without separators hands over to its only child, an empty root leaf empties the tree
+        if not self.root.elements:
+            self.root = None if self.root.is_leaf else self.root.children[0]
+
+        return removed_elem
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Insert a batch of elements in sorted order.
+        :param elements: Elements to insert.
+        :return: Each element in sorted order with its outcome, INSERTED or DUPLICATE.
+        """
+        return [(element, INSERTED if self.insert(element) else DUPLICATE) for element in sorted(elements)]
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Delete a batch of elements in sorted order.
+        :param elements: Elements to delete.
+        :return: Each element in sorted order with its outcome, DELETED or NOT_FOUND.
+        """
+        return [(element, NOT_FOUND if self.delete(element) is None else DELETED) for element in sorted(elements)]
+
+    def get_tree_ordered_elems(self) -> list[str]:
+        """
+        Gets the ordered elements from the tree
+        :return: A list of ordered elements.
+        """
+        return list(self)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Lazily iterate over the elements of the tree in order, one leaf at a time.
+        The tree must not be modified while the iterator is in use.
+        :return: An iterator over the ordered elements.
+        """
+        return self.range()
+
+    def range(self, lo: str | None = None, hi: str | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> Iterator[str]:
+        """
+        Lazily iterate over the elements between lo and hi in order, walking the linked leaves from the one lo
+        belongs in.
+        The tree must not be modified while the iterator is in use.
+        :param lo: Lower bound, None to start from the smallest element.
+        :param hi: Upper bound, None to run until the largest element.
+        :param inclusive: Whether lo and hi themselves are included.
+        :return: An iterator over the ordered elements in the range.
+        """
+        if not self.root:
+            return
+
+        lo_inclusive, hi_inclusive = inclusive
+        if lo is None:
+            leaf_node, index = self._leftmost_leaf(), 0
+        else:
+            leaf_node = self._find_leaf(lo)
+            index, is_found = leaf_node.search(lo)
+            if is_found and not lo_inclusive:
+                index += 1
+
+        while leaf_node is not None:
+            elements = leaf_node.elements
+
+            # The whole rest of the leaf is in range, hand it over in one go
+            if hi is None or (elements and elements[-1] < hi):
+                yield from elements[index:]
+            else:
+                for position in range(index, len(elements)):
+                    element = elements[position]
+                    if element > hi or (element == hi and not hi_inclusive):
+                        return
+                    yield element
+
+            leaf_node, index = leaf_node.next_leaf, 0
+
+    def prefix_scan(self, prefix: str, limit: int | None = None) -> Iterator[str]:
+        """
+        Lazily iterate over the elements that start with prefix in order.
+        The tree must not be modified while the iterator is in use.
+        :param prefix: Prefix the elements must start with.
+        :param limit: Maximum number of elements to yield, None for no limit.
+        :return: An iterator over the ordered elements with the prefix.
+        """
+        return take_prefix(self.range(prefix), prefix, limit)
@@ -1,20 +1,57 @@
+import bisect
+import itertools
+import operator
+import os
+import struct
+import weakref
+from collections.abc import Iterable, Iterator
+
+# Shared children of every leaf node, so that leaves do not allocate a list of their own
+LEAF_CHILDREN = ()
+
+# Outcomes reported for each element by the batch operations
+INSERTED = "inserted"
+DUPLICATE = "duplicate"
+DELETED = "deleted"
+NOT_FOUND = "not found"
+
+# Snapshot layout: header, one structure entry per node in preorder, then the length-prefixed UTF-8 keys in the same
+# node order, followed by whatever a subclass stores next to the keys
+SNAPSHOT_MAGIC = b"BTSN"
+SNAPSHOT_VERSION = 1
+# Magic, version, degree, number of nodes, number of keys
+SNAPSHOT_HEADER = struct.Struct("<4sBIQQ")
+# Leaf flag, number of elements
+SNAPSHOT_NODE = struct.Struct("<BI")
+SNAPSHOT_KEY_LENGTH = struct.Struct("<I")
+# Bytes read at a time from the keys section
+SNAPSHOT_CHUNK = 1 << 20
+
+
 class BTNode:
     """
     Class representing a B-Tree node.
 
     Attributes:
-        children: A list of B-Tree nodes.
+        children: A list of B-Tree nodes, LEAF_CHILDREN for a leaf node.
         elements: A list of keys for the node
-        is_leaf: True if this is a leaf node, False otherwise.
     """
 
+    __slots__ = ("children", "elements")
+
     def __init__(self, is_leaf: bool = False) -> None:
         """
         Constructor for B-Tree node.
         """
-        self.children: list[BTNode] = []
+        self.children: list[BTNode] | tuple[()] = LEAF_CHILDREN if is_leaf else []
         self.elements: list[str] = []
-        self.is_leaf = is_leaf
+
+    @property
+    def is_leaf(self) -> bool:
+        """
+        True if this is a leaf node, False otherwise.
+        """
+        return self.children is LEAF_CHILDREN
 
     def search(self, search_elem: str) -> tuple[int, bool]:
         """
@@ -22,40 +59,21 @@ class BTNode:
         :param search_elem: Element to search for.
         :return: Index of element/location to traverse to, True if found, False otherwise.
         """
-        # Initialize pointers
-        left = 0
-        right = len(self.elements) - 1
-        child_index = 0
-        is_found = False
+        elements = self.elements
+        # bisect compares natively for str, int and bytes elements instead of looping in Python
+        child_index = bisect.bisect_left(elements, search_elem)
+        return child_index, child_index < len(elements) and elements[child_index] == search_elem
 
-        while True:
-            # If left surpasses right then end loop
-            if left > right:
-                break
-
-            # Set mid to the middle of left and right
-            mid = (left + right) // 2
-
-            # If the element at mid-position is less than search
-            if self.elements[mid] < search_elem:
-                child_index = mid + 1
-                # Set left to be mid + 1, searching at right-side of array
-                left = mid + 1
-
-            # If element at mid-position is greater than search
-            elif self.elements[mid] > search_elem:
-                child_index = mid
-                # Set right to mid - 1, searching at left-side of array
-                right = mid - 1
-
-            # If element is equal then break
-            else:
-                # Set found index to current mid-pointer
-                child_index = mid
-                is_found = True
-                break
-
-        return child_index, is_found
+    def copy(self) -> 'BTNode':
+        """
+        Copy the node, sharing its children but not its lists.
+        :return: The copy.
+        """
+        clone = type(self)(self.is_leaf)
+        clone.elements = self.elements[:]
+        if not self.is_leaf:
+            clone.children = self.children[:]
+        return clone
 
     def split_node(self, insert_loc: int, parent_node: 'BTNode') -> None:
         """
@@ -65,28 +83,27 @@ class BTNode:
         :return: None
         """
         # Create new neighbouring node and split elements from middle
-        neigh_node = BTNode(self.is_leaf)
+        neigh_node = type(self)(self.is_leaf)
 
         # Get median index and element
         median_ind = len(self.elements) // 2
         median_element = self.elements[median_ind]
 
-        # Split elements and children in the middle to left and right
+        # Split elements in the middle to left and right
         left_elements = self.elements[:median_ind]
 
-        left_children = self.children[:median_ind + 1]
-
         right_elements = self.elements[median_ind + 1:]
 
-        right_children = self.children[median_ind + 1:]
-
         # Assign original node to left node
         self.elements = left_elements
-        self.children = left_children
 
         # Assign new node to right node
         neigh_node.elements = right_elements
-        neigh_node.children = right_children
+
+        # Leaves keep sharing LEAF_CHILDREN, only internal nodes split their children
+        if not self.is_leaf:
+            neigh_node.children = self.children[median_ind + 1:]
+            self.children = self.children[:median_ind + 1]
 
         # Push it median element to the index where it traverses from
         parent_node.elements.insert(insert_loc, median_element)
@@ -126,6 +143,43 @@ class BTNode:
         # Return the first element in the node
         return current_node.elements[0]
 
+    def insert_element(self, index: int, element: str) -> None:
+        """
+        Insert an element into the node.
+        :param index: Index to insert the element at.
+        :param element: Element to insert.
+        :return: None
+        """
+        self.elements.insert(index, element)
+
+    def pop_element(self, index: int) -> str:
+        """
+        Remove an element from the node.
+        :param index: Index of the element to remove.
+        :return: The removed element.
+        """
+        return self.elements.pop(index)
+
+    def replace_with_predecessor(self, elem_index: int) -> str:
+        """
+        Replace an element with its predecessor, the largest element of the subtree to its left.
+        :param elem_index: Index of the element to replace.
+        :return: The predecessor element.
+        """
+        pred_elem = self.get_predecessor(elem_index)
+        self.elements[elem_index] = pred_elem
+        return pred_elem
+
+    def replace_with_successor(self, elem_index: int) -> str:
+        """
+        Replace an element with its successor, the smallest element of the subtree to its right.
+        :param elem_index: Index of the element to replace.
+        :return: The successor element.
+        """
+        succ_elem = self.get_successor(elem_index + 1)
+        self.elements[elem_index] = succ_elem
+        return succ_elem
+
     def merge_children(self, elem_index: int) -> 'BTNode':
         """
         Merge B-Tree nodes into a B-Tree node.
@@ -142,7 +196,8 @@ class BTNode:
         # Merge elements
         left_node.elements += [middle_element] + right_node.elements
         # Merge right node children with left node children
-        left_node.children += right_node.children
+        if not left_node.is_leaf:
+            left_node.children += right_node.children
 
         # Remove element from node
         self.elements.pop(elem_index)
@@ -201,6 +256,178 @@ class BTNode:
             child_node.children.append(right_sibling.children.pop(0))
 
 
+class CountedBTNode(BTNode):
+    """
+    Class representing a B-Tree node that also keeps the number of elements in its subtree.
+
+    Attributes:
+        size: Number of elements in the subtree rooted at this node.
+    """
+
+    __slots__ = ("size",)
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        """
+        Constructor for counted B-Tree node.
+        """
+        super().__init__(is_leaf)
+        self.size = 0
+
+    def copy(self) -> 'CountedBTNode':
+        """
+        Copy the node, sharing its children but not its lists.
+        :return: The copy.
+        """
+        clone = super().copy()
+        clone.size = self.size
+        return clone
+
+    def split_node(self, insert_loc: int, parent_node: 'CountedBTNode') -> None:
+        """
+        Split B-Tree node into two B-Tree nodes, dividing the subtree size between them.
+        :param insert_loc: Location to insert element into parent B-Tree node.
+        :param parent_node: Parent B-Tree node.
+        :return: None
+        """
+        # A parent without elements is a new root, which takes over the whole subtree
+        if not parent_node.elements:
+            parent_node.size = self.size
+
+        super().split_node(insert_loc, parent_node)
+
+        # Count the right half, the median went up to the parent and the rest stays on the left
+        neigh_node = parent_node.children[insert_loc + 1]
+        neigh_node.size = len(neigh_node.elements) + sum(child.size for child in neigh_node.children)
+        self.size -= neigh_node.size + 1
+
+    def merge_children(self, elem_index: int) -> 'CountedBTNode':
+        """
+        Merge B-Tree nodes into a B-Tree node, adding up their subtree sizes.
+        :param elem_index: Index of element to push down to merged B-Tree node.
+        :return: The merged B-Tree node.
+        """
+        # The left node takes the middle element and everything in the right node
+        self.children[elem_index].size += 1 + self.children[elem_index + 1].size
+
+        return super().merge_children(elem_index)
+
+    def rotate_from_left(self, elem_index: int) -> None:
+        """
+        Rotate B-Tree node from left to right, moving the subtree size along.
+        :param elem_index: Element to rotate down to the right B-Tree node.
+        :return: None
+        """
+        left_sibling = self.children[elem_index - 1]
+        child_node = self.children[elem_index]
+
+        # One element moves over, along with the last subtree of the sibling
+        moved = 1 if left_sibling.is_leaf else 1 + left_sibling.children[-1].size
+
+        super().rotate_from_left(elem_index)
+
+        left_sibling.size -= moved
+        child_node.size += moved
+
+    def rotate_from_right(self, elem_index: int) -> None:
+        """
+        Rotate B-Tree node from right to left, moving the subtree size along.
+        :param elem_index: Element to rotate down to the left B-Tree node.
+        :return: None
+        """
+        right_sibling = self.children[elem_index + 1]
+        child_node = self.children[elem_index]
+
+        # One element moves over, along with the first subtree of the sibling
+        moved = 1 if right_sibling.is_leaf else 1 + right_sibling.children[0].size
+
+        super().rotate_from_right(elem_index)
+
+        right_sibling.size -= moved
+        child_node.size += moved
+
+
+def pack_level(node_class: type[BTNode], keys: list[str], children: list[BTNode] | None, capacity: int,
+               degree: int, copy_separators: bool = False) -> tuple[list[BTNode], list[str]]:
+    """
+    Pack one level of a tree for bulk loading, promoting one separator between each pair of nodes.
+    :param node_class: Class used to create the nodes.
+    :param keys: Sorted elements to spread over the nodes of this level.
+    :param children: Nodes of the level below, None if this is the leaf level.
+    :param capacity: Target number of elements per node.
+    :param degree: Degree of the tree.
+    :param copy_separators: Whether each separator is a copy of the first element of the node after it, which keeps
+        it, the way B+Tree leaves are packed, instead of being moved up out of the level.
+    :return: The nodes of this level and the separators to promote to the level above.
+    """
+    count = len(keys)
+    # Number of elements that leave the level with each separator
+    moved = 0 if copy_separators else 1
+    # Enough nodes to stay within capacity, but few enough that each node still gets t - 1 elements
+    node_count = max(1, min(-(-(count + moved) // (capacity + moved)), (count + moved) // (degree - 1 + moved)))
+    # The elements that are not promoted are spread evenly
+    per_node, extra = divmod(count - (node_count - 1) * moved, node_count)
+
+    nodes = []
+    separators = []
+    key_pos = 0
+    child_pos = 0
+    for node_index in range(node_count):
+        size = per_node + 1 if node_index < extra else per_node
+
+        node = node_class(children is None)
+        node.elements = keys[key_pos:key_pos + size]
+        key_pos += size
+
+        # Internal nodes take one more child than they have elements
+        if children is not None:
+            node.children = children[child_pos:child_pos + size + 1]
+            child_pos += size + 1
+
+        nodes.append(node)
+
+        # Promote the element that separates this node from the next one
+        if node_index < node_count - 1:
+            separators.append(keys[key_pos])
+            key_pos += moved
+
+    return nodes, separators
+
+
+def check_strictly_increasing(keys: list[str]) -> None:
+    """
+    Check that the elements given to a bulk load are sorted, with no repeats.
+    :param keys: Elements to check.
+    :return: None
+    """
+    # Every element must be strictly greater than the one before it
+    if not all(map(operator.lt, keys, itertools.islice(keys, 1, None))):
+        raise ValueError("Elements must be sorted in strictly increasing order")
+
+
+def take_prefix(elements: Iterable[str], prefix: str, limit: int | None = None) -> Iterator[str]:
+    """
+    Lazily take the elements that start with prefix from the front of an ordered scan starting at prefix.
+    :param elements: Ordered elements, none of them below prefix.
+    :param prefix: Prefix the elements must start with.
+    :param limit: Maximum number of elements to yield, None for no limit.
+    :return: An iterator over the ordered elements with the prefix.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+    for element in elements:
+        # Elements with the prefix are contiguous, the first one without it ends the scan
+        if not element.startswith(prefix):
+            return
+
+        yield element
+
+        count += 1
+        if count == limit:
+            return
+
+
 class BTree:
     """
     Class representing a B-Tree.
@@ -209,8 +436,18 @@ class BTree:
         root: Root of B-Tree.
         t: Determines the min and max elements and branches of the B-Tree.
         verbosity: Verbosity level.
+        _finger: The last leaf an element was inserted into, with the separators that bound it and the path down to
+            it, None when it may no longer be valid.
+        _owned: Ids of the nodes created since the last snapshot, which can be changed in place. None while no
+            snapshot is alive, then every node can.
+        _snapshots: The frozen trees of the snapshots that are still alive.
     """
 
+    # Class used to create the nodes of the tree
+    node_class = BTNode
+    # Whether deletes check the element is there with a read-only descent before restructuring on the way down
+    probe_deletes = False
+
     def __init__(self, degree: int, verbosity: int = 0) -> None:
         """
         Constructor for B-Tree tree.
@@ -220,123 +457,623 @@ class BTree:
         self.root = None
         self.t = degree
         self.verbosity = verbosity
+        self._finger: tuple[BTNode, str | None, str | None, list[BTNode]] | None = None
+        self._owned: set[int] | None = None
+        self._snapshots: weakref.WeakSet[BTree] = weakref.WeakSet()
+
+    @classmethod
+    def bulk_load(cls, elements: Iterable[str], degree: int, fill_factor: float = 1.0,
+                  verbosity: int = 0) -> 'BTree':
+        """
+        Build a B-Tree bottom-up from elements that are already sorted, without going through insert.
+        :param elements: Elements in strictly increasing order.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree.
+        """
+        keys = list(elements)
+        check_strictly_increasing(keys)
+        return cls._load_sorted(keys, degree, fill_factor, verbosity)
+
+    @classmethod
+    def _load_sorted(cls, keys: list[str], degree: int, fill_factor: float = 1.0, verbosity: int = 0) -> 'BTree':
+        """
+        Build a B-Tree bottom-up from elements known to be in strictly increasing order, the part of bulk_load after
+        the order check, for callers that produce the elements in order themselves.
+        :param keys: Elements in strictly increasing order.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be greater than 0 and at most 1")
+
+        tree = cls(degree, verbosity)
+
+        # Nothing to load, leave the tree empty
+        if not keys:
+            return tree
+
+        max_elements = 2 * degree - 1
+        # Number of elements to put in each leaf, kept within the t - 1 and 2t - 1 bounds
+        leaf_capacity = min(max_elements, max(degree - 1, round(fill_factor * max_elements)))
+
+        # Pack the leaves first, then keep packing the promoted separators until a single root is left
+        nodes, separators = pack_level(cls.node_class, keys, None, leaf_capacity, degree)
+        while len(nodes) > 1:
+            nodes, separators = pack_level(cls.node_class, separators, nodes, max_elements, degree)
+
+        tree.root = nodes[0]
+        return tree
+
+    def dump(self, target) -> None:
+        """
+        Write the tree to a binary snapshot that load can rebuild the nodes from directly.
+        :param target: Path to write to, or a binary file object.
+        :return: None
+        """
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as file:
+                self.dump(file)
+            return
+
+        # Describe the nodes in preorder, the structure is small next to the keys so it is built in memory first
+        structure = bytearray()
+        node_count = key_count = 0
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            structure += SNAPSHOT_NODE.pack(node.is_leaf, len(node.elements))
+            node_count += 1
+            key_count += len(node.elements)
+            if not node.is_leaf:
+                stack.extend(reversed(node.children))
+
+        target.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.t, node_count, key_count))
+        target.write(structure)
+
+        # Write the keys node by node, in the same order as the structure
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            parts = []
+            for element in node.elements:
+                data = element.encode()
+                parts.append(SNAPSHOT_KEY_LENGTH.pack(len(data)))
+                parts.append(data)
+            target.write(b"".join(parts))
+            if not node.is_leaf:
+                stack.extend(reversed(node.children))
+
+        self._dump_values(target)
+
+    def _dump_values(self, target) -> None:
+        """
+        Write what the tree stores next to its keys after the keys section of a snapshot. Trees storing only keys
+        write nothing.
+        :param target: Binary file object the snapshot is being written to.
+        :return: None
+        """
+
+    @classmethod
+    def load(cls, source, verbosity: int = 0) -> 'BTree':
+        """
+        Rebuild a B-Tree from a snapshot written by dump, creating the nodes directly instead of inserting.
+        :param source: Path to read from, or a binary file object to stream the snapshot from.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                return cls.load(file, verbosity)
+
+        header = source.read(SNAPSHOT_HEADER.size)
+        if len(header) < SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, degree, node_count, key_count = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Not a B-Tree snapshot")
+
+        tree = cls(degree, verbosity)
+        if not node_count:
+            tree._load_values([], b"", source)
+            return tree
+
+        structure = source.read(node_count * SNAPSHOT_NODE.size)
+        if len(structure) < node_count * SNAPSHOT_NODE.size:
+            raise ValueError("Snapshot is truncated")
+
+        # Recreate the nodes in preorder, attaching each one to the deepest internal node still missing children
+        nodes = []
+        sizes = []
+        # Internal nodes still missing children, each with the number of children it takes
+        parents: list[tuple[BTNode, int]] = []
+        for is_leaf, size in SNAPSHOT_NODE.iter_unpack(structure):
+            if nodes and not parents:
+                raise ValueError("Snapshot structure is corrupted")
+
+            node = cls.node_class(bool(is_leaf))
+            if parents:
+                parent, child_count = parents[-1]
+                parent.children.append(node)
+                if len(parent.children) == child_count:
+                    parents.pop()
+            if not is_leaf:
+                parents.append((node, size + 1))
+
+            nodes.append(node)
+            sizes.append(size)
+
+        if parents or sum(sizes) != key_count:
+            raise ValueError("Snapshot structure is corrupted")
+
+        # Fill in the keys, reading the keys section a chunk at a time
+        unpack_length = SNAPSHOT_KEY_LENGTH.unpack_from
+        prefix_size = SNAPSHOT_KEY_LENGTH.size
+        buffer = b""
+        buffer_size = position = 0
+        for node, size in zip(nodes, sizes):
+            elements = []
+            for _ in range(size):
+                start = position + prefix_size
+                # Refill when the length prefix or the key runs past the end of the buffer
+                if start > buffer_size:
+                    buffer = buffer[position:] + source.read(SNAPSHOT_CHUNK)
+                    buffer_size = len(buffer)
+                    start -= position
+                    position = 0
+                    if start > buffer_size:
+                        raise ValueError("Snapshot is truncated")
+
+                end = start + unpack_length(buffer, position)[0]
+                if end > buffer_size:
+                    buffer = buffer[position:] + source.read(max(SNAPSHOT_CHUNK, end - position))
+                    buffer_size = len(buffer)
+                    start -= position
+                    end -= position
+                    position = 0
+                    if end > buffer_size:
+                        raise ValueError("Snapshot is truncated")
+
+                elements.append(buffer[start:end].decode())
+                position = end
+            node.elements = elements
+
+        tree.root = nodes[0]
+        # The last chunk may have run past the keys into the section written by _dump_values
+        tree._load_values(nodes, buffer[position:], source)
+        return tree
+
+    def _load_values(self, nodes: list[BTNode], buffered: bytes, source) -> None:
+        """
+        Read what _dump_values wrote after the keys section of a snapshot into the loaded nodes.
+        :param nodes: The loaded nodes, in the preorder of the snapshot.
+        :param buffered: Bytes after the keys section already read from the source.
+        :param source: Binary file object the rest of the snapshot is read from.
+        :return: None
+        """
+
+    def snapshot(self) -> 'BTreeSnapshot':
+        """
+        Get a read-only view of the tree as it is now, in O(1). From then on the tree copies the nodes it changes
+        instead of changing the ones the snapshot shares.
+        :return: The snapshot.
+        """
+        # The frozen tree shares every node with this one, and is never changed
+        frozen = type(self).__new__(type(self))
+        frozen.__dict__.update(self.__dict__)
+        frozen._finger = None
+        frozen._owned = None
+        frozen._snapshots = weakref.WeakSet()
+
+        self._snapshots.add(frozen)
+        # Every existing node is now shared, and the finger leaf with them
+        self._owned = set()
+        self._finger = None
+
+        return BTreeSnapshot(frozen)
+
+    def _own(self, node: BTNode) -> None:
+        """
+        Record a node created by the tree as safe to change in place.
+        :param node: The new node.
+        :return: None
+        """
+        if self._owned is not None:
+            self._owned.add(id(node))
+
+    def _writable(self, node: BTNode) -> BTNode:
+        """
+        Get a version of a node that can be changed without a snapshot seeing it.
+        :param node: Node about to be changed.
+        :return: The node itself if no snapshot shares it, a copy of it otherwise.
+        """
+        if self._owned is None or id(node) in self._owned:
+            return node
+
+        # Every snapshot is gone, nothing is shared anymore
+        if not self._snapshots:
+            self._owned = None
+            return node
+
+        clone = node.copy()
+        self._owned.add(id(clone))
+        return clone
+
+    def _writable_child(self, parent_node: BTNode, index: int) -> BTNode:
+        """
+        Get a version of a child that can be changed, putting a copy in place of the child if it is shared.
+        :param parent_node: Parent of the child, which must already be writable.
+        :param index: Index of the child.
+        :return: The writable child.
+        """
+        child_node = parent_node.children[index]
+        writable_node = self._writable(child_node)
+        if writable_node is not child_node:
+            parent_node.children[index] = writable_node
+        return writable_node
+
+    def _writable_root(self) -> BTNode:
+        """
+        Get a version of the root that can be changed, making a copy the new root if it is shared.
+        :return: The writable root.
+        """
+        self.root = self._writable(self.root)
+        return self.root
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        """
+        Look up an element without restructuring the tree.
+        :param element: Element to search for.
+        :param default: Value to return when the element is not in the tree.
+        :return: The element stored in the tree, default if it is not found.
+        """
+        node = self._finger_leaf(element) or self.root
+
+        # Walk down from the root, only reading the nodes along the way
+        while node:
+            index, is_found = node.search(element)
+            if is_found:
+                return node.elements[index]
+
+            # Reached a leaf without finding the element
+            if node.is_leaf:
+                break
+
+            node = node.children[index]
+
+        return default
+
+    def contains(self, element: str) -> bool:
+        """
+        Check if an element is in the tree without restructuring it.
+        :param element: Element to search for.
+        :return: True if the element is in the tree, False otherwise.
+        """
+        node = self._finger_leaf(element) or self.root
+
+        while node:
+            index, is_found = node.search(element)
+            if is_found:
+                return True
+
+            if node.is_leaf:
+                return False
+
+            node = node.children[index]
+
+        return False
+
+    def __contains__(self, element: str) -> bool:
+        return self.contains(element)
+
+    def _finger_leaf(self, element: str) -> BTNode | None:
+        """
+        Check if an element falls within the leaf remembered by the finger.
+        :param element: Element to check.
+        :return: The finger leaf if element is strictly between its separators, None otherwise.
+        """
+        if self._finger is None:
+            return None
+
+        leaf_node, lower_bound, upper_bound, _ = self._finger
+        if (lower_bound is None or element > lower_bound) and (upper_bound is None or element < upper_bound):
+            return leaf_node
+
+        return None
 
-    def traverse_to_leaf(self, node: BTNode, search_elem: str) -> tuple[None, int] | tuple[BTNode, int]:
+    def traverse_to_leaf(self, node: BTNode, search_elem: str, path: list[BTNode] | None = None,
+                         bounds: list[str | None] | None = None) -> tuple[None, int] | tuple[BTNode, int]:
         """
-        Recursive traversal to the leaf while searching for element
+        Iterative traversal to the leaf while searching for element, splitting full nodes on the way down
         :param node: Node to search
         :param search_elem: Element to search for in the node
+        :param path: If given, the nodes passed through down to the leaf are appended to it.
+        :param bounds: If given, set to the separators below and above the leaf, None where there is none.
         :return: Leaf node where the element is found and the index where it is found.
         """
+        # Copy the root first if a snapshot shares it, every node on the way down is copied the same way
+        if node == self.root and self._owned is not None:
+            node = self._writable_root()
+
         # If node is the root and node elements is full
         if node == self.root and len(node.elements) == 2 * self.t - 1:
             # Create new node as the new root
-            new_node = BTNode()
+            new_node = self.node_class()
+            self._own(new_node)
             self.root = new_node
 
             new_node.children.append(node)
             # Split node with new node as the root parent node
             node.split_node(0, new_node)
+            self._own(new_node.children[1])
             node = new_node
 
-        # Get next traversing index
-        traverse_index, is_found = node.search(search_elem)
-
-        # If the element already exists in the tree then return None
-        if is_found:
-            return None, -1
-
-        # If the node reaches a leaf then return the node and the index to insert element
-        if node.is_leaf:
-            return node, traverse_index
-
-        # Next node will be following the traverse index
-        next_node = node.children[traverse_index]
-
-        # If elements in next node is full
-        if len(next_node.elements) == 2 * self.t - 1:
-            # Split node with next child node with the current node as the parent
-            next_node.split_node(traverse_index, node)
-            # Recursively traverse from the same current node
-            return self.traverse_to_leaf(node, search_elem)
-        else:
-            # Recursively traverse from the child node
-            return self.traverse_to_leaf(next_node, search_elem)
-
-    def insert(self, element: str) -> None:
+        while True:
+            # Get next traversing index
+            traverse_index, is_found = node.search(search_elem)
+
+            # If the element already exists in the tree then return None
+            if is_found:
+                return None, -1
+
+            # If the node reaches a leaf then return the node and the index to insert element
+            if node.is_leaf:
+                if path is not None:
+                    path.append(node)
+                return node, traverse_index
+
+            # Next node will be following the traverse index, copied first if a snapshot shares it
+            next_node = node.children[traverse_index]
+            if self._owned is not None:
+                next_node = self._writable_child(node, traverse_index)
+
+            # If elements in next node is full
+            if len(next_node.elements) == 2 * self.t - 1:
+                # Split node with next child node with the current node as the parent
+                next_node.split_node(traverse_index, node)
+                self._own(node.children[traverse_index + 1])
+
+                # The median now sits at traverse index, so comparing against it tells which half to go into
+                # without searching the current node again
+                median_element = node.elements[traverse_index]
+                if search_elem == median_element:
+                    return None, -1
+                if search_elem > median_element:
+                    traverse_index += 1
+                    next_node = node.children[traverse_index]
+
+            if path is not None:
+                path.append(node)
+
+            # The elements on either side of the way down bound everything below it
+            if bounds is not None:
+                if traverse_index > 0:
+                    bounds[0] = node.elements[traverse_index - 1]
+                if traverse_index < len(node.elements):
+                    bounds[1] = node.elements[traverse_index]
+
+            # Continue from the child node
+            node = next_node
+
+    def insert(self, element: str) -> bool:
         """
         Insert element into B-Tree node.
         :param element: Element to insert.
-        :return: None
+        :return: True if the element was inserted, False if it was already in the tree.
+        """
+        return self._insert(element)
+
+    def _insert(self, element: str, path: list[BTNode] | None = None) -> bool:
+        """
+        Internal function that performs insertion on B-Tree.
+        :param element: Element to insert.
+        :param path: If given, the nodes from the root down to the leaf the element went into are appended to it.
+        :return: True if the element was inserted, False if it was already in the tree.
         """
 
         # If root is None, meaning the tree is empty
         if not self.root:
             # Create root node and add element to the new root node
-            self.root = BTNode(True)
-            self.root.elements.append(element)
+            self.root = self.node_class(True)
+            self._own(self.root)
+            self.root.insert_element(0, element)
+            self._finger = (self.root, None, None, [self.root])
+            if path is not None:
+                path.append(self.root)
+            return True
+
+        # If the element belongs in the finger leaf and it has room, skip the walk down from the root
+        leaf_node = self._finger_leaf(element)
+        if leaf_node and len(leaf_node.elements) < 2 * self.t - 1:
+            index, is_found = leaf_node.search(element)
+            leaf_path = self._finger[3]
         else:
             # Traverse to the leaf from root node to insert
-            leaf_node, index = self.traverse_to_leaf(self.root, element)
-            # If leaf node is None it means that the element is found in the tree
-            if not leaf_node:
-                if self.verbosity:
-                    print("Element is already in the tree")
-                return
-            # Insert element into leaf node at index
-            leaf_node.elements.insert(index, element)
+            leaf_path = []
+            bounds = [None, None]
+            leaf_node, index = self.traverse_to_leaf(self.root, element, leaf_path, bounds)
+            is_found = not leaf_node
+
+            # Splits on the way down may have restructured the old finger leaf, remember the new one instead
+            self._finger = None if is_found else (leaf_node, bounds[0], bounds[1], leaf_path)
 
-    def traverse_and_find(self, node: BTNode, search_elem: str) -> tuple[BTNode, int] | tuple[None, int]:
+        # The element is already in the tree
+        if is_found:
+            if self.verbosity:
+                print("Element is already in the tree")
+            return False
+
+        # Insert element into leaf node at index
+        leaf_node.insert_element(index, element)
+        if path is not None:
+            path += leaf_path
+
+        return True
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
         """
-        Traverse B-Tree and find the index of element in B-Tree node. Used by deletion operation
-        :param node: Node to search
-        :param search_elem: Element to search for in the node
-        :return: A node where the element is found and the index where it is found.
+        Insert a batch of elements, sorting it first so that the elements going into the same leaf are all added
+        with a single descent from the root.
+        :param elements: Elements to insert.
+        :return: Each element in sorted order with its outcome, INSERTED or DUPLICATE.
         """
-        # Perform binary search to find element in node
-        traverse_index, is_found = node.search(search_elem)
-        # If element is found then return the node that the element was found in and the index
-        if is_found:
-            return node, traverse_index
+        batch = sorted(elements)
+        outcomes = []
+        max_elements = 2 * self.t - 1
+
+        position = 0
+        while position < len(batch):
+            element = batch[position]
+            position += 1
+
+            # Repeats within the batch are duplicates of the element just handled
+            if position > 1 and batch[position - 2] == element:
+                outcomes.append((element, DUPLICATE))
+                continue
+
+            # Full descent for the first element of the run, splitting full nodes as usual
+            path = []
+            if not self._insert(element, path):
+                outcomes.append((element, DUPLICATE))
+                continue
+            outcomes.append((element, INSERTED))
+
+            # The insert left the finger on the leaf the element went into
+            leaf_node, _, upper_bound, _ = self._finger
+            added = 1
+
+            # Keep adding to the same leaf while it has room and the next elements still belong in it
+            while position < len(batch) and len(leaf_node.elements) < max_elements:
+                element = batch[position]
+
+                if batch[position - 1] != element:
+                    if upper_bound is not None and not element < upper_bound:
+                        break
+
+                    index, is_found = leaf_node.search(element)
+                    if not is_found:
+                        leaf_node.insert_element(index, element)
+                        outcomes.append((element, INSERTED))
+                        added += 1
+                        position += 1
+                        continue
+
+                outcomes.append((element, DUPLICATE))
+                position += 1
+
+            self._path_resized(path, added)
+
+        return outcomes
+
+    def _leaf_bounds(self, path: list[BTNode], element: str) -> tuple[str | None, str | None]:
+        """
+        Find the separators that bound a leaf.
+        :param path: Nodes from the root down to the leaf.
+        :param element: Any element that belongs in the leaf.
+        :return: The closest ancestor elements below and above everything in the leaf, None where there is none.
+        """
+        lower_bound = upper_bound = None
 
-        # If node reaches a leaf it means that element isn't found then return None
-        if node.is_leaf:
-            return None, -1
+        # The closest ancestors with an element to the left and to the right of the way down hold the bounds
+        for depth in range(len(path) - 2, -1, -1):
+            ancestor = path[depth]
+            index, _ = ancestor.search(element)
 
-        # "Traverse" to check child node
-        child_node = node.children[traverse_index]
+            if lower_bound is None and index > 0:
+                lower_bound = ancestor.elements[index - 1]
+            if upper_bound is None and index < len(ancestor.elements):
+                upper_bound = ancestor.elements[index]
 
-        # Child node has exactly t - 1 elements
-        if len(child_node.elements) == self.t - 1:
-            # Case 3a-1, check if traversal is not the left most and check left immediate sibling, if they have at
-            # least t elements
-            if traverse_index != 0 and len(node.children[traverse_index - 1].elements) >= self.t:
-                node.rotate_from_left(traverse_index)
+            if lower_bound is not None and upper_bound is not None:
+                break
 
-            # Case 3a-2,
-            # If traversal is not the right most and check right immediate sibling, if they have at least t elements
-            elif traverse_index != len(node.elements) and len(node.children[traverse_index + 1].elements) >= self.t:
-                node.rotate_from_right(traverse_index)
+        return lower_bound, upper_bound
 
-            # Case 3b
-            # If immediate sibling only have exactly t - 1 elements
-            else:
-                # Merge with right sibling if traverse index not right most
-                if traverse_index != len(node.elements):
-                    merged_node = node.merge_children(traverse_index)
-                # Merge with left sibling if traverse index is right most
+    def _path_resized(self, path: list[BTNode], delta: int) -> None:
+        """
+        Called after elements were added to or removed from the leaf at the end of path. Does nothing by default,
+        subclasses that keep per-node information about their subtrees update it here.
+        :param path: Nodes from the root down to the leaf.
+        :param delta: Number of elements added, negative if elements were removed.
+        :return: None
+        """
+
+    def _removing(self, node: BTNode, index: int) -> None:
+        """
+        Called by a delete once it has found the element it is going to remove, before anything is changed. Does
+        nothing by default, subclasses that keep more than the element per slot read it out here.
+        :param node: Node the element is in.
+        :param index: Index of the element in the node.
+        :return: None
+        """
+
+    def traverse_and_find(self, node: BTNode, search_elem: str,
+                          path: list[BTNode] | None = None) -> tuple[BTNode, int] | tuple[None, int]:
+        """
+        Traverse B-Tree and find the index of element in B-Tree node. Used by deletion operation
+        :param node: Node to search
+        :param search_elem: Element to search for in the node
+        :param path: If given, the nodes passed through are appended to it.
+        :return: A node where the element is found and the index where it is found.
+        """
+        while True:
+            if path is not None:
+                path.append(node)
+
+            # Perform binary search to find element in node
+            traverse_index, is_found = node.search(search_elem)
+            # If element is found then return the node that the element was found in and the index
+            if is_found:
+                return node, traverse_index
+
+            # If node reaches a leaf it means that element isn't found then return None
+            if node.is_leaf:
+                return None, -1
+
+            # "Traverse" to check child node, copied first if a snapshot shares it
+            child_node = node.children[traverse_index]
+            if self._owned is not None:
+                child_node = self._writable_child(node, traverse_index)
+
+            # Child node has exactly t - 1 elements
+            if len(child_node.elements) == self.t - 1:
+                # Case 3a-1, check if traversal is not the left most and check left immediate sibling, if they have
+                # at least t elements
+                if traverse_index != 0 and len(node.children[traverse_index - 1].elements) >= self.t:
+                    self._writable_child(node, traverse_index - 1)
+                    node.rotate_from_left(traverse_index)
+
+                # Case 3a-2,
+                # If traversal is not the right most and check right immediate sibling, if they have at least t
+                # elements
+                elif traverse_index != len(node.elements) and len(node.children[traverse_index + 1].elements) >= self.t:
+                    self._writable_child(node, traverse_index + 1)
+                    node.rotate_from_right(traverse_index)
+
+                # Case 3b
+                # If immediate sibling only have exactly t - 1 elements
                 else:
-                    merged_node = node.merge_children(traverse_index - 1)
+                    # Merge with right sibling if traverse index not right most
+                    if traverse_index != len(node.elements):
+                        merged_node = node.merge_children(traverse_index)
+                    # Merge with left sibling if traverse index is right most
+                    else:
+                        self._writable_child(node, traverse_index - 1)
+                        merged_node = node.merge_children(traverse_index - 1)
 
-                # If there are no more elements in the root then set root to the merged node
-                if not self.root.elements:
-                    self.root = merged_node
+                    # If there are no more elements in the root then set root to the merged node
+                    if not self.root.elements:
+                        self.root = merged_node
 
-                # Continue traversing into the merged node
-                return self.traverse_and_find(merged_node, search_elem)
+                    # Continue traversing into the merged node
+                    node = merged_node
+                    continue
 
-        # Traverse into next node
-        return self.traverse_and_find(node.children[traverse_index], search_elem)
+            # Traverse into next node
+            node = node.children[traverse_index]
 
     def delete(self, element: str) -> str | None:
         """
@@ -344,65 +1081,165 @@ class BTree:
         :param element: Element to delete.
         :return: Element that was deleted, None if element was not found.
         """
-        # Call the internal recursive delete function
+        # Nothing to delete from an empty tree
+        if not self.root:
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        # Call the internal delete function
         return self._delete(self.root, element)
 
-    def _delete(self, start_node: BTNode, element: str) -> str | None:
+    def _delete(self, start_node: BTNode, element: str, path: list[BTNode] | None = None) -> str | None:
         """
-        Internal recursive function that performs deletion on B-Tree.
+        Internal function that performs deletion on B-Tree.
         :param start_node: Node to start traversing and deleting from.
         :param element: Element to delete.
+        :param path: If given, the nodes passed through down to the leaf the element is removed from are appended to it.
         :return: Element that was deleted, None if element was not found.
         """
-
-        # Traverse and find the node with element and the index where element is found
-        found_node, found_index = self.traverse_and_find(start_node, element)
-        # If node is not found then return None
-        if not found_node:
+        # A missing element leaves the tree exactly as it was, instead of rotated and merged for nothing
+        if self.probe_deletes and start_node is self.root and not self.contains(element):
             if self.verbosity:
                 print("Element not found")
             return None
 
-        # Case 1, if node is a leaf and element is >= t or node is the root, delete straight
-        if found_node.is_leaf and (len(found_node.elements) >= self.t or found_node == self.root):
-            removed_elem = found_node.elements.pop(found_index)
-            # If node is the root and elements is empty then set root to None
-            if found_node == self.root and not found_node.elements:
-                self.root = None
-            return removed_elem
+        # Rotations, merges and replaced separators can all move the finger leaf's bounds
+        self._finger = None
 
-        # Case 2a, if node is an internal node, check root node of left subtree
-        left_node = found_node.children[found_index]
-        # If subtree has at least t elements
-        if len(left_node.elements) >= self.t:
-            # Get predecessor of found node
-            pred_elem = found_node.get_predecessor(found_index)
-            # Replace element at the found location with predecessor element
-            found_node.elements[found_index] = pred_elem
+        # Copy the root first if a snapshot shares it, the descent copies the nodes below the same way
+        if start_node is self.root:
+            start_node = self._writable_root()
 
-            # Recursively delete predecessor element from subtree
-            return self._delete(left_node, pred_elem)
+        removed_elem = None
 
-        # Case 2b, mirror of 2a, check root node of right subtree    
-        right_node = found_node.children[found_index + 1]
-        # If subtree has at least t elements
-        if len(right_node.elements) >= self.t:
-            # Get successor of found node
-            succ_elem = found_node.get_successor(found_index + 1)
-            # Replace element
-            found_node.elements[found_index] = succ_elem
+        # Each round either removes the element from a leaf or moves the deletion further down the tree
+        while True:
+            # Traverse and find the node with element and the index where element is found
+            found_node, found_index = self.traverse_and_find(start_node, element, path)
+            # If node is not found then return None
+            if not found_node:
+                if self.verbosity:
+                    print("Element not found")
+                return None
+
+            # Remember the element asked for, later rounds delete its predecessor or successor instead
+            if removed_elem is None:
+                removed_elem = found_node.elements[found_index]
+                self._removing(found_node, found_index)
+
+            # Case 1, if node is a leaf and element is >= t or node is the root, delete straight
+            if found_node.is_leaf and (len(found_node.elements) >= self.t or found_node == self.root):
+                found_node.pop_element(found_index)
+                # If node is the root and elements is empty then set root to None
+                if found_node == self.root and not found_node.elements:
+                    self.root = None
+                return removed_elem
+
+            # Case 2a, if node is an internal node, check root node of left subtree
+            left_node = found_node.children[found_index]
+            # If subtree has at least t elements
+            if len(left_node.elements) >= self.t:
+                # Replace element at the found location with the predecessor of found node
+                pred_elem = found_node.replace_with_predecessor(found_index)
+
+                # Go on to delete predecessor element from subtree
+                start_node, element = self._writable_child(found_node, found_index), pred_elem
+                continue
+
+            # Case 2b, mirror of 2a, check root node of right subtree
+            right_node = found_node.children[found_index + 1]
+            # If subtree has at least t elements
+            if len(right_node.elements) >= self.t:
+                # Replace element with the successor of found node
+                succ_elem = found_node.replace_with_successor(found_index)
+
+                start_node, element = self._writable_child(found_node, found_index + 1), succ_elem
+                continue
+
+            # Case 2c, where both left and right has exactly t - 1 elements, merge to become 2t - 1
+            self._writable_child(found_node, found_index)
+            merged_node = found_node.merge_children(found_index)
+
+            # If root element is empty then replace root with the newly merged node
+            if not self.root.elements:
+                self.root = merged_node
+
+            # Go on to delete from merged node
+            start_node = merged_node
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Delete a batch of elements, sorting it first so that the elements coming out of the same leaf are all removed
+        with a single descent from the root.
+        :param elements: Elements to delete.
+        :return: Each element in sorted order with its outcome, DELETED or NOT_FOUND.
+        """
+        batch = sorted(elements)
+        outcomes = []
+
+        position = 0
+        while position < len(batch):
+            element = batch[position]
+            position += 1
+
+            # Repeats within the batch were already taken out
+            if not self.root or (position > 1 and batch[position - 2] == element):
+                outcomes.append((element, NOT_FOUND))
+                continue
+
+            # Full descent for the first element of the run, rotating and merging as usual
+            path = []
+            removed_elem = self._delete(self.root, element, path)
+            if removed_elem is None:
+                outcomes.append((element, NOT_FOUND))
+            else:
+                outcomes.append((element, DELETED))
+                self._path_resized(path, -1)
 
-            return self._delete(right_node, succ_elem)
+            # A probe that missed never went down the tree, so there is no leaf to carry on from
+            if not path:
+                continue
 
-        # Case 2c, where both left and right has exactly t - 1 elements, merge to become 2t - 1
-        merged_node = found_node.merge_children(found_index)
+            # The descent always ends at a leaf, the next elements may come out of it too
+            leaf_node = path[-1]
+            if not self.root or not leaf_node.elements:
+                continue
 
-        # If root element is empty then replace root with the newly merged node
-        if not self.root.elements:
-            self.root = merged_node
+            lower_bound, upper_bound = self._leaf_bounds(path, leaf_node.elements[0])
+            removed = 0
 
-        # Recursive delete from merged node
-        return self._delete(merged_node, element)
+            while position < len(batch):
+                element = batch[position]
+
+                if batch[position - 1] != element:
+                    # Elements at or past the bounds live elsewhere in the tree
+                    if (lower_bound is not None and not element > lower_bound) or \
+                            (upper_bound is not None and not element < upper_bound):
+                        break
+
+                    index, is_found = leaf_node.search(element)
+                    if is_found:
+                        # Removing would leave the leaf short, let the next descent rebalance it first
+                        if leaf_node is not self.root and len(leaf_node.elements) < self.t:
+                            break
+
+                        leaf_node.pop_element(index)
+                        outcomes.append((element, DELETED))
+                        removed += 1
+                        position += 1
+                        continue
+
+                outcomes.append((element, NOT_FOUND))
+                position += 1
+
+            self._path_resized(path, -removed)
+
+            # If node is the root and elements is empty then set root to None
+            if leaf_node is self.root and not leaf_node.elements:
+                self.root = None
+
+        return outcomes
 
     def get_tree_ordered_elems(self) -> list[str]:
         """
@@ -443,6 +1280,461 @@ class BTree:
             if index < len(node.elements):
                 elements.append(node.elements[index])
 
+    def __iter__(self) -> Iterator[str]:
+        """
+        Lazily iterate over the elements of the tree in order.
+        The tree must not be modified while the iterator is in use.
+        :return: An iterator over the ordered elements.
+        """
+        return self._walk(self._seek(None))
+
+    def range(self, lo: str | None = None, hi: str | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> Iterator[str]:
+        """
+        Lazily iterate over the elements between lo and hi in order.
+        The tree must not be modified while the iterator is in use.
+        :param lo: Lower bound, None to start from the smallest element.
+        :param hi: Upper bound, None to run until the largest element.
+        :param inclusive: Whether lo and hi themselves are included.
+        :return: An iterator over the ordered elements in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+
+        for element in self._walk(self._seek(lo, lo_inclusive)):
+            # Stop at the first element past the upper bound
+            if hi is not None and (element > hi or (element == hi and not hi_inclusive)):
+                return
+            yield element
+
+    def prefix_scan(self, prefix: str, limit: int | None = None) -> Iterator[str]:
+        """
+        Lazily iterate over the elements that start with prefix in order.
+        The tree must not be modified while the iterator is in use.
+        :param prefix: Prefix the elements must start with.
+        :param limit: Maximum number of elements to yield, None for no limit.
+        :return: An iterator over the ordered elements with the prefix.
+        """
+        # Every element with the prefix is >= prefix, so start from the first such element
+        return take_prefix(self.range(prefix), prefix, limit)
+
+    def _seek(self, element: str | None, inclusive: bool = True) -> list[tuple[BTNode, int]]:
+        """
+        Build the stack used for in-order iteration, positioned at the first element that is not below element.
+        Each stack entry is a node and the index of the next element to yield from it.
+        :param element: Element to seek to, None to seek to the smallest element.
+        :param inclusive: Whether an element equal to element is included.
+        :return: The iteration stack.
+        """
+        stack = []
+        node = self.root
+
+        while node:
+            # With nothing to seek to, keep to the leftmost path
+            if element is None:
+                index, is_found = 0, False
+            else:
+                index, is_found = node.search(element)
+
+            if is_found:
+                if inclusive:
+                    # Start straight from the matching element
+                    stack.append((node, index))
+                    return stack
+
+                # Skip the matching element and continue from the leftmost path of its right subtree
+                index += 1
+                element = None
+
+            stack.append((node, index))
+
+            if node.is_leaf:
+                break
+
+            node = node.children[index]
+
+        return stack
+
+    @staticmethod
+    def _walk(stack: list[tuple[BTNode, int]]) -> Iterator[str]:
+        """
+        Yield elements in order from an iteration stack built by _seek.
+        :param stack: The iteration stack, consumed as elements are yielded.
+        :return: An iterator over the ordered elements.
+        """
+        while stack:
+            node, index = stack[-1]
+
+            # Every element in this node has been yielded, go back to the parent
+            if index == len(node.elements):
+                stack.pop()
+                continue
+
+            # A leaf has nothing below it, so the rest of its elements go out in one run
+            if node.is_leaf:
+                stack.pop()
+                yield from node.elements[index:]
+                continue
+
+            yield node.elements[index]
+            stack[-1] = (node, index + 1)
+
+            # Go down the leftmost path of the subtree to the right of the yielded element
+            if not node.is_leaf:
+                child = node.children[index + 1]
+                while True:
+                    stack.append((child, 0))
+                    if child.is_leaf:
+                        break
+                    child = child.children[0]
+
+    def union(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        """
+        Build a new tree of the elements in either tree, in O(n + m).
+        :param other: The other tree.
+        :return: The new tree, of the same type and degree as this one.
+        """
+        return self._combine(other, True, True, True)
+
+    def intersection(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        """
+        Build a new tree of the elements in both trees, in O(n + m).
+        :param other: The other tree.
+        :return: The new tree, of the same type and degree as this one.
+        """
+        return self._combine(other, False, True, False)
+
+    def difference(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        """
+        Build a new tree of the elements in this tree but not in the other, in O(n + m).
+        :param other: The other tree.
+        :return: The new tree, of the same type and degree as this one.
+        """
+        return self._combine(other, True, False, False)
+
+    def symmetric_difference(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        """
+        Build a new tree of the elements in exactly one of the trees, in O(n + m).
+        :param other: The other tree.
+        :return: The new tree, of the same type and degree as this one.
+        """
+        return self._combine(other, True, False, True)
+
+    def __or__(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        return self.union(other)
+
+    def __and__(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        return self.intersection(other)
+
+    def __sub__(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        return self.difference(other)
+
+    def __xor__(self, other: 'BTree | BTreeSnapshot') -> 'BTree':
+        return self.symmetric_difference(other)
+
+    def _combine(self, other: 'BTree | BTreeSnapshot', keep_left: bool, keep_both: bool,
+                 keep_right: bool) -> 'BTree':
+        """
+        Merge the elements of both trees in order and bulk load the ones kept, instead of inserting them one by one.
+        :param other: The other tree.
+        :param keep_left: Whether elements only in this tree are kept.
+        :param keep_both: Whether elements in both trees are kept.
+        :param keep_right: Whether elements only in the other tree are kept.
+        :return: The new tree, of the same type and degree as this one.
+        """
+        kept = {(True, False): keep_left, (True, True): keep_both, (False, True): keep_right}
+        merged = [element for element, in_left, in_right in self._merge_sorted(self, other) if kept[in_left, in_right]]
+
+        # The merge gives the elements in order, so there is nothing for bulk_load to check
+        return type(self)._load_sorted(merged, self.t, verbosity=self.verbosity)
+
+    @staticmethod
+    def _merge_sorted(left: Iterable[str], right: Iterable[str]) -> Iterator[tuple[str, bool, bool]]:
+        """
+        Merge two streams of elements, each in strictly increasing order, in a single pass over both in O(n + m).
+        :param left: The first stream.
+        :param right: The second stream.
+        :return: An iterator over every element of either stream once, in increasing order, with whether it is in left
+            and whether it is in right.
+        """
+        left, right = iter(left), iter(right)
+        left_elem = next(left, None)
+        right_elem = next(right, None)
+
+        while left_elem is not None and right_elem is not None:
+            if left_elem < right_elem:
+                yield left_elem, True, False
+                left_elem = next(left, None)
+            elif right_elem < left_elem:
+                yield right_elem, False, True
+                right_elem = next(right, None)
+            else:
+                yield left_elem, True, True
+                left_elem = next(left, None)
+                right_elem = next(right, None)
+
+        # One stream has run out, whatever is left of the other one is only in that one
+        if left_elem is not None:
+            yield left_elem, True, False
+            yield from zip(left, itertools.repeat(True), itertools.repeat(False))
+        if right_elem is not None:
+            yield right_elem, False, True
+            yield from zip(right, itertools.repeat(False), itertools.repeat(True))
+
+
+class BTreeSnapshot:
+    """
+    Class representing a read-only view of a B-Tree as it was when the snapshot was taken. Writes to the tree after
+    that copy the nodes they change, so the view keeps seeing the same elements without the tree being copied.
+
+    Attributes:
+        _tree: Frozen tree sharing its nodes with the tree the snapshot was taken of.
+    """
+
+    # Read-only methods of order statistic trees that the view passes through
+    ORDER_STATISTIC_METHODS = ("rank", "select", "count_range")
+    # Read-only methods of B-Tree maps that the view passes through
+    MAP_METHODS = ("items", "keys", "values")
+    # Set operations build a new tree, so the view passes them through as well
+    SET_METHODS = ("union", "intersection", "difference", "symmetric_difference")
+
+    def __init__(self, tree: BTree) -> None:
+        """
+        Constructor for a B-Tree snapshot.
+        :param tree: Frozen tree to give a view of.
+        """
+        self._tree = tree
+
+    @property
+    def root(self) -> BTNode | None:
+        return self._tree.root
+
+    @property
+    def t(self) -> int:
+        return self._tree.t
+
+    def __getattr__(self, name: str):
+        if name in self.ORDER_STATISTIC_METHODS or name in self.MAP_METHODS or name in self.SET_METHODS:
+            return getattr(self._tree, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}', snapshots are read-only")
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        return self._tree.get(element, default)
+
+    def contains(self, element: str) -> bool:
+        return self._tree.contains(element)
+
+    def __contains__(self, element: str) -> bool:
+        return self._tree.contains(element)
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def get_tree_ordered_elems(self) -> list[str]:
+        return self._tree.get_tree_ordered_elems()
+
+    def dump(self, target) -> None:
+        self._tree.dump(target)
+
+    # The scans are generators of the view itself, so that the tree keeps copying nodes for as long as a scan is
+    # still running, even once nothing else refers to the snapshot
+    def __iter__(self) -> Iterator[str]:
+        yield from self._tree
+
+    def range(self, lo: str | None = None, hi: str | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> Iterator[str]:
+        yield from self._tree.range(lo, hi, inclusive)
+
+    def prefix_scan(self, prefix: str, limit: int | None = None) -> Iterator[str]:
+        yield from self._tree.prefix_scan(prefix, limit)
+
+
+class OrderStatisticBTree(BTree):
+    """
+    Class representing a B-Tree where every node keeps the size of its subtree, so that elements can be looked up
+    by their position in the ordering in logarithmic time.
+    """
+
+    node_class = CountedBTNode
+
+    @classmethod
+    def _load_sorted(cls, keys: list[str], degree: int, fill_factor: float = 1.0,
+                     verbosity: int = 0) -> 'OrderStatisticBTree':
+        """
+        Build an order statistic B-Tree bottom-up from elements known to be sorted, counting the subtree sizes.
+        :param keys: Elements in strictly increasing order.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree.
+        """
+        tree = super()._load_sorted(keys, degree, fill_factor, verbosity)
+        tree.recount(tree.root)
+        return tree
+
+    @classmethod
+    def load(cls, source, verbosity: int = 0) -> 'OrderStatisticBTree':
+        """
+        Rebuild an order statistic B-Tree from a snapshot written by dump.
+        :param source: Path to read from, or a binary file object to stream the snapshot from.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree.
+        """
+        tree = super().load(source, verbosity)
+        tree.recount(tree.root)
+        return tree
+
+    def recount(self, node: CountedBTNode | None) -> int:
+        """
+        Recompute the subtree sizes of a node and everything below it.
+        :param node: Node to recount from.
+        :return: Number of elements in the subtree.
+        """
+        if not node:
+            return 0
+
+        node.size = len(node.elements)
+        if not node.is_leaf:
+            for child in node.children:
+                node.size += self.recount(child)
+
+        return node.size
+
+    def insert(self, element: str) -> bool:
+        """
+        Insert element into B-Tree node, updating the subtree sizes on the way.
+        :param element: Element to insert.
+        :return: True if the element was inserted, False if it was already in the tree.
+        """
+        path = []
+        if not self._insert(element, path):
+            return False
+
+        self._path_resized(path, 1)
+        return True
+
+    def delete(self, element: str) -> str | None:
+        """
+        Delete element from B-Tree, updating the subtree sizes on the way.
+        :param element: Element to delete.
+        :return: Element that was deleted, None if element was not found.
+        """
+        if not self.root:
+            return super().delete(element)
+
+        path = []
+        removed_elem = self._delete(self.root, element, path)
+
+        if removed_elem is not None:
+            self._path_resized(path, -1)
+
+        return removed_elem
+
+    def _path_resized(self, path: list[CountedBTNode], delta: int) -> None:
+        """
+        Update the subtree sizes after elements were added to or removed from the leaf at the end of path.
+        :param path: Nodes from the root down to the leaf.
+        :param delta: Number of elements added, negative if elements were removed.
+        :return: None
+        """
+        # Every node on the way down to the leaf gained or lost the same number of elements
+        for node in path:
+            node.size += delta
+
+    def __len__(self) -> int:
+        return self.root.size if self.root else 0
+
+    def rank(self, element: str) -> int:
+        """
+        Count the elements that are smaller than element.
+        :param element: Element to rank, it does not need to be in the tree.
+        :return: Number of elements smaller than element.
+        """
+        return self._rank(element)[0]
+
+    def _rank(self, element: str) -> tuple[int, bool]:
+        """
+        Count the elements that are smaller than element.
+        :param element: Element to rank.
+        :return: Number of elements smaller than element, True if element is in the tree, False otherwise.
+        """
+        rank = 0
+        node = self.root
+
+        while node:
+            index, is_found = node.search(element)
+
+            if node.is_leaf:
+                return rank + index, is_found
+
+            # Everything in the subtrees to the left of index is smaller, as are the elements between them
+            for child_index in range(index):
+                rank += node.children[child_index].size
+            rank += index
+
+            # The subtree between the element and its predecessor is smaller as well
+            if is_found:
+                return rank + node.children[index].size, True
+
+            node = node.children[index]
+
+        return rank, False
+
+    def select(self, index: int) -> str:
+        """
+        Get the element at a position in the ordering.
+        :param index: Zero-based position of the element, negative positions count from the end.
+        :return: The element at index.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BTree index out of range")
+
+        node = self.root
+        while not node.is_leaf:
+            for child_index, child in enumerate(node.children):
+                # The element is inside this subtree
+                if index < child.size:
+                    node = child
+                    break
+
+                # Skip the subtree, the element right after it is the one we want if nothing is left
+                index -= child.size
+                if index == 0:
+                    return node.elements[child_index]
+                index -= 1
+
+        return node.elements[index]
+
+    def count_range(self, lo: str | None = None, hi: str | None = None,
+                    inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """
+        Count the elements between lo and hi.
+        :param lo: Lower bound, None to count from the smallest element.
+        :param hi: Upper bound, None to count up to the largest element.
+        :param inclusive: Whether lo and hi themselves are included.
+        :return: Number of elements in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+
+        # Position just past the last element in the range
+        if hi is None:
+            upper = len(self)
+        else:
+            upper, is_found = self._rank(hi)
+            if is_found and hi_inclusive:
+                upper += 1
+
+        # Position of the first element in the range
+        if lo is None:
+            lower = 0
+        else:
+            lower, is_found = self._rank(lo)
+            if is_found and not lo_inclusive:
+                lower += 1
+
+        return max(0, upper - lower)
+
 
 if __name__ == "__main__":
     words = [
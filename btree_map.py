@@ -0,0 +1,479 @@
+import pickle
+import struct
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from btree import BTNode, BTree, BTreeSnapshot, check_strictly_increasing
+
+# Default for lookups that must tell a missing key from a None value
+_MISSING = object()
+
+# Map snapshots add a values section after the keys, the byte length of the pickled values then the values
+SNAPSHOT_VALUES_LENGTH = struct.Struct("<Q")
+
+
+class MapBTNode(BTNode):
+    """
+    Class representing a B-Tree node that maps each of its elements to a value. The values sit in a list parallel to
+    the elements, so searches compare keys only, and move along with their elements on every split, merge and
+    rotation.
+
+    Attributes:
+        values: Value of each element, at the same index.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        """
+        Constructor for map B-Tree node.
+        """
+        super().__init__(is_leaf)
+        self.values: list[Any] = []
+
+    def copy(self) -> 'MapBTNode':
+        """
+        Copy the node, sharing its children but not its lists.
+        :return: The copy.
+        """
+        clone = super().copy()
+        clone.values = self.values[:]
+        return clone
+
+    def insert_element(self, index: int, element: str) -> None:
+        """
+        Insert an element into the node, with a None value until the map sets it.
+        :param index: Index to insert the element at.
+        :param element: Element to insert.
+        :return: None
+        """
+        super().insert_element(index, element)
+        self.values.insert(index, None)
+
+    def pop_element(self, index: int) -> str:
+        """
+        Remove an element and its value from the node.
+        :param index: Index of the element to remove.
+        :return: The removed element.
+        """
+        self.values.pop(index)
+        return super().pop_element(index)
+
+    def replace_with_predecessor(self, elem_index: int) -> str:
+        """
+        Replace an element and its value with its predecessor's.
+        :param elem_index: Index of the element to replace.
+        :return: The predecessor element.
+        """
+        leaf_node = self.children[elem_index]
+        while not leaf_node.is_leaf:
+            leaf_node = leaf_node.children[-1]
+        self.values[elem_index] = leaf_node.values[-1]
+
+        return super().replace_with_predecessor(elem_index)
+
+    def replace_with_successor(self, elem_index: int) -> str:
+        """
+        Replace an element and its value with its successor's.
+        :param elem_index: Index of the element to replace.
+        :return: The successor element.
+        """
+        leaf_node = self.children[elem_index + 1]
+        while not leaf_node.is_leaf:
+            leaf_node = leaf_node.children[0]
+        self.values[elem_index] = leaf_node.values[0]
+
+        return super().replace_with_successor(elem_index)
+
+    def split_node(self, insert_loc: int, parent_node: 'MapBTNode') -> None:
+        """
+        Split B-Tree node into two B-Tree nodes, splitting the values the same way.
+        :param insert_loc: Location to insert element into parent B-Tree node.
+        :param parent_node: Parent B-Tree node.
+        :return: None
+        """
+        median_ind = len(self.elements) // 2
+        values = self.values
+
+        super().split_node(insert_loc, parent_node)
+
+        # The median value goes up with its element, the ones after it go to the new right node
+        parent_node.children[insert_loc + 1].values = values[median_ind + 1:]
+        parent_node.values.insert(insert_loc, values[median_ind])
+        self.values = values[:median_ind]
+
+    def merge_children(self, elem_index: int) -> 'MapBTNode':
+        """
+        Merge B-Tree nodes into a B-Tree node, bringing the middle value down with its element.
+        :param elem_index: Index of element to push down to merged B-Tree node.
+        :return: The merged B-Tree node.
+        """
+        left_node = self.children[elem_index]
+        left_node.values += [self.values.pop(elem_index)] + self.children[elem_index + 1].values
+
+        return super().merge_children(elem_index)
+
+    def rotate_from_left(self, elem_index: int) -> None:
+        """
+        Rotate B-Tree node from left to right, rotating the values along.
+        :param elem_index: Element to rotate down to the right B-Tree node.
+        :return: None
+        """
+        self.children[elem_index].values.insert(0, self.values[elem_index - 1])
+        self.values[elem_index - 1] = self.children[elem_index - 1].values.pop()
+
+        super().rotate_from_left(elem_index)
+
+    def rotate_from_right(self, elem_index: int) -> None:
+        """
+        Rotate B-Tree node from right to left, rotating the values along.
+        :param elem_index: Element to rotate down to the left B-Tree node.
+        :return: None
+        """
+        self.children[elem_index].values.append(self.values[elem_index])
+        self.values[elem_index] = self.children[elem_index + 1].values.pop(0)
+
+        super().rotate_from_right(elem_index)
+
+
+class BTreeMap(BTree):
+    """
+    Class representing an ordered map from string keys to values, stored in a single B-Tree instead of a B-Tree of
+    keys next to a dict of values. Iterating over the map gives its keys in order.
+
+    Attributes:
+        size: Number of keys in the map.
+        _removed_value: Value of the key the running delete is removing.
+    """
+
+    # Class used to create the nodes of the tree
+    node_class = MapBTNode
+
+    def __init__(self, degree: int, verbosity: int = 0) -> None:
+        """
+        Constructor for B-Tree map.
+        :param degree: Degree of the B-Tree.
+        :param verbosity: Verbosity level.
+        """
+        super().__init__(degree, verbosity)
+        self.size = 0
+        self._removed_value = None
+
+    @classmethod
+    def bulk_load(cls, items: Iterable[tuple[str, Any]], degree: int, fill_factor: float = 1.0,
+                  verbosity: int = 0) -> 'BTreeMap':
+        """
+        Build a B-Tree map bottom-up from items whose keys are already sorted.
+        :param items: (key, value) pairs in strictly increasing order of key.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree map.
+        """
+        items = list(items)
+        check_strictly_increasing([key for key, _ in items])
+        return cls._load_items(items, degree, fill_factor, verbosity)
+
+    @classmethod
+    def _load_items(cls, items: list[tuple[str, Any]], degree: int, fill_factor: float = 1.0,
+                    verbosity: int = 0) -> 'BTreeMap':
+        """
+        Build a B-Tree map bottom-up from items known to be in strictly increasing order of key, the part of bulk_load
+        after the order check.
+        :param items: (key, value) pairs in strictly increasing order of key.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree map.
+        """
+        tree = cls._load_sorted([key for key, _ in items], degree, fill_factor, verbosity)
+        tree.size = len(items)
+
+        # The keys were packed in order, so handing out the values in order lines them up
+        values = iter([value for _, value in items])
+        stack = [tree.root] if tree.root else []
+        while stack:
+            node = stack.pop()
+            node.values = [None] * len(node.elements)
+            stack += node.children
+
+        positions = tree._walk_positions(tree._seek(None))
+        for (node, index), value in zip(positions, values):
+            node.values[index] = value
+
+        return tree
+
+    def _dump_values(self, target) -> None:
+        """
+        Write the values after the keys, as one pickled list in the same node order as the keys.
+        :param target: Binary file object the snapshot is being written to.
+        :return: None
+        """
+        values = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            values += node.values
+            if not node.is_leaf:
+                stack.extend(reversed(node.children))
+
+        data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+        target.write(SNAPSHOT_VALUES_LENGTH.pack(len(data)))
+        target.write(data)
+
+    def _load_values(self, nodes: list[MapBTNode], buffered: bytes, source) -> None:
+        """
+        Read the values written by _dump_values and hand them out to the loaded nodes.
+        :param nodes: The loaded nodes, in the preorder of the snapshot.
+        :param buffered: Bytes after the keys section already read from the source.
+        :param source: Binary file object the rest of the snapshot is read from.
+        :return: None
+        """
+        prefix_size = SNAPSHOT_VALUES_LENGTH.size
+        if len(buffered) < prefix_size:
+            buffered += source.read(prefix_size - len(buffered))
+        if len(buffered) < prefix_size:
+            raise ValueError("Snapshot is truncated")
+
+        length = SNAPSHOT_VALUES_LENGTH.unpack_from(buffered)[0]
+        data = buffered[prefix_size:prefix_size + length]
+        if len(data) < length:
+            data += source.read(length - len(data))
+        if len(data) < length:
+            raise ValueError("Snapshot is truncated")
+
+        values = pickle.loads(data)
+        if len(values) != sum(len(node.elements) for node in nodes):
+            raise ValueError("Snapshot values do not match its keys")
+
+        position = 0
+        for node in nodes:
+            node.values = values[position:position + len(node.elements)]
+            position += len(node.elements)
+        self.size = len(values)
+
+    def _combine(self, other: 'BTreeMap | BTreeSnapshot', keep_left: bool, keep_both: bool,
+                 keep_right: bool) -> 'BTreeMap':
+        """
+        Merge the items of both maps in key order and bulk load the ones kept. A key in both maps keeps the value it
+        has in the other map, the way dict.update does.
+        :param other: The other map.
+        :param keep_left: Whether keys only in this map are kept.
+        :param keep_both: Whether keys in both maps are kept.
+        :param keep_right: Whether keys only in the other map are kept.
+        :return: The new map, of the same type and degree as this one.
+        """
+        kept = {(True, False): keep_left, (True, True): keep_both, (False, True): keep_right}
+        left_values, right_values = self.values(), other.values()
+
+        items = []
+        for key, in_left, in_right in self._merge_sorted(self, other):
+            # Each map gives its values in the order of its keys, so taking the next one whenever a map has the key
+            # pairs them up
+            value = next(left_values) if in_left else None
+            if in_right:
+                value = next(right_values)
+            if kept[in_left, in_right]:
+                items.append((key, value))
+
+        return type(self)._load_items(items, self.t, verbosity=self.verbosity)
+
+    def _removing(self, node: MapBTNode, index: int) -> None:
+        self._removed_value = node.values[index]
+
+    def _path_resized(self, path: list[BTNode], delta: int) -> None:
+        self.size += delta
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _find(self, key: str) -> tuple[MapBTNode | None, int, bool]:
+        """
+        Find where a key is or would go, without restructuring the tree.
+        :param key: Key to search for.
+        :return: The node holding the key, or the leaf it would be inserted into, the index in that node and True if
+            the key is in the map, None for the node if the map is empty.
+        """
+        node = self._finger_leaf(key) or self.root
+        index = -1
+
+        while node:
+            index, is_found = node.search(key)
+            if is_found or node.is_leaf:
+                return node, index, is_found
+
+            node = node.children[index]
+
+        return None, index, False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up the value of a key.
+        :param key: Key to search for.
+        :param default: Value to return when the key is not in the map.
+        :return: The value of the key, default if it is not in the map.
+        """
+        node, index, is_found = self._find(key)
+        return node.values[index] if is_found else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Set the value of a key, adding the key if it is not in the map yet.
+        :param key: The key.
+        :param value: Its value.
+        :return: None
+        """
+        node, index, is_found = self._find(key)
+
+        # Nothing is shared with a snapshot, so the node the lookup ended on can be changed in place
+        if self._owned is None and node is not None:
+            if is_found:
+                node.values[index] = value
+                return
+
+            # A leaf with room takes the key as it is, the splits on the way down would only be needed if it was full
+            if len(node.elements) < 2 * self.t - 1:
+                node.insert_element(index, key)
+                node.values[index] = value
+                self.size += 1
+                return
+
+        if is_found:
+            # A node a snapshot shares is copied, along with the path to it, before its value changes
+            node, index = self._find_writable(key)
+            node.values[index] = value
+            return
+
+        self._insert(key)
+        self.size += 1
+
+        # The insert left the finger on the leaf the key went into
+        leaf_node = self._finger[0]
+        leaf_node.values[leaf_node.search(key)[0]] = value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def _find_writable(self, key: str) -> tuple[MapBTNode, int]:
+        """
+        Find the node holding a key that is in the map, copying every node on the way that a snapshot shares.
+        :param key: Key to search for.
+        :return: The node and the index of the key in it.
+        """
+        node = self._writable_root()
+        while True:
+            index, is_found = node.search(key)
+            if is_found:
+                return node, index
+            node = self._writable_child(node, index)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """
+        Get the value of a key, adding it with default as its value if it is not in the map.
+        :param key: The key.
+        :param default: Value to add the key with.
+        :return: The value of the key.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            self.put(key, default)
+            return default
+        return value
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        """
+        Remove a key and get its value.
+        :param key: The key.
+        :param default: Value to return when the key is not in the map, KeyError is raised if not given.
+        :return: The value the key had.
+        """
+        if self.root is None or self._delete(self.root, key) is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        self.size -= 1
+        return self._removed_value
+
+    def __delitem__(self, key: str) -> None:
+        self.pop(key)
+
+    def insert(self, element: str) -> bool:
+        """
+        Add a key with a None value, leaving the map as it is if the key is already in it.
+        :param element: Key to add.
+        :return: True if the key was added, False if it was already in the map.
+        """
+        if not self._insert(element):
+            return False
+
+        self.size += 1
+        return True
+
+    def delete(self, element: str) -> str | None:
+        """
+        Remove a key and its value.
+        :param element: Key to remove.
+        :return: The key that was removed, None if it was not in the map.
+        """
+        removed_elem = super().delete(element)
+        if removed_elem is not None:
+            self.size -= 1
+        return removed_elem
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def values(self) -> Iterator[Any]:
+        for node, index in self._walk_positions(self._seek(None)):
+            yield node.values[index]
+
+    def items(self, lo: str | None = None, hi: str | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> Iterator[tuple[str, Any]]:
+        """
+        Lazily iterate over the (key, value) pairs with keys between lo and hi, in key order.
+        The map must not be modified while the iterator is in use.
+        :param lo: Lower bound, None to start from the smallest key.
+        :param hi: Upper bound, None to run until the largest key.
+        :param inclusive: Whether lo and hi themselves are included.
+        :return: An iterator over the ordered items.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+
+        for node, index in self._walk_positions(self._seek(lo, lo_inclusive)):
+            key = node.elements[index]
+            if hi is not None and (key > hi or (key == hi and not hi_inclusive)):
+                return
+            yield key, node.values[index]
+
+    @staticmethod
+    def _walk_positions(stack: list[tuple[BTNode, int]]) -> Iterator[tuple[BTNode, int]]:
+        """
+        Yield the node and index of each element in order from an iteration stack built by _seek, the way _walk
+        yields the elements.
+        :param stack: The iteration stack, consumed as positions are yielded.
+        :return: An iterator over the positions of the ordered elements.
+        """
+        while stack:
+            node, index = stack[-1]
+
+            if index == len(node.elements):
+                stack.pop()
+                continue
+
+            yield node, index
+            stack[-1] = (node, index + 1)
+
+            if not node.is_leaf:
+                child = node.children[index + 1]
+                while True:
+                    stack.append((child, 0))
+                    if child.is_leaf:
+                        break
+                    child = child.children[0]
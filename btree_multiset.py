@@ -0,0 +1,303 @@
+import operator
+from collections.abc import Callable, Iterable, Iterator
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, BTreeSnapshot
+from btree_map import _MISSING, BTreeMap, MapBTNode
+
+
+class BTreeMultiset(BTreeMap):
+    """
+    Class representing a sorted multiset of strings, such as the words of a text with their frequencies. Each distinct
+    element is stored once with its count as its value, so inserting an element that is already there only increments
+    its count, and deleting it only decrements its count, without changing the shape of the tree. The element only
+    goes in, or comes out with the usual splits, merges and rotations, on its first insert and final delete.
+
+    Iterating over the multiset gives each distinct element once, in order. The set operations combine counts the way
+    Counter does, union keeps the larger count, intersection the smaller one, difference subtracts, and + adds them up.
+
+    Attributes:
+        total: Number of elements in the multiset, counting repeats.
+    """
+
+    def __init__(self, degree: int, verbosity: int = 0) -> None:
+        """
+        Constructor for B-Tree multiset.
+        :param degree: Degree of the B-Tree.
+        :param verbosity: Verbosity level.
+        """
+        super().__init__(degree, verbosity)
+        self.total = 0
+
+    @classmethod
+    def bulk_load(cls, items: Iterable[tuple[str, int]], degree: int, fill_factor: float = 1.0,
+                  verbosity: int = 0) -> 'BTreeMultiset':
+        """
+        Build a B-Tree multiset bottom-up from counted elements that are already sorted.
+        :param items: (element, count) pairs in strictly increasing order of element, every count at least 1.
+        :param degree: Degree of the B-Tree.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded B-Tree multiset.
+        """
+        items = list(items)
+        if any(count < 1 for _, count in items):
+            raise ValueError("Counts must be at least 1")
+
+        return super().bulk_load(items, degree, fill_factor, verbosity)
+
+    @classmethod
+    def _load_items(cls, items: list[tuple[str, int]], degree: int, fill_factor: float = 1.0,
+                    verbosity: int = 0) -> 'BTreeMultiset':
+        tree = super()._load_items(items, degree, fill_factor, verbosity)
+        tree.total = sum(count for _, count in items)
+        return tree
+
+    def _load_values(self, nodes: list[MapBTNode], buffered: bytes, source) -> None:
+        super()._load_values(nodes, buffered, source)
+        self.total = sum(self.values())
+
+    def __len__(self) -> int:
+        return self.total
+
+    def count(self, element: str) -> int:
+        """
+        Count the occurrences of an element.
+        :param element: Element to count.
+        :return: Number of times the element is in the multiset, 0 if it is not in it.
+        """
+        return self.get(element, 0)
+
+    def insert(self, element: str) -> bool:
+        """
+        Add one occurrence of an element.
+        :param element: Element to insert.
+        :return: True if the element was not in the multiset before, False if only its count went up.
+        """
+        node, index, is_found = self._find(element)
+        self.total += 1
+
+        if not is_found:
+            super().put(element, 1)
+            return True
+
+        # A node a snapshot shares is copied, along with the path to it, before its count changes
+        if self._owned is not None:
+            node, index = self._find_writable(element)
+        node.values[index] += 1
+        return False
+
+    def delete(self, element: str) -> str | None:
+        """
+        Remove one occurrence of an element. Only the final one takes the element out of the tree.
+        :param element: Element to delete.
+        :return: Element that was deleted, None if element was not found.
+        """
+        node, index, is_found = self._find(element)
+        if not is_found:
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        self.total -= 1
+
+        # The element stays where it is while other occurrences are left
+        if node.values[index] > 1:
+            if self._owned is not None:
+                node, index = self._find_writable(element)
+            node.values[index] -= 1
+            return node.elements[index]
+
+        return super().delete(element)
+
+    def put(self, key: str, value: int) -> None:
+        """
+        Set the count of an element, adding the element if it is not in the multiset yet.
+        :param key: The element.
+        :param value: Its count, at least 1.
+        :return: None
+        """
+        # An element with no occurrences is not in the multiset at all, so it cannot be stored with a count below 1
+        if value < 1:
+            raise ValueError("Counts must be at least 1")
+
+        self.total += value - self.get(key, 0)
+        super().put(key, value)
+
+    def pop(self, key: str, default: int | None = _MISSING) -> int | None:
+        """
+        Remove every occurrence of an element.
+        :param key: The element.
+        :param default: Value to return when the element is not in the multiset, KeyError is raised if not given.
+        :return: The count the element had.
+        """
+        count = super().pop(key, None)
+        if count is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+
+        self.total -= count
+        return count
+
+    def _descend_writable(self, element: str) -> tuple[MapBTNode, str | None]:
+        """
+        Walk down to the node holding an element, or to the leaf it would go into, copying every node on the way that a
+        snapshot shares, without restructuring the tree.
+        :param element: Element to search for.
+        :return: The node and the closest ancestor element above everything in it, None where there is none.
+        """
+        node = self._writable_root()
+        upper_bound = None
+
+        while True:
+            index, is_found = node.search(element)
+            if is_found or node.is_leaf:
+                return node, upper_bound
+
+            if index < len(node.elements):
+                upper_bound = node.elements[index]
+            node = self._writable_child(node, index)
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Insert a batch of elements, sorting it first so that the elements found in the same node all have their counts
+        bumped with a single descent from the root. Only elements that are new to the multiset change its shape.
+        :param elements: Elements to insert.
+        :return: Each element in sorted order with its outcome, INSERTED the first time an element goes in, DUPLICATE
+            when only its count went up.
+        """
+        batch = sorted(elements)
+        outcomes = []
+        max_elements = 2 * self.t - 1
+        self.total += len(batch)
+
+        position = 0
+        while position < len(batch):
+            if self.root is None:
+                node, upper_bound = None, None
+            else:
+                node, upper_bound = self._descend_writable(batch[position])
+
+            while position < len(batch):
+                element = batch[position]
+
+                if node is not None:
+                    index, is_found = node.search(element)
+                    if is_found:
+                        node.values[index] += 1
+                        outcomes.append((element, DUPLICATE))
+                        position += 1
+                        continue
+
+                    # Elements at or past the bound, or missing from an internal node, need a descent of their own
+                    if not node.is_leaf or (upper_bound is not None and not element < upper_bound):
+                        break
+
+                    # A new element goes straight into a leaf with room, like the single put
+                    if len(node.elements) < max_elements:
+                        node.insert_element(index, element)
+                        node.values[index] = 1
+                        self.size += 1
+                        outcomes.append((element, INSERTED))
+                        position += 1
+                        continue
+
+                # The full descent splits the nodes on the way, so the next elements start over from the root
+                self._insert(element)
+                self.size += 1
+                leaf_node = self._finger[0]
+                leaf_node.values[leaf_node.search(element)[0]] = 1
+                outcomes.append((element, INSERTED))
+                position += 1
+                break
+
+        return outcomes
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Delete one occurrence of each element of a batch, sorting it first so that the elements found in the same node
+        all have their counts lowered with a single descent from the root. Only the final occurrence of an element
+        changes the shape of the multiset.
+        :param elements: Elements to delete.
+        :return: Each element in sorted order with its outcome, DELETED or NOT_FOUND.
+        """
+        batch = sorted(elements)
+        outcomes = []
+
+        position = 0
+        while position < len(batch):
+            if self.root is None:
+                outcomes.extend((element, NOT_FOUND) for element in batch[position:])
+                break
+
+            node, upper_bound = self._descend_writable(batch[position])
+
+            while position < len(batch):
+                element = batch[position]
+                index, is_found = node.search(element)
+
+                if is_found:
+                    self.total -= 1
+                    outcomes.append((element, DELETED))
+                    position += 1
+
+                    if node.values[index] > 1:
+                        node.values[index] -= 1
+                        continue
+
+                    # The final occurrence takes the element out with the usual merges and rotations
+                    super().delete(element)
+                    break
+
+                # Elements at or past the bound, or missing from an internal node, need a descent of their own
+                if not node.is_leaf or (upper_bound is not None and not element < upper_bound):
+                    break
+
+                outcomes.append((element, NOT_FOUND))
+                position += 1
+
+        return outcomes
+
+    def elements(self) -> Iterator[str]:
+        """
+        Lazily iterate over the elements in order, repeating each as many times as its count.
+        The multiset must not be modified while the iterator is in use.
+        :return: An iterator over the ordered elements with their repeats.
+        """
+        for element, count in self.items():
+            for _ in range(count):
+                yield element
+
+    def union(self, other: 'BTreeMultiset | BTreeSnapshot') -> 'BTreeMultiset':
+        return self._combine_counts(other, max)
+
+    def intersection(self, other: 'BTreeMultiset | BTreeSnapshot') -> 'BTreeMultiset':
+        return self._combine_counts(other, min)
+
+    def difference(self, other: 'BTreeMultiset | BTreeSnapshot') -> 'BTreeMultiset':
+        return self._combine_counts(other, operator.sub)
+
+    def symmetric_difference(self, other: 'BTreeMultiset | BTreeSnapshot') -> 'BTreeMultiset':
+        return self._combine_counts(other, lambda left, right: abs(left - right))
+
+    def __add__(self, other: 'BTreeMultiset | BTreeSnapshot') -> 'BTreeMultiset':
+        return self._combine_counts(other, operator.add)
+
+    def _combine_counts(self, other: 'BTreeMultiset | BTreeSnapshot',
+                        combine: Callable[[int, int], int]) -> 'BTreeMultiset':
+        """
+        Merge the counted elements of both multisets in order and bulk load the combined counts, in O(n + m).
+        :param other: The other multiset.
+        :param combine: Function giving the new count from the counts in this and the other multiset, 0 where an
+            element is missing. Elements whose new count is not positive are left out.
+        :return: The new multiset, of the same type and degree as this one.
+        """
+        left_counts, right_counts = self.values(), other.values()
+
+        items = []
+        for element, in_left, in_right in self._merge_sorted(self, other):
+            count = combine(next(left_counts) if in_left else 0, next(right_counts) if in_right else 0)
+            if count > 0:
+                items.append((element, count))
+
+        return type(self)._load_items(items, self.t, verbosity=self.verbosity)
@@ -0,0 +1,134 @@
+"""
+Replay a command log against a B-Tree. The log has one command per line, "insert WORD" or "delete WORD", as in the
+__main__ of btree.py. Commands are streamed, so the log is never held in memory, and applied in batches with
+insert_many and delete_many.
+
+Usage: python btree_replay.py [LOG] [--degree T] [--batch N] [--output PATH]
+
+LOG defaults to stdin, and --output - writes the final keys to stdout.
+"""
+import argparse
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from btree import DELETED, INSERTED, BTree
+
+# Commands a log line can start with
+COMMANDS = ("insert", "delete")
+
+
+def read_commands(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Parse a command log one line at a time, skipping blank lines.
+    :param lines: Lines of the log.
+    :return: An iterator over the command and word of each line.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        command, _, word = line.partition(" ")
+        if command not in COMMANDS or not word:
+            raise ValueError(f"Line {line_number}: expected 'insert WORD' or 'delete WORD', got {line!r}")
+
+        yield command, word
+
+
+def apply_batch(tree: BTree, batch: list[tuple[str, str]]) -> int:
+    """
+    Apply a batch of commands in order, running each stretch of consecutive inserts or deletes as a single
+    insert_many or delete_many.
+    :param tree: The B-Tree to apply the commands to.
+    :param batch: Command and word of each command.
+    :return: Change in the number of elements of the tree.
+    """
+    change = 0
+
+    position = 0
+    while position < len(batch):
+        command = batch[position][0]
+        end = position
+        while end < len(batch) and batch[end][0] == command:
+            end += 1
+
+        words = [word for _, word in batch[position:end]]
+        if command == "insert":
+            change += sum(outcome == INSERTED for _, outcome in tree.insert_many(words))
+        else:
+            change -= sum(outcome == DELETED for _, outcome in tree.delete_many(words))
+        position = end
+
+    return change
+
+
+def replay(tree: BTree, lines: Iterable[str], batch_size: int = 10_000) -> tuple[int, int]:
+    """
+    Stream a command log into a tree, holding at most batch_size commands at a time.
+    :param tree: The B-Tree to apply the commands to, empty to start with.
+    :param lines: Lines of the log.
+    :param batch_size: Number of commands applied per batch.
+    :return: Number of commands applied and number of elements in the tree afterwards.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    commands = 0
+    size = 0
+    batch = []
+    for command in read_commands(lines):
+        batch.append(command)
+        if len(batch) == batch_size:
+            size += apply_batch(tree, batch)
+            commands += len(batch)
+            batch = []
+
+    size += apply_batch(tree, batch)
+    commands += len(batch)
+
+    return commands, size
+
+
+def write_keys(tree: BTree, output: TextIO) -> None:
+    """
+    Write the keys of a tree in order, one per line, with a single write.
+    :param tree: The B-Tree to write out.
+    :param output: File to write to.
+    :return: None
+    """
+    text = "\n".join(tree)
+    output.write(text + "\n" if text else "")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log", nargs="?", default="-", help="command log to replay, - for stdin")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the tree")
+    parser.add_argument("--batch", type=int, default=10_000, help="number of commands applied per batch")
+    parser.add_argument("--output", help="file to write the final ordered keys to, - for stdout")
+    args = parser.parse_args()
+
+    tree = BTree(args.degree)
+    start = time.perf_counter()
+    if args.log == "-":
+        commands, size = replay(tree, sys.stdin, args.batch)
+    else:
+        with open(args.log) as log:
+            commands, size = replay(tree, log, args.batch)
+    elapsed = time.perf_counter() - start
+
+    # The report goes to stderr so that the keys can go to stdout
+    print(f"commands: {commands}  throughput: {commands / max(elapsed, 1e-9):.0f} commands/s  final size: {size}",
+          file=sys.stderr)
+
+    if args.output == "-":
+        write_keys(tree, sys.stdout)
+    elif args.output:
+        with open(args.output, "w") as output:
+            write_keys(tree, output)
+
+
+if __name__ == "__main__":
+    main()
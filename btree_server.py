@@ -0,0 +1,243 @@
+"""
+Line protocol server for a B-Tree, over TCP or a Unix socket.
+
+Every request is one line and gets one reply, in order, so clients can pipeline as many requests as they like:
+
+    insert KEY              OK inserted | OK duplicate
+    delete KEY              OK deleted | OK not found
+    get KEY                 OK KEY | NOT_FOUND
+    range LO HI [LIMIT]     OK N, then N lines with the keys
+    prefix PREFIX [LIMIT]   OK N, then N lines with the keys
+    count [LO HI]           OK N
+
+KEY is the rest of the line, it may contain spaces but not be empty. The bounds of range and count are single words,
+* leaves a bound open. Malformed requests get ERR and a message.
+
+Usage: python btree_server.py [--host HOST] [--port PORT | --unix PATH] [--degree T]
+"""
+import argparse
+import asyncio
+import itertools
+from collections import deque
+
+from btree import OrderStatisticBTree
+
+# Bound that leaves a side of a range open
+OPEN_BOUND = "*"
+
+
+class BTreeServer:
+    """
+    Class serving a B-Tree over the line protocol. Requests from every connection are queued and run together once
+    per event loop tick, in the order they arrived; consecutive inserts or deletes in the queue are applied with a
+    single insert_many or delete_many pass over the tree.
+
+    Attributes:
+        tree: The B-Tree being served.
+        batches: Number of insert_many and delete_many passes made.
+    """
+
+    def __init__(self, tree: OrderStatisticBTree) -> None:
+        """
+        Constructor for BTreeServer.
+        :param tree: The B-Tree to serve.
+        """
+        self.tree = tree
+        self.batches = 0
+        self._pending: list[tuple[str, list[str], asyncio.Future]] = []
+        self._flush_scheduled = False
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Read requests from a connection and queue them without waiting for the replies, which a second task sends
+        back in order.
+        :param reader: Stream of the connection to read from.
+        :param writer: Stream of the connection to write to.
+        :return: None
+        """
+        replies: asyncio.Queue[asyncio.Future | None] = asyncio.Queue()
+        sender = asyncio.create_task(self._send_replies(replies, writer))
+
+        try:
+            while line := await reader.readline():
+                replies.put_nowait(self.submit(line.decode().rstrip("\r\n")))
+
+            # The client is done sending, let the remaining replies go out
+            replies.put_nowait(None)
+            await sender
+        finally:
+            sender.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _send_replies(replies: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """
+        Write the replies of a connection in the order of its requests.
+        :param replies: Futures of the replies, None once the connection is done.
+        :param writer: Stream of the connection to write to.
+        :return: None
+        """
+        try:
+            while (reply := await replies.get()) is not None:
+                writer.write((await reply).encode() + b"\n")
+                # Only wait for the socket once the replies ready so far have all been written
+                if replies.empty():
+                    await writer.drain()
+        except ConnectionError:
+            return
+
+    def submit(self, line: str) -> asyncio.Future:
+        """
+        Queue a request to run with the other requests of this tick.
+        :param line: The request line.
+        :return: Future of the reply.
+        """
+        loop = asyncio.get_running_loop()
+        reply = loop.create_future()
+
+        command, _, argument = line.partition(" ")
+        if command in ("insert", "delete", "get"):
+            # A missing or empty KEY leaves no argument, so the request fails the arity check
+            args = [argument] if argument else []
+        else:
+            args = argument.split()
+        error = self._check(command, args)
+        if error:
+            reply.set_result(f"ERR {error}")
+            return reply
+
+        self._pending.append((command, args, reply))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+
+        return reply
+
+    @staticmethod
+    def _check(command: str, args: list[str]) -> str | None:
+        """
+        Check that a request is well formed.
+        :param command: Command of the request.
+        :param args: Arguments of the request.
+        :return: The error message, None if the request is fine.
+        """
+        arity = {"insert": (1, 1), "delete": (1, 1), "get": (1, 1), "range": (2, 3), "prefix": (1, 2),
+                 "count": (0, 2)}
+        if command not in arity:
+            return f"unknown command {command!r}"
+
+        lowest, highest = arity[command]
+        if not lowest <= len(args) <= highest or (command == "count" and len(args) == 1):
+            return f"wrong number of arguments for {command}"
+
+        if command in ("range", "prefix") and len(args) == highest and not args[-1].isdigit():
+            return "LIMIT must be a number"
+
+        return None
+
+    def _flush(self) -> None:
+        """
+        Run every request queued during this tick, in order, batching consecutive writes.
+        :return: None
+        """
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+
+        position = 0
+        while position < len(pending):
+            command = pending[position][0]
+
+            if command in ("insert", "delete"):
+                end = position
+                while end < len(pending) and pending[end][0] == command:
+                    end += 1
+                self._apply_writes(command, pending[position:end])
+                position = end
+                continue
+
+            _, args, reply = pending[position]
+            try:
+                reply.set_result(self._read(command, args))
+            except Exception as error:
+                reply.set_result(f"ERR {error}")
+            position += 1
+
+    def _apply_writes(self, command: str, requests: list[tuple[str, list[str], asyncio.Future]]) -> None:
+        """
+        Apply a run of inserts or deletes with one batch pass over the tree.
+        :param command: insert or delete.
+        :param requests: The requests of the run.
+        :return: None
+        """
+        keys = [args[0] for _, args, _ in requests]
+        batch = self.tree.insert_many if command == "insert" else self.tree.delete_many
+        outcomes = batch(keys)
+        self.batches += 1
+
+        # Outcomes come back sorted, repeats of a key keep their arrival order so the first one is the one that counts
+        by_key: dict[str, deque[str]] = {}
+        for key, outcome in outcomes:
+            by_key.setdefault(key, deque()).append(outcome)
+
+        for key, (_, _, reply) in zip(keys, requests):
+            reply.set_result(f"OK {by_key[key].popleft()}")
+
+    def _read(self, command: str, args: list[str]) -> str:
+        """
+        Answer a read request.
+        :param command: get, range, prefix or count.
+        :param args: Arguments of the request.
+        :return: The reply.
+        """
+        if command == "get":
+            found = self.tree.get(args[0])
+            return "NOT_FOUND" if found is None else f"OK {found}"
+
+        if command == "count":
+            lo, hi = (self._bound(args[0]), self._bound(args[1])) if args else (None, None)
+            return f"OK {self.tree.count_range(lo, hi)}"
+
+        if command == "range":
+            limit = int(args[2]) if len(args) == 3 else None
+            keys = list(itertools.islice(self.tree.range(self._bound(args[0]), self._bound(args[1])), limit))
+        else:
+            limit = int(args[1]) if len(args) == 2 else None
+            keys = list(self.tree.prefix_scan(args[0], limit))
+
+        return "\n".join([f"OK {len(keys)}"] + keys)
+
+    @staticmethod
+    def _bound(word: str) -> str | None:
+        return None if word == OPEN_BOUND else word
+
+
+async def serve(server: BTreeServer, host: str | None = None, port: int | None = None,
+                path: str | None = None) -> asyncio.AbstractServer:
+    """
+    Start accepting connections for a BTreeServer.
+    :param server: The server to handle the connections.
+    :param host: Host to listen on for TCP.
+    :param port: Port to listen on for TCP, 0 to pick a free one.
+    :param path: Path of the Unix socket to listen on instead of TCP.
+    :return: The listening asyncio server.
+    """
+    if path is not None:
+        return await asyncio.start_unix_server(server.handle_connection, path)
+    return await asyncio.start_server(server.handle_connection, host, port)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=7379, help="TCP port to listen on")
+    parser.add_argument("--unix", help="path of a Unix socket to listen on instead of TCP")
+    parser.add_argument("--degree", type=int, default=32, help="degree of the tree")
+    args = parser.parse_args()
+
+    listener = await serve(BTreeServer(OrderStatisticBTree(args.degree)), args.host, args.port, args.unix)
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,525 @@
+import os
+import threading
+from collections.abc import Iterable, Iterator
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, BTNode, BTree, BTreeSnapshot
+
+# What a delete is looking for as it walks down: the element itself, or the predecessor or successor that replaces
+# it in an internal node
+FIND_ELEMENT = 0
+FIND_MAX = 1
+FIND_MIN = 2
+
+
+class RWLatch:
+    """
+    Class representing a reader-writer latch. Any number of readers can hold it at once, writers hold it alone and
+    new readers wait while a writer is waiting, so that writers are not starved.
+    """
+
+    __slots__ = ("_condition", "_readers", "_writer", "_waiting_writers")
+
+    def __init__(self) -> None:
+        """
+        Constructor for an unheld latch.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class LatchedBTNode(BTNode):
+    """
+    Class representing a B-Tree node with a latch guarding its elements and children.
+
+    Attributes:
+        latch: Reader-writer latch of the node.
+    """
+
+    __slots__ = ("latch",)
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        """
+        Constructor for latched B-Tree node.
+        """
+        super().__init__(is_leaf)
+        self.latch = RWLatch()
+
+
+class ConcurrentBTree(BTree):
+    """
+    Class representing a B-Tree that many threads can read and write at once, using latch crabbing: a thread latches
+    a child before letting go of its parent. Inserts split full children and deletes grow minimal children on the way
+    down, so once the next node is safe nothing below can change its ancestors and their latches are released
+    straight away. Readers only ever hold two read latches at a time.
+
+    Scans re-descend from the root for each leaf instead of keeping a stack of nodes, so they never hold latches
+    between elements. They see every element that stays in the tree for the whole scan, in order, and may or may not
+    see the ones changed while it runs. Everything built on scans, get_tree_ordered_elems and the set operations,
+    sees the tree the same way. dump and snapshot instead read latch every node, so they see a single state of it.
+
+    Attributes:
+        _root_latch: Latch guarding which node is the root.
+    """
+
+    node_class = LatchedBTNode
+
+    def __init__(self, degree: int, verbosity: int = 0) -> None:
+        """
+        Constructor for concurrent B-Tree.
+        :param degree: Degree of the B-Tree.
+        :param verbosity: Verbosity level.
+        """
+        super().__init__(degree, verbosity)
+        self._root_latch = RWLatch()
+
+    def get_tree_ordered_elems(self) -> list[str]:
+        """
+        Gets the ordered elements from the tree, through a latched scan.
+        :return: A list of ordered elements.
+        """
+        return list(self)
+
+    def dump(self, target) -> None:
+        """
+        Write the tree to a binary snapshot while every node is read latched, so that it holds a single state of the
+        tree.
+        :param target: Path to write to, or a binary file object.
+        :return: None
+        """
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as file:
+                self.dump(file)
+            return
+
+        latched = self._latch_all()
+        try:
+            super().dump(target)
+        finally:
+            self._release_all(latched)
+
+    def snapshot(self) -> BTreeSnapshot:
+        """
+        Get a read-only view of the tree as it is now. Nodes are changed in place under their latches instead of
+        being copied, so the view cannot share them, and is a copy taken while every node is read latched, in O(n).
+        :return: The snapshot.
+        """
+        latched = self._latch_all()
+        try:
+            elements = super().get_tree_ordered_elems()
+        finally:
+            self._release_all(latched)
+
+        return BTreeSnapshot(BTree.bulk_load(elements, self.t, verbosity=self.verbosity))
+
+    def _latch_all(self) -> list[LatchedBTNode]:
+        """
+        Read latch the whole tree top down. Holding the root latch keeps new writers out, and each node is only
+        latched once the writer that may still be working in it has moved on below it, where it is waited for in
+        turn, so once every node is latched no writer is left in the tree.
+        :return: The latched nodes, to pass to _release_all.
+        """
+        self._root_latch.acquire_read()
+
+        latched = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            node.latch.acquire_read()
+            latched.append(node)
+            # The children are only read once the node is latched, after any split or merge of them is done
+            stack.extend(node.children)
+
+        return latched
+
+    def _release_all(self, latched: list[LatchedBTNode]) -> None:
+        """
+        Release the latches taken by _latch_all.
+        :param latched: The latched nodes.
+        :return: None
+        """
+        for node in latched:
+            node.latch.release_read()
+        self._root_latch.release_read()
+
+    def _latch_root(self, write: bool) -> LatchedBTNode | None:
+        """
+        Latch the root node.
+        :param write: True to take write latches, False for read latches.
+        :return: The latched root, None if the tree is empty.
+        """
+        if write:
+            self._root_latch.acquire_write()
+        else:
+            self._root_latch.acquire_read()
+
+        node = self.root
+        if node:
+            if write:
+                node.latch.acquire_write()
+            else:
+                node.latch.acquire_read()
+
+        return node
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        """
+        Look up an element, read latching one level at a time.
+        :param element: Element to search for.
+        :param default: Value to return when the element is not in the tree.
+        :return: The element stored in the tree, default if it is not found.
+        """
+        node = self._latch_root(False)
+        self._root_latch.release_read()
+
+        while node:
+            index, is_found = node.search(element)
+            if is_found:
+                found_elem = node.elements[index]
+                node.latch.release_read()
+                return found_elem
+
+            if node.is_leaf:
+                node.latch.release_read()
+                break
+
+            # Crab down, the child is latched before the parent is let go
+            child_node = node.children[index]
+            child_node.latch.acquire_read()
+            node.latch.release_read()
+            node = child_node
+
+        return default
+
+    def contains(self, element: str) -> bool:
+        """
+        Check if an element is in the tree.
+        :param element: Element to search for.
+        :return: True if the element is in the tree, False otherwise.
+        """
+        return self.get(element) is not None
+
+    def insert(self, element: str) -> bool:
+        """
+        Insert element into B-Tree, write latching the way down and releasing each node once its child is not full.
+        :param element: Element to insert.
+        :return: True if the element was inserted, False if it was already in the tree.
+        """
+        node = self._latch_root(True)
+
+        # The tree is empty, the element becomes the root
+        if not node:
+            self.root = self.node_class(True)
+            self.root.elements.append(element)
+            self._root_latch.release_write()
+            return True
+
+        # Split a full root under a new root, the same way traverse_to_leaf does
+        if len(node.elements) == 2 * self.t - 1:
+            new_node = self.node_class()
+            new_node.latch.acquire_write()
+            new_node.children.append(node)
+            node.split_node(0, new_node)
+            self.root = new_node
+
+            node.latch.release_write()
+            node = new_node
+
+        # The root is not full, so this insert cannot change which node is the root anymore
+        self._root_latch.release_write()
+
+        while True:
+            traverse_index, is_found = node.search(element)
+
+            if is_found:
+                node.latch.release_write()
+                if self.verbosity:
+                    print("Element is already in the tree")
+                return False
+
+            if node.is_leaf:
+                node.elements.insert(traverse_index, element)
+                node.latch.release_write()
+                return True
+
+            next_node = node.children[traverse_index]
+            next_node.latch.acquire_write()
+
+            # Split a full child while the parent is still latched
+            if len(next_node.elements) == 2 * self.t - 1:
+                next_node.split_node(traverse_index, node)
+
+                median_element = node.elements[traverse_index]
+                if element == median_element:
+                    next_node.latch.release_write()
+                    node.latch.release_write()
+                    return False
+
+                if element > median_element:
+                    right_node = node.children[traverse_index + 1]
+                    right_node.latch.acquire_write()
+                    next_node.latch.release_write()
+                    next_node = right_node
+
+            # The child has room, a split further down cannot reach this node
+            node.latch.release_write()
+            node = next_node
+
+    def delete(self, element: str) -> str | None:
+        """
+        Delete element from B-Tree, write latching the way down and releasing each node once its child has at least
+        t elements. When the element is in an internal node, that node stays latched until the predecessor or
+        successor replacing it has been taken out of its leaf.
+        :param element: Element to delete.
+        :return: Element that was deleted, None if element was not found.
+        """
+        node = self._latch_root(True)
+        if not node:
+            self._root_latch.release_write()
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        # The root latch is held for as long as the root itself may merge away or empty
+        holds_root_latch = True
+        mode = FIND_ELEMENT
+        # Internal node and index waiting for the predecessor or successor of the deleted element
+        replaced = None
+        removed_elem = None
+
+        while True:
+            if mode == FIND_ELEMENT:
+                index, is_found = node.search(element)
+            elif mode == FIND_MAX:
+                index, is_found = (len(node.elements) - 1, True) if node.is_leaf else (len(node.elements), False)
+            else:
+                index, is_found = 0, node.is_leaf
+
+            # Case 1, the leaf has at least t elements or is the root, so the element comes straight out
+            if is_found and node.is_leaf:
+                popped_elem = node.elements.pop(index)
+                if replaced is None:
+                    removed_elem = popped_elem
+                else:
+                    replaced_node, replaced_index = replaced
+                    replaced_node.elements[replaced_index] = popped_elem
+                    replaced_node.latch.release_write()
+
+                if node is self.root and not node.elements:
+                    self.root = None
+
+                node.latch.release_write()
+                if holds_root_latch:
+                    self._root_latch.release_write()
+                return removed_elem
+
+            if is_found:
+                removed_elem = node.elements[index]
+                left_node = node.children[index]
+                right_node = node.children[index + 1]
+                left_node.latch.acquire_write()
+                right_node.latch.acquire_write()
+
+                # Case 2a, replace the element with its predecessor, keeping this node latched until it is found
+                if len(left_node.elements) >= self.t:
+                    right_node.latch.release_write()
+                    replaced = (node, index)
+                    mode = FIND_MAX
+                    next_node = left_node
+
+                # Case 2b, mirror of 2a with the successor
+                elif len(right_node.elements) >= self.t:
+                    left_node.latch.release_write()
+                    replaced = (node, index)
+                    mode = FIND_MIN
+                    next_node = right_node
+
+                # Case 2c, merge both children around the element and delete it from the merged node
+                else:
+                    node.merge_children(index)
+                    right_node.latch.release_write()
+                    if not node.elements:
+                        self.root = left_node
+                    next_node = left_node
+
+            # Reached a leaf without finding the element
+            elif node.is_leaf:
+                node.latch.release_write()
+                if holds_root_latch:
+                    self._root_latch.release_write()
+                if self.verbosity:
+                    print("Element not found")
+                return None
+
+            else:
+                next_node = node.children[index]
+                next_node.latch.acquire_write()
+
+                # Case 3, give a child with t - 1 elements one more before going into it
+                if len(next_node.elements) == self.t - 1:
+                    next_node = self._grow_child(node, index, next_node)
+                    if not node.elements:
+                        self.root = next_node
+
+            # Keep the node latched if it is waiting for its replacement element
+            if replaced is None or replaced[0] is not node:
+                node.latch.release_write()
+            if holds_root_latch and next_node is not self.root:
+                self._root_latch.release_write()
+                holds_root_latch = False
+
+            node = next_node
+
+    def _grow_child(self, node: LatchedBTNode, index: int, child_node: LatchedBTNode) -> LatchedBTNode:
+        """
+        Rotate an element into a child with t - 1 elements, or merge it with a sibling, latching the siblings first.
+        :param node: Write latched parent.
+        :param index: Index of the child.
+        :param child_node: Write latched child.
+        :return: The write latched node that now holds the child's elements.
+        """
+        left_sibling = node.children[index - 1] if index > 0 else None
+        right_sibling = node.children[index + 1] if index < len(node.elements) else None
+        for sibling in (left_sibling, right_sibling):
+            if sibling:
+                sibling.latch.acquire_write()
+
+        # Case 3a, borrow from a sibling with at least t elements
+        if left_sibling and len(left_sibling.elements) >= self.t:
+            node.rotate_from_left(index)
+        elif right_sibling and len(right_sibling.elements) >= self.t:
+            node.rotate_from_right(index)
+
+        # Case 3b, merge with the right sibling, or the left one for the rightmost child
+        elif right_sibling:
+            node.merge_children(index)
+        else:
+            node.merge_children(index - 1)
+            child_node.latch.release_write()
+            child_node = left_sibling
+            left_sibling = None
+
+        for sibling in (left_sibling, right_sibling):
+            if sibling:
+                sibling.latch.release_write()
+
+        return child_node
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Insert a batch of elements one at a time, so that other threads can interleave with the batch.
+        :param elements: Elements to insert.
+        :return: Each element in sorted order with its outcome, INSERTED or DUPLICATE.
+        """
+        return [(element, INSERTED if self.insert(element) else DUPLICATE) for element in sorted(elements)]
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Delete a batch of elements one at a time, so that other threads can interleave with the batch.
+        :param elements: Elements to delete.
+        :return: Each element in sorted order with its outcome, DELETED or NOT_FOUND.
+        """
+        return [(element, NOT_FOUND if self.delete(element) is None else DELETED) for element in sorted(elements)]
+
+    def _seek(self, element: str | None, inclusive: bool = True) -> tuple[str | None, bool]:
+        """
+        Get the position scans start from. Concurrent scans keep no stack of nodes, only the last element seen.
+        :param element: Element to seek to, None to seek to the smallest element.
+        :param inclusive: Whether an element equal to element is included.
+        :return: The position to pass to _walk.
+        """
+        return element, inclusive
+
+    def _walk(self, position: tuple[str | None, bool]) -> Iterator[str]:
+        """
+        Yield elements in order from a position, one leaf at a time.
+        :param position: Position built by _seek.
+        :return: An iterator over the ordered elements.
+        """
+        element, inclusive = position
+
+        while True:
+            batch, next_position = self._read_leaf(element, inclusive)
+            yield from batch
+            if next_position is None:
+                return
+            element, inclusive = next_position
+
+    def _read_leaf(self, element: str | None,
+                   inclusive: bool) -> tuple[list[str], tuple[str | None, bool] | None]:
+        """
+        Read the elements from a position to the end of its leaf, read latching the way down.
+        :param element: Element to read from, None to read from the smallest element.
+        :param inclusive: Whether an element equal to element is included.
+        :return: The elements read, followed by the separator after the leaf, and the position to continue from,
+            None at the end of the tree.
+        """
+        node = self._latch_root(False)
+        self._root_latch.release_read()
+
+        # Closest separator above everything on the way down
+        upper_bound = None
+
+        while node:
+            if element is None:
+                index, is_found = 0, False
+            else:
+                index, is_found = node.search(element)
+
+            if node.is_leaf:
+                if is_found and not inclusive:
+                    index += 1
+                batch = node.elements[index:]
+                node.latch.release_read()
+
+                if upper_bound is None:
+                    return batch, None
+                batch.append(upper_bound)
+                return batch, (upper_bound, False)
+
+            if is_found:
+                # The element itself is a separator, yield it and continue after it
+                if inclusive:
+                    found_elem = node.elements[index]
+                    node.latch.release_read()
+                    return [found_elem], (found_elem, False)
+
+                # Continue from the leftmost leaf of the subtree to its right
+                index += 1
+                element = None
+
+            if index < len(node.elements):
+                upper_bound = node.elements[index]
+
+            child_node = node.children[index]
+            child_node.latch.acquire_read()
+            node.latch.release_read()
+            node = child_node
+
+        return [], None
@@ -0,0 +1,381 @@
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+
+from btree import BTree
+
+# Log record: operation, key length, UTF-8 key, then a CRC32 of everything before it
+RECORD_HEADER = struct.Struct("<BI")
+RECORD_CRC = struct.Struct("<I")
+
+INSERT = 1
+DELETE = 2
+
+SNAPSHOT_FILE = "snapshot"
+LOG_FILE = "wal"
+
+
+def encode_record(operation: int, element: str) -> bytes:
+    """
+    Encode a mutation into a log record.
+    :param operation: INSERT or DELETE.
+    :param element: Element the mutation applies to.
+    :return: The encoded record.
+    """
+    data = element.encode()
+    record = RECORD_HEADER.pack(operation, len(data)) + data
+    return record + RECORD_CRC.pack(zlib.crc32(record))
+
+
+def read_records(file) -> Iterator[tuple[int, str, int]]:
+    """
+    Read log records up to the end of a file, stopping at the first torn or corrupted record.
+    :param file: Binary file object positioned at the first record.
+    :return: An iterator of operation, element and the file offset after the record.
+    """
+    offset = file.tell()
+    while True:
+        header = file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+
+        operation, length = RECORD_HEADER.unpack(header)
+        data = file.read(length)
+        crc = file.read(RECORD_CRC.size)
+        if len(data) < length or len(crc) < RECORD_CRC.size:
+            return
+        if RECORD_CRC.unpack(crc)[0] != zlib.crc32(header + data) or operation not in (INSERT, DELETE):
+            return
+
+        offset += RECORD_HEADER.size + length + RECORD_CRC.size
+        yield operation, data.decode(), offset
+
+
+def fsync_directory(directory: str) -> None:
+    """
+    Sync a directory so that files renamed into it survive a crash.
+    :param directory: Directory to sync.
+    :return: None
+    """
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class WriteAheadLog:
+    """
+    Class representing an append-only log of B-Tree mutations. Records are appended in order and made durable with
+    group commit: the first thread waiting for its records becomes the leader and syncs everything written so far,
+    while the threads that arrive during the sync wait for it and are covered by the next one.
+
+    Attributes:
+        path: Path of the log file.
+        written: Number of records appended.
+        durable: Number of records known to be on disk.
+        syncs: Number of fsync calls made.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Constructor for WriteAheadLog, appending to the file at path.
+        :param path: Path of the log file.
+        """
+        self.path = path
+        self.file = open(path, "ab")
+        self.written = 0
+        self.durable = 0
+        self.syncs = 0
+
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._syncing = False
+
+    def append(self, records: Iterable[bytes]) -> int:
+        """
+        Append records to the log, without waiting for them to reach the disk.
+        :param records: Encoded records to append.
+        :return: Sequence number to pass to sync to wait for the records.
+        """
+        with self._lock:
+            for record in records:
+                self.file.write(record)
+                self.written += 1
+            return self.written
+
+    def sync(self, sequence: int) -> None:
+        """
+        Wait until the records up to a sequence number are on disk.
+        :param sequence: Sequence number returned by append.
+        :return: None
+        """
+        with self._lock:
+            while self.durable < sequence:
+                # Another thread is syncing, its sync or the next one covers these records
+                if self._syncing:
+                    self._synced.wait()
+                    continue
+
+                self._syncing = True
+                target = self.written
+                self.file.flush()
+
+                # Let other threads append while this one waits on the disk
+                self._lock.release()
+                try:
+                    os.fsync(self.file.fileno())
+                finally:
+                    self._lock.acquire()
+                    self._syncing = False
+                    self._synced.notify_all()
+
+                self.durable = max(self.durable, target)
+                self.syncs += 1
+
+    def truncate(self) -> None:
+        """
+        Empty the log, once its records are covered by a snapshot.
+        :return: None
+        """
+        with self._lock:
+            while self._syncing:
+                self._synced.wait()
+
+            self.file.flush()
+            self.file.truncate(0)
+            os.fsync(self.file.fileno())
+            self.durable = self.written
+
+    def close(self) -> None:
+        """
+        Sync and close the log file.
+        :return: None
+        """
+        self.sync(self.written)
+        self.file.close()
+
+
+class DurableBTree:
+    """
+    Class representing a B-Tree whose mutations are logged to a write-ahead log before they are applied. An
+    acknowledged mutation, one whose call has returned, survives the process dying. On open, the state is rebuilt
+    from the last snapshot plus the log, and a checkpoint every checkpoint_every mutations writes a new snapshot and
+    empties the log so that this stays fast.
+
+    Mutations may come from several threads, which is when group commit shares one fsync between them. Only the
+    read-only methods in READ_METHODS are passed through to the tree; hold lock around them if mutations run on other
+    threads.
+
+    Attributes:
+        directory: Directory holding the snapshot and the log.
+        tree: The in-memory B-Tree.
+        log: The write-ahead log.
+        lock: Lock serialising changes to the tree.
+        checkpoint_every: Number of mutations after which a checkpoint is taken, None to only checkpoint on request.
+    """
+
+    # Read-only methods of the in-memory tree that are passed through
+    READ_METHODS = ("get", "contains", "get_tree_ordered_elems", "range", "prefix_scan", "rank", "select",
+                    "count_range")
+
+    def __init__(self, directory: str, degree: int, tree_class: type[BTree] = BTree,
+                 checkpoint_every: int | None = 100_000, verbosity: int = 0) -> None:
+        """
+        Constructor for DurableBTree, recovering the tree stored in directory or starting an empty one.
+        :param directory: Directory holding the snapshot and the log, created if missing.
+        :param degree: Degree of the B-Tree.
+        :param tree_class: B-Tree class of the in-memory tree.
+        :param checkpoint_every: Number of mutations after which a checkpoint is taken, None to disable.
+        :param verbosity: Verbosity level.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.tree_class = tree_class
+        self.degree = degree
+        self.verbosity = verbosity
+        self.checkpoint_every = checkpoint_every
+        self.lock = threading.Lock()
+
+        self.tree = self._read_snapshot()
+        self._replay()
+        self.log = WriteAheadLog(self._path(LOG_FILE))
+        self._since_checkpoint = 0
+
+    def __getattr__(self, name: str):
+        # Lookups and scans are answered by the in-memory tree, anything that could change it without being logged is
+        # not passed through
+        if name in self.READ_METHODS:
+            return getattr(self.tree, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}', only logged mutations and "
+                             f"read-only methods of the tree are available")
+
+    def __contains__(self, element: str) -> bool:
+        return element in self.tree
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tree)
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def insert(self, element: str) -> bool:
+        """
+        Log and insert an element, returning once the log record is on disk.
+        :param element: Element to insert.
+        :return: True if the element was inserted, False if it was already in the tree.
+        """
+        with self.lock:
+            sequence = self.log.append([encode_record(INSERT, element)])
+            inserted = self.tree.insert(element)
+            self._count_mutations(1)
+
+        self.log.sync(sequence)
+        return inserted
+
+    def delete(self, element: str) -> str | None:
+        """
+        Log and delete an element, returning once the log record is on disk.
+        :param element: Element to delete.
+        :return: The deleted element, None if it was not in the tree.
+        """
+        with self.lock:
+            sequence = self.log.append([encode_record(DELETE, element)])
+            removed_elem = self.tree.delete(element)
+            self._count_mutations(1)
+
+        self.log.sync(sequence)
+        return removed_elem
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Log and insert a batch of elements with a single sync.
+        :param elements: Elements to insert.
+        :return: Outcome of each element, as returned by BTree.insert_many.
+        """
+        batch = list(elements)
+        with self.lock:
+            sequence = self.log.append(encode_record(INSERT, element) for element in batch)
+            outcomes = self.tree.insert_many(batch)
+            self._count_mutations(len(batch))
+
+        self.log.sync(sequence)
+        return outcomes
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Log and delete a batch of elements with a single sync.
+        :param elements: Elements to delete.
+        :return: Outcome of each element, as returned by BTree.delete_many.
+        """
+        batch = list(elements)
+        with self.lock:
+            sequence = self.log.append(encode_record(DELETE, element) for element in batch)
+            outcomes = self.tree.delete_many(batch)
+            self._count_mutations(len(batch))
+
+        self.log.sync(sequence)
+        return outcomes
+
+    def checkpoint(self) -> None:
+        """
+        Write a snapshot of the tree and empty the log.
+        :return: None
+        """
+        with self.lock:
+            self._checkpoint()
+
+    def close(self) -> None:
+        """
+        Sync and close the log.
+        :return: None
+        """
+        self.log.close()
+
+    def __enter__(self) -> 'DurableBTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _count_mutations(self, count: int) -> None:
+        """
+        Count mutations towards the next checkpoint, taking it once enough have been applied. Called with lock held.
+        :param count: Number of mutations applied.
+        :return: None
+        """
+        self._since_checkpoint += count
+        if self.checkpoint_every is not None and self._since_checkpoint >= self.checkpoint_every:
+            self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        """
+        Write a snapshot of the tree and empty the log. Called with lock held.
+        :return: None
+        """
+        path = self._path(SNAPSHOT_FILE)
+        temp_path = path + ".tmp"
+
+        # The new snapshot only replaces the old one once it is fully on disk
+        with open(temp_path, "wb") as file:
+            self.tree.dump(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        fsync_directory(self.directory)
+
+        # Every logged mutation is now in the snapshot
+        self.log.truncate()
+        self._since_checkpoint = 0
+
+        if self.verbosity > 0:
+            print(f"Checkpointed {self.directory}")
+
+    def _read_snapshot(self) -> BTree:
+        """
+        Build the tree from the last snapshot.
+        :return: The tree, empty if there is no snapshot.
+        """
+        path = self._path(SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return self.tree_class(self.degree, self.verbosity)
+
+        return self.tree_class.load(path, self.verbosity)
+
+    def _replay(self) -> None:
+        """
+        Apply the mutations logged since the last snapshot, dropping a torn record at the end of the log.
+        :return: None
+        """
+        path = self._path(LOG_FILE)
+        if not os.path.exists(path):
+            return
+
+        valid_size = 0
+        count = 0
+        with open(path, "rb") as file:
+            for operation, element, valid_size in read_records(file):
+                if operation == INSERT:
+                    self.tree.insert(element)
+                else:
+                    self.tree.delete(element)
+                count += 1
+
+        # New records must not be appended after a torn one, or they would never be replayed
+        if valid_size < os.path.getsize(path):
+            with open(path, "r+b") as file:
+                file.truncate(valid_size)
+                os.fsync(file.fileno())
+
+        if self.verbosity > 0:
+            print(f"Replayed {count} logged mutations")
+
+    def _path(self, name: str) -> str:
+        """
+        Get the path of a file in the directory.
+        :param name: Name of the file.
+        :return: The path.
+        """
+        return os.path.join(self.directory, name)
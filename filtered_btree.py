@@ -0,0 +1,215 @@
+import heapq
+import math
+from collections.abc import Iterable
+
+from btree import INSERTED, NOT_FOUND, BTree, BTreeSnapshot
+
+# Largest value a counter can hold, a counter that reaches it sticks there
+MAX_COUNT = 255
+
+
+class CountingBloomFilter:
+    """
+    Class representing a counting Bloom filter over strings. Each element bumps k counters, so an element whose
+    counters are not all above zero was definitely never added, and removing an element takes its counts back out.
+
+    Attributes:
+        capacity: Number of elements the filter was sized for.
+        size: Number of counters.
+        hash_count: Number of counters each element uses.
+        count: Number of elements in the filter.
+        counters: One byte counter per slot.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Constructor for counting Bloom filter.
+        :param capacity: Number of elements the false positive rate is promised for.
+        :param error_rate: False positive rate at capacity.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        # Optimal sizes for a Bloom filter, m = -n ln p / (ln 2)^2 and k = m / n ln 2
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.counters = bytearray(self.size)
+
+    def _slots(self, element: str) -> range:
+        """
+        Get the counters of an element, from two hashes combined as h1 + i * h2 taken modulo the size.
+        :param element: The element.
+        :return: Positions of the element's counters before the modulo.
+        """
+        hashed = hash(element) & 0xFFFFFFFFFFFFFFFF
+        second = (hashed >> 32) | 1
+        first = hashed & 0xFFFFFFFF
+        return range(first, first + self.hash_count * second, second)
+
+    def add(self, element: str) -> None:
+        """
+        Add an element, which must not be in the filter already.
+        :param element: Element to add.
+        :return: None
+        """
+        counters = self.counters
+        size = self.size
+        for position in self._slots(element):
+            slot = position % size
+            if counters[slot] < MAX_COUNT:
+                counters[slot] += 1
+        self.count += 1
+
+    def discard(self, element: str) -> None:
+        """
+        Remove an element, which must have been added.
+        :param element: Element to remove.
+        :return: None
+        """
+        counters = self.counters
+        size = self.size
+        for position in self._slots(element):
+            slot = position % size
+            # A stuck counter has lost track of how many elements use it, so it can never go back down
+            if counters[slot] < MAX_COUNT:
+                counters[slot] -= 1
+        self.count -= 1
+
+    def __contains__(self, element: str) -> bool:
+        counters = self.counters
+        size = self.size
+        # Stop at the first empty counter, which is where most absent elements are told apart
+        for position in self._slots(element):
+            if not counters[position % size]:
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+
+class FilteredBTree(BTree):
+    """
+    Class representing a B-Tree with a counting Bloom filter of its elements in front of it. Lookups and deletes of
+    elements the filter has never seen return straight away, without walking down the tree or rotating and merging
+    nodes along the way. The filter is rebuilt twice as large whenever it fills up past its capacity.
+
+    Attributes:
+        filter: Counting Bloom filter of the elements, None in the frozen trees of snapshots.
+        error_rate: False positive rate of the filter at capacity.
+    """
+
+    def __init__(self, degree: int, verbosity: int = 0, capacity: int = 1024, error_rate: float = 0.01) -> None:
+        """
+        Constructor for filtered B-Tree.
+        :param degree: Degree of the B-Tree.
+        :param verbosity: Verbosity level.
+        :param capacity: Number of elements the filter starts out sized for.
+        :param error_rate: False positive rate of the filter at capacity.
+        """
+        super().__init__(degree, verbosity)
+        self.error_rate = error_rate
+        self.filter: CountingBloomFilter | None = CountingBloomFilter(capacity, error_rate)
+
+    @classmethod
+    def _load_sorted(cls, keys: list[str], degree: int, fill_factor: float = 1.0,
+                     verbosity: int = 0) -> 'FilteredBTree':
+        tree = super()._load_sorted(keys, degree, fill_factor, verbosity)
+        tree.rebuild()
+        return tree
+
+    @classmethod
+    def load(cls, source, verbosity: int = 0) -> 'FilteredBTree':
+        tree = super().load(source, verbosity)
+        tree.rebuild()
+        return tree
+
+    def rebuild(self, capacity: int | None = None) -> None:
+        """
+        Build a fresh filter from the elements of the tree, clearing out stuck counters and sizing it for growth.
+        :param capacity: Number of elements to size the filter for, twice the current count if not given.
+        :return: None
+        """
+        elements = list(self)
+        self.filter = CountingBloomFilter(capacity or max(1024, 2 * len(elements)), self.error_rate)
+        for element in elements:
+            self.filter.add(element)
+
+    def snapshot(self) -> BTreeSnapshot:
+        view = super().snapshot()
+        # The filter keeps following the live tree, so the frozen one has to do without
+        view._tree.filter = None
+        return view
+
+    def _may_contain(self, element: str) -> bool:
+        return self.filter is None or element in self.filter
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        if not self._may_contain(element):
+            return default
+        return super().get(element, default)
+
+    def contains(self, element: str) -> bool:
+        return self._may_contain(element) and super().contains(element)
+
+    def insert(self, element: str) -> bool:
+        if not super().insert(element):
+            return False
+
+        self._added(element)
+        return True
+
+    def delete(self, element: str) -> str | None:
+        # Definitely not in the tree, leave the nodes alone
+        if not self._may_contain(element):
+            if self.verbosity:
+                print("Element not found")
+            return None
+
+        removed_elem = super().delete(element)
+        if removed_elem is not None:
+            self.filter.discard(removed_elem)
+        return removed_elem
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        outcomes = super().insert_many(elements)
+        inserted = [element for element, outcome in outcomes if outcome == INSERTED]
+
+        # A batch that fills the filter is covered by a single rebuild from the tree, which already holds it
+        if self.filter.count + len(inserted) > self.filter.capacity:
+            self.rebuild()
+        else:
+            for element in inserted:
+                self.filter.add(element)
+        return outcomes
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        # Only the elements the filter may have seen go down the tree
+        candidates = []
+        misses = []
+        for element in sorted(elements):
+            (candidates if self._may_contain(element) else misses).append(element)
+
+        outcomes = super().delete_many(candidates)
+        for element, outcome in outcomes:
+            if outcome != NOT_FOUND:
+                self.filter.discard(element)
+
+        # Both lists are sorted, merge them back into the sorted order of the batch
+        return list(heapq.merge(outcomes, [(element, NOT_FOUND) for element in misses]))
+
+    def _added(self, element: str) -> None:
+        """
+        Record an element newly inserted into the tree, growing the filter once it is full.
+        :param element: The inserted element.
+        :return: None
+        """
+        self.filter.add(element)
+        if self.filter.saturated:
+            self.rebuild()
+
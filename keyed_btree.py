@@ -0,0 +1,238 @@
+import bisect
+from collections.abc import Callable, Iterable, Iterator
+from operator import itemgetter
+from typing import Any
+
+from btree import DELETED, INSERTED, BTNode, BTree
+
+
+class KeyPair(tuple):
+    """
+    Class representing a (key, element) pair that compares by its key alone, so that wherever the B-Tree compares two
+    pairs, in searches, splits, finger bounds or batch sorts, the elements themselves are never compared. Pairs with
+    equal keys are equal.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: tuple) -> bool:
+        return self[0] == other[0]
+
+    def __ne__(self, other: tuple) -> bool:
+        return self[0] != other[0]
+
+    def __lt__(self, other: tuple) -> bool:
+        return self[0] < other[0]
+
+    def __le__(self, other: tuple) -> bool:
+        return self[0] <= other[0]
+
+    def __gt__(self, other: tuple) -> bool:
+        return self[0] > other[0]
+
+    def __ge__(self, other: tuple) -> bool:
+        return self[0] >= other[0]
+
+    def __hash__(self) -> int:
+        return hash(self[0])
+
+
+class KeyedBTNode(BTNode):
+    """
+    Class representing a B-Tree node of (key, element) pairs, searched by key alone.
+    """
+
+    __slots__ = ()
+
+    def search(self, search_elem: tuple) -> tuple[int, bool]:
+        """
+        Binary search function for B-Tree node, comparing only the cached keys.
+        :param search_elem: A (key, element) pair, or a (key,) probe.
+        :return: Index of element/location to traverse to, True if found, False otherwise.
+        """
+        key = search_elem[0]
+        elements = self.elements
+        # Bisecting on the keys compares them natively, without going through the comparisons of KeyPair
+        index = bisect.bisect_left(elements, key, key=itemgetter(0))
+        return index, index < len(elements) and elements[index][0] == key
+
+
+class KeyPairBTree(BTree):
+    """
+    Class representing a B-Tree of KeyPair (key, element) pairs ordered by key. Every key is unique, a pair whose
+    key is already in the tree is a duplicate.
+    """
+
+    # Class used to create the nodes of the tree
+    node_class = KeyedBTNode
+
+
+class KeyedBTree:
+    """
+    Class representing a B-Tree ordered by key(element) instead of by the elements themselves, like sorted(key=...),
+    so it can hold case folded or collation keyed strings, or records ordered by a field. The key of each element is
+    computed once when it goes in and stored next to it, so the binary searches compare cached keys and never run the
+    key function again. Elements with equal keys count as the same element.
+
+    Plain int, bytes or str elements need no key function, BTree compares them natively.
+
+    Attributes:
+        key: Function giving the sort key of an element.
+        size: Number of elements in the tree.
+        _tree: B-Tree of the (key, element) pairs.
+    """
+
+    def __init__(self, degree: int, key: Callable[[Any], Any], verbosity: int = 0) -> None:
+        """
+        Constructor for keyed B-Tree.
+        :param degree: Degree of the B-Tree.
+        :param key: Function giving the sort key of an element.
+        :param verbosity: Verbosity level.
+        """
+        self.key = key
+        self.size = 0
+        self._tree = KeyPairBTree(degree, verbosity)
+
+    @classmethod
+    def bulk_load(cls, elements: Iterable[Any], degree: int, key: Callable[[Any], Any], fill_factor: float = 1.0,
+                  verbosity: int = 0) -> 'KeyedBTree':
+        """
+        Build a keyed B-Tree bottom-up from elements whose keys are already sorted.
+        :param elements: Elements in strictly increasing order of key.
+        :param degree: Degree of the B-Tree.
+        :param key: Function giving the sort key of an element.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :return: The loaded keyed B-Tree.
+        """
+        tree = cls(degree, key, verbosity)
+        # The pairs compare by key, so the order check of the pair tree is on the keys alone
+        tree._tree = KeyPairBTree.bulk_load((KeyPair((key(element), element)) for element in elements), degree,
+                                            fill_factor, verbosity)
+        tree.size = sum(1 for _ in tree._tree)
+        return tree
+
+    def _find(self, key: Any) -> tuple | None:
+        """
+        Find the stored pair with a key, without restructuring the tree.
+        :param key: Key to search for.
+        :return: The (key, element) pair, None if no element has the key.
+        """
+        probe = (key,)
+        node = self._tree.root
+
+        while node:
+            index, is_found = node.search(probe)
+            if is_found:
+                return node.elements[index]
+
+            if node.is_leaf:
+                break
+
+            node = node.children[index]
+
+        return None
+
+    def get(self, element: Any, default: Any = None) -> Any:
+        """
+        Look up the element with the same key as element.
+        :param element: Element to search for.
+        :param default: Value to return when no element has the key.
+        :return: The element stored in the tree, default if it is not found.
+        """
+        pair = self._find(self.key(element))
+        return default if pair is None else pair[1]
+
+    def contains(self, element: Any) -> bool:
+        """
+        Check if an element with the same key as element is in the tree.
+        :param element: Element to search for.
+        :return: True if it is in the tree, False otherwise.
+        """
+        return self._find(self.key(element)) is not None
+
+    def __contains__(self, element: Any) -> bool:
+        return self.contains(element)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, element: Any) -> bool:
+        """
+        Insert element, computing its key once.
+        :param element: Element to insert.
+        :return: True if the element was inserted, False if an element with the same key is already in the tree.
+        """
+        inserted = self._tree.insert(KeyPair((self.key(element), element)))
+        if inserted:
+            self.size += 1
+        return inserted
+
+    def delete(self, element: Any) -> Any:
+        """
+        Delete the element with the same key as element.
+        :param element: Element to delete.
+        :return: The element that was deleted, None if no element has the key.
+        """
+        removed_pair = self._tree.delete(KeyPair((self.key(element), element)))
+        if removed_pair is None:
+            return None
+
+        self.size -= 1
+        return removed_pair[1]
+
+    def insert_many(self, elements: Iterable[Any]) -> list[tuple[Any, str]]:
+        """
+        Insert a batch of elements, computing each key once.
+        :param elements: Elements to insert.
+        :return: Each element in key order with its outcome, INSERTED or DUPLICATE.
+        """
+        # The batch insert sorts the pairs and spots repeats by key, keeping the first of each in the order given
+        outcomes = self._tree.insert_many(KeyPair((self.key(element), element)) for element in elements)
+        self.size += sum(1 for _, outcome in outcomes if outcome == INSERTED)
+        return [(pair[1], outcome) for pair, outcome in outcomes]
+
+    def delete_many(self, elements: Iterable[Any]) -> list[tuple[Any, str]]:
+        """
+        Delete a batch of elements, computing each key once.
+        :param elements: Elements to delete.
+        :return: Each element in key order with its outcome, DELETED or NOT_FOUND.
+        """
+        outcomes = self._tree.delete_many(KeyPair((self.key(element), element)) for element in elements)
+        self.size -= sum(1 for _, outcome in outcomes if outcome == DELETED)
+        return [(pair[1], outcome) for pair, outcome in outcomes]
+
+    def get_tree_ordered_elems(self) -> list[Any]:
+        """
+        Gets the elements from the tree in key order.
+        :return: A list of ordered elements.
+        """
+        return list(self)
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Lazily iterate over the elements of the tree in key order.
+        The tree must not be modified while the iterator is in use.
+        :return: An iterator over the ordered elements.
+        """
+        for _, element in self._tree:
+            yield element
+
+    def range(self, lo: Any = None, hi: Any = None, inclusive: tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """
+        Lazily iterate over the elements whose keys are between the keys of lo and hi, in key order.
+        The tree must not be modified while the iterator is in use.
+        :param lo: Element giving the lower bound, None to start from the smallest element.
+        :param hi: Element giving the upper bound, None to run until the largest element.
+        :param inclusive: Whether elements with the key of lo or of hi themselves are included.
+        :return: An iterator over the ordered elements in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        hi_key = None if hi is None else self.key(hi)
+        stack = self._tree._seek(None if lo is None else (self.key(lo),), lo_inclusive)
+
+        for key, element in self._tree._walk(stack):
+            if hi is not None and (key > hi_key or (key == hi_key and not hi_inclusive)):
+                return
+            yield element
+
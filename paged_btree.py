@@ -0,0 +1,565 @@
+import mmap
+import os
+import struct
+import weakref
+from collections.abc import Iterable, Iterator
+
+from btree import LEAF_CHILDREN, BTNode, BTree, check_strictly_increasing, pack_level
+
+# File header in page 0: magic, page size, longest key in bytes, degree, root page, number of pages, first free page
+HEADER = struct.Struct("<4sIIIIII")
+MAGIC = b"BTPG"
+
+# Node page layout: leaf flag and element count, then the child page ids, then the length-prefixed UTF-8 keys
+NODE_HEADER = struct.Struct("<BH")
+PAGE_ID = struct.Struct("<I")
+KEY_LENGTH = struct.Struct("<H")
+
+# Page 0 holds the file header, so it doubles as the "no page" id
+NO_PAGE = 0
+
+# Storage used by BTNode for its fields, which PagedBTNode wraps with lazy loading
+_CHILDREN_SLOT = BTNode.children
+_ELEMENTS_SLOT = BTNode.elements
+
+
+def degree_for_page_size(page_size: int, max_key_bytes: int) -> int:
+    """
+    Get the largest degree whose full nodes still fit in a page.
+    :param page_size: Size of a page in bytes.
+    :param max_key_bytes: Longest key in bytes once encoded as UTF-8.
+    :return: The degree t, a full node has 2t - 1 keys and 2t children.
+    """
+    # NODE_HEADER + 2t * PAGE_ID + (2t - 1) * (KEY_LENGTH + max_key_bytes) <= page_size
+    entry_size = KEY_LENGTH.size + max_key_bytes
+    return (page_size - NODE_HEADER.size + entry_size) // (2 * (PAGE_ID.size + entry_size))
+
+
+class PagedBTNode(BTNode):
+    """
+    Class representing a B-Tree node stored in a page of a Pager. The elements and children are only read from the
+    page the first time they are used.
+
+    Attributes:
+        page_id: Page the node is stored in, NO_PAGE until it is first written.
+        loaded: True if the elements and children are in memory, False otherwise.
+        pager: Pager the node belongs to, set on the node class created for each tree.
+    """
+
+    __slots__ = ("page_id", "loaded", "__weakref__")
+
+    pager: 'Pager'
+
+    def __init__(self, is_leaf: bool = False) -> None:
+        """
+        Constructor for a new paged B-Tree node, which gets a page when the tree is next written back.
+        """
+        self.page_id = NO_PAGE
+        self.loaded = True
+        super().__init__(is_leaf)
+        self.pager.created.add(self)
+
+    @classmethod
+    def stub(cls, page_id: int) -> 'PagedBTNode':
+        """
+        Create a node for a page without reading the page yet.
+        :param page_id: Page the node is stored in.
+        :return: The unloaded node.
+        """
+        node = cls.__new__(cls)
+        node.page_id = page_id
+        node.loaded = False
+        return node
+
+    @property
+    def children(self) -> list[BTNode] | tuple[()]:
+        if not self.loaded:
+            self.pager.load(self)
+        return _CHILDREN_SLOT.__get__(self)
+
+    @children.setter
+    def children(self, children: list[BTNode] | tuple[()]) -> None:
+        _CHILDREN_SLOT.__set__(self, children)
+
+    @property
+    def elements(self) -> list[str]:
+        if not self.loaded:
+            self.pager.load(self)
+        return _ELEMENTS_SLOT.__get__(self)
+
+    @elements.setter
+    def elements(self, elements: list[str]) -> None:
+        _ELEMENTS_SLOT.__set__(self, elements)
+
+    def merge_children(self, elem_index: int) -> 'PagedBTNode':
+        """
+        Merge B-Tree nodes into a B-Tree node, releasing the page of the node that goes away.
+        :param elem_index: Index of element to push down to merged B-Tree node.
+        :return: The merged B-Tree node.
+        """
+        right_node = self.children[elem_index + 1]
+        merged_node = super().merge_children(elem_index)
+
+        self.pager.free(right_node)
+        # Only the root can be left without elements, the merged node takes its place
+        if not self.elements:
+            self.pager.free(self)
+
+        return merged_node
+
+
+class Pager:
+    """
+    Class mapping B-Tree nodes to fixed-size pages of a single memory-mapped file.
+
+    Attributes:
+        page_size: Size of a page in bytes.
+        max_key_bytes: Longest key in bytes once encoded as UTF-8.
+        degree: Degree of the B-Tree stored in the file.
+        node_class: Class of the nodes of this pager.
+        resident: Loaded nodes by page id.
+        created: New nodes that do not have a page yet.
+        freed: Pages released since the last write back.
+    """
+
+    def __init__(self, path: str, page_size: int | None = None, max_key_bytes: int | None = None) -> None:
+        """
+        Constructor for Pager, opening the file at path or creating it.
+        :param path: Path of the file.
+        :param page_size: Size of a page in bytes, only needed to create a file.
+        :param max_key_bytes: Longest key in bytes once encoded as UTF-8, only needed to create a file.
+        """
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            self.file = open(path, "r+b")
+            (magic, self.page_size, self.max_key_bytes, self.degree, self.root_page, self.page_count,
+             self.free_head) = HEADER.unpack(self.file.read(HEADER.size))
+
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a paged B-Tree file")
+            if page_size not in (None, self.page_size) or max_key_bytes not in (None, self.max_key_bytes):
+                raise ValueError("page_size and max_key_bytes must match the ones the file was created with")
+        else:
+            self.page_size = page_size or 4096
+            self.max_key_bytes = max_key_bytes or 64
+            self.degree = degree_for_page_size(self.page_size, self.max_key_bytes)
+            if self.degree < 2:
+                raise ValueError("page_size is too small to hold nodes of max_key_bytes keys")
+
+            self.root_page = NO_PAGE
+            self.page_count = 1
+            self.free_head = NO_PAGE
+
+            self.file = open(path, "w+b")
+            self.file.truncate(self.page_size)
+
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.node_class = type("PagedBTNode", (PagedBTNode,), {"__slots__": (), "pager": self})
+
+        self.nodes: weakref.WeakValueDictionary[int, PagedBTNode] = weakref.WeakValueDictionary()
+        self.resident: dict[int, PagedBTNode] = {}
+        self.created: set[PagedBTNode] = set()
+        self.freed: list[int] = []
+
+        self._write_header()
+
+    def node(self, page_id: int) -> PagedBTNode | None:
+        """
+        Get the node stored in a page, without loading it.
+        :param page_id: Page to get the node of.
+        :return: The node, None for NO_PAGE.
+        """
+        if page_id == NO_PAGE:
+            return None
+
+        # Hand out one node object per page so that every reference sees the same contents
+        node = self.nodes.get(page_id)
+        if node is None:
+            node = self.node_class.stub(page_id)
+            self.nodes[page_id] = node
+
+        return node
+
+    def load(self, node: PagedBTNode) -> None:
+        """
+        Read the elements and children of a node from its page.
+        :param node: Node to load.
+        :return: None
+        """
+        offset = node.page_id * self.page_size
+        is_leaf, count = NODE_HEADER.unpack_from(self.map, offset)
+        position = offset + NODE_HEADER.size
+
+        # Children are only created as unloaded nodes, their pages are read when they are used
+        if is_leaf:
+            children = LEAF_CHILDREN
+        else:
+            page_ids = struct.unpack_from(f"<{count + 1}I", self.map, position)
+            position += PAGE_ID.size * (count + 1)
+            children = [self.node(page_id) for page_id in page_ids]
+
+        elements = []
+        for _ in range(count):
+            (length,) = KEY_LENGTH.unpack_from(self.map, position)
+            position += KEY_LENGTH.size
+            elements.append(str(self.map[position:position + length], "utf-8"))
+            position += length
+
+        node.children = children
+        node.elements = elements
+        node.loaded = True
+        self.resident[node.page_id] = node
+
+    def encode(self, node: PagedBTNode) -> bytes:
+        """
+        Encode a node into the bytes of its page.
+        :param node: Node to encode, its children must all have pages.
+        :return: The encoded node.
+        """
+        parts = [NODE_HEADER.pack(node.is_leaf, len(node.elements))]
+
+        if not node.is_leaf:
+            parts.append(struct.pack(f"<{len(node.children)}I", *(child.page_id for child in node.children)))
+
+        for element in node.elements:
+            data = element.encode()
+            parts.append(KEY_LENGTH.pack(len(data)))
+            parts.append(data)
+
+        return b"".join(parts)
+
+    def free(self, node: PagedBTNode) -> None:
+        """
+        Release the page of a node that is no longer part of the tree.
+        :param node: Node to release.
+        :return: None
+        """
+        if node.page_id == NO_PAGE:
+            self.created.discard(node)
+            return
+
+        self.resident.pop(node.page_id, None)
+        self.nodes.pop(node.page_id, None)
+        self.freed.append(node.page_id)
+        node.page_id = NO_PAGE
+
+    def write_back(self, root: PagedBTNode | None) -> None:
+        """
+        Write every new or changed node to its page and sync the file.
+        :param root: Root of the tree.
+        :return: None
+        """
+        # Give every new node a page first, so that their parents can point at them
+        for node in self.created:
+            node.page_id = self._allocate()
+            self.nodes[node.page_id] = node
+            self.resident[node.page_id] = node
+        self.created = set()
+
+        # Only write the pages whose contents changed
+        for page_id, node in self.resident.items():
+            data = self.encode(node)
+            if len(data) > self.page_size:
+                raise ValueError(f"Node of page {page_id} does not fit in a page")
+
+            offset = page_id * self.page_size
+            if self.map[offset:offset + len(data)] != data:
+                self.map[offset:offset + len(data)] = data
+
+        # Chain the pages released since the last write back into the on-disk free list
+        for page_id in self.freed:
+            PAGE_ID.pack_into(self.map, page_id * self.page_size, self.free_head)
+            self.free_head = page_id
+        self.freed = []
+
+        self.root_page = root.page_id if root else NO_PAGE
+        self._write_header()
+        self.map.flush()
+
+    def evict(self, root: PagedBTNode | None) -> None:
+        """
+        Write everything back and unload every node but the root, so that it is read again from its page when used.
+        :param root: Root of the tree.
+        :return: None
+        """
+        self.write_back(root)
+
+        for node in self.resident.values():
+            if node is not root:
+                _CHILDREN_SLOT.__delete__(node)
+                _ELEMENTS_SLOT.__delete__(node)
+                node.loaded = False
+
+        self.resident = {root.page_id: root} if root else {}
+
+    def close(self) -> None:
+        """
+        Close the memory map and the file, without writing anything back.
+        :return: None
+        """
+        self.map.close()
+        self.file.close()
+
+    def _allocate(self) -> int:
+        """
+        Get a page for a new node, reusing a released page if there is one.
+        :return: The page id.
+        """
+        if self.freed:
+            return self.freed.pop()
+
+        if self.free_head != NO_PAGE:
+            page_id = self.free_head
+            (self.free_head,) = PAGE_ID.unpack_from(self.map, page_id * self.page_size)
+            return page_id
+
+        page_id = self.page_count
+        self.page_count += 1
+
+        # Grow the file by doubling, so that remapping happens rarely
+        if self.page_count * self.page_size > len(self.map):
+            size = max(self.page_count * self.page_size, 2 * len(self.map))
+            self.map.close()
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+
+        return page_id
+
+    def _write_header(self) -> None:
+        """
+        Write the file header into page 0.
+        :return: None
+        """
+        HEADER.pack_into(self.map, 0, MAGIC, self.page_size, self.max_key_bytes, self.degree, self.root_page,
+                         self.page_count, self.free_head)
+
+
+class PageTree(BTree):
+    """
+    Class representing a B-Tree whose nodes live in the pages of a Pager. The usual insert, delete, split and merge
+    logic of BTree runs on them unchanged, with every node loaded from its page the first time it is walked through.
+    Only used by PagedBTree, which passes through the parts of it that work on nodes written in place.
+
+    Attributes:
+        pager: Pager holding the pages of the tree.
+        cache_pages: Number of loaded nodes after which everything is written back and unloaded.
+    """
+
+    def __init__(self, pager: Pager, verbosity: int = 0, cache_pages: int = 4096) -> None:
+        """
+        Constructor for a B-Tree of pages, starting from the root recorded in the file.
+        :param pager: Pager holding the pages of the tree.
+        :param verbosity: Verbosity level.
+        :param cache_pages: Number of loaded nodes after which everything is written back and unloaded.
+        """
+        self.pager = pager
+        self.node_class = pager.node_class
+        self.cache_pages = cache_pages
+
+        super().__init__(pager.degree, verbosity)
+        self.root = pager.node(pager.root_page)
+
+    @property
+    def root(self) -> PagedBTNode | None:
+        return self._root
+
+    @root.setter
+    def root(self, node: PagedBTNode | None) -> None:
+        # Deleting the last element empties the tree, release the page of the old root
+        old_root = getattr(self, "_root", None)
+        if node is None and old_root is not None:
+            self.pager.free(old_root)
+
+        self._root = node
+
+    def insert(self, element: str) -> bool:
+        self._check_key(element)
+        inserted = super().insert(element)
+        self._limit_cache()
+        return inserted
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        batch = list(elements)
+        for element in batch:
+            self._check_key(element)
+
+        outcomes = super().insert_many(batch)
+        self._limit_cache()
+        return outcomes
+
+    def delete(self, element: str) -> str | None:
+        removed_elem = super().delete(element)
+        self._limit_cache()
+        return removed_elem
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        outcomes = super().delete_many(elements)
+        self._limit_cache()
+        return outcomes
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        found = super().get(element, default)
+        self._limit_cache()
+        return found
+
+    def contains(self, element: str) -> bool:
+        is_found = super().contains(element)
+        self._limit_cache()
+        return is_found
+
+    def _walk(self, stack: list[tuple[BTNode, int]]) -> Iterator[str]:
+        """
+        Yield elements in order from an iteration stack, unloading nodes as the scan goes so that it does not pull
+        the whole file into memory.
+        :param stack: The iteration stack, consumed as elements are yielded.
+        :return: An iterator over the ordered elements.
+        """
+        for element in BTree._walk(stack):
+            yield element
+            self._limit_cache()
+
+    def _check_key(self, element: str) -> None:
+        """
+        Check that an element fits in the space a page keeps for each key.
+        :param element: Element to check.
+        :return: None
+        """
+        if len(element.encode()) > self.pager.max_key_bytes:
+            raise ValueError(f"Element is longer than {self.pager.max_key_bytes} bytes")
+
+    def _limit_cache(self) -> None:
+        """
+        Write everything back and unload the nodes once more than cache_pages of them are loaded.
+        :return: None
+        """
+        if len(self.pager.resident) + len(self.pager.created) > self.cache_pages:
+            # The finger leaf is about to be unloaded and its ancestors with it
+            self._finger = None
+            self.pager.evict(self.root)
+
+
+class PagedBTree:
+    """
+    Class representing a B-Tree stored in a file of fixed-size pages. Nodes are loaded from their pages as the tree
+    is walked, and changes are written back by flush, close, or whenever more than cache_pages nodes are loaded.
+
+    Nodes are changed in place in their pages, and the tree is only ever as large as the file, so the parts of BTree
+    that need nodes a snapshot can share or a whole tree built in memory, snapshot, dump and load, and the set
+    operations, are not offered. Only the methods in TREE_METHODS are passed through to the tree of pages.
+
+    Attributes:
+        pager: Pager holding the pages of the tree.
+        tree: The B-Tree running on the nodes of the pager.
+    """
+
+    # Methods of the tree of pages that are passed through
+    TREE_METHODS = ("insert", "insert_many", "delete", "delete_many", "get", "contains", "range", "prefix_scan")
+
+    def __init__(self, path: str, page_size: int | None = None, max_key_bytes: int | None = None,
+                 verbosity: int = 0, cache_pages: int = 4096) -> None:
+        """
+        Constructor for paged B-Tree, opening the tree stored at path or creating an empty one.
+        :param path: Path of the file.
+        :param page_size: Size of a page in bytes, which sets the degree of the tree. Defaults to 4096 for new files.
+        :param max_key_bytes: Longest key in bytes once encoded as UTF-8. Defaults to 64 for new files.
+        :param verbosity: Verbosity level.
+        :param cache_pages: Number of loaded nodes after which everything is written back and unloaded.
+        """
+        self.pager = Pager(path, page_size, max_key_bytes)
+        self.tree = PageTree(self.pager, verbosity, cache_pages)
+
+    @classmethod
+    def bulk_load(cls, elements: Iterable[str], path: str, page_size: int | None = None,
+                  max_key_bytes: int | None = None, fill_factor: float = 1.0, verbosity: int = 0,
+                  cache_pages: int = 4096) -> 'PagedBTree':
+        """
+        Build a paged B-Tree bottom-up from elements that are already sorted, without going through insert. Each
+        level is written to its pages and unloaded as soon as it is packed, so only the elements and the level being
+        packed are in memory at a time.
+        :param elements: Elements in strictly increasing order.
+        :param path: Path of the file, which must not hold a tree yet.
+        :param page_size: Size of a page in bytes, which sets the degree of the tree. Defaults to 4096 for new files.
+        :param max_key_bytes: Longest key in bytes once encoded as UTF-8. Defaults to 64 for new files.
+        :param fill_factor: Fraction of the 2t - 1 slots to fill in each leaf, never going below t - 1 elements.
+        :param verbosity: Verbosity level.
+        :param cache_pages: Number of loaded nodes after which everything is written back and unloaded.
+        :return: The loaded paged B-Tree.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be greater than 0 and at most 1")
+
+        keys = list(elements)
+        check_strictly_increasing(keys)
+
+        paged_tree = cls(path, page_size, max_key_bytes, verbosity, cache_pages)
+        tree = paged_tree.tree
+        try:
+            if tree.root is not None:
+                raise ValueError(f"{path} already holds a tree")
+            for key in keys:
+                tree._check_key(key)
+        except ValueError:
+            paged_tree.pager.close()
+            raise
+
+        # Nothing to load, leave the tree empty
+        if not keys:
+            return paged_tree
+
+        degree = tree.t
+        max_elements = 2 * degree - 1
+        # Number of elements to put in each leaf, kept within the t - 1 and 2t - 1 bounds
+        leaf_capacity = min(max_elements, max(degree - 1, round(fill_factor * max_elements)))
+
+        # Pack the leaves first, then keep packing the promoted separators until a single root is left, writing each
+        # level out before packing the one above it, which only keeps the unloaded nodes of the level below
+        nodes, separators = pack_level(tree.node_class, keys, None, leaf_capacity, degree)
+        while len(nodes) > 1:
+            paged_tree.pager.evict(None)
+            nodes, separators = pack_level(tree.node_class, separators, nodes, max_elements, degree)
+
+        tree.root = nodes[0]
+        paged_tree.flush()
+        return paged_tree
+
+    def __getattr__(self, name: str):
+        # Lookups, scans and changes run on the tree of pages, anything that needs nodes not changed in place is not
+        # passed through
+        if name in self.TREE_METHODS:
+            return getattr(self.tree, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}', the nodes of a paged B-Tree "
+                             f"are changed in place in their pages")
+
+    @property
+    def root(self) -> PagedBTNode | None:
+        return self.tree.root
+
+    @property
+    def t(self) -> int:
+        return self.tree.t
+
+    def __contains__(self, element: str) -> bool:
+        return self.tree.contains(element)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tree)
+
+    def flush(self) -> None:
+        """
+        Write every new or changed node back to the file.
+        :return: None
+        """
+        self.pager.write_back(self.tree.root)
+
+    def close(self) -> None:
+        """
+        Write everything back and close the file.
+        :return: None
+        """
+        self.flush()
+        self.pager.close()
+
+    def __enter__(self) -> 'PagedBTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,194 @@
+import bisect
+import os
+from collections.abc import Iterable, Iterator
+
+from btree import BTNode, BTree
+
+# Slot descriptor of the plain node elements, which PrefixBTNode wraps with a property
+_ELEMENTS_SLOT = BTNode.elements
+
+
+def common_prefix(first: str, last: str) -> str:
+    """
+    Get the longest prefix two strings share. For the first and last of a sorted list of strings, that is the prefix
+    the whole list shares.
+    :param first: A string.
+    :param last: Another string.
+    :return: The shared prefix.
+    """
+    return os.path.commonprefix((first, last))
+
+
+class PrefixElements:
+    """
+    Class representing the sorted elements of a node, front coded as the prefix they all share and the suffix of each
+    one after it. Behaves like the list of full elements for everything the B-Tree does with a node's elements, and
+    rebuilds a full element only when one is read out.
+
+    Attributes:
+        prefix: Prefix shared by every element.
+        suffixes: Rest of each element after the prefix, in order.
+    """
+
+    __slots__ = ("prefix", "suffixes")
+
+    def __init__(self, elements: Iterable[str] = ()) -> None:
+        """
+        Constructor for front coded elements.
+        :param elements: Elements in increasing order.
+        """
+        elements = list(elements)
+        self.prefix = common_prefix(elements[0], elements[-1]) if elements else ""
+        cut = len(self.prefix)
+        self.suffixes = [element[cut:] for element in elements]
+
+    def search(self, search_elem: str) -> tuple[int, bool]:
+        """
+        Binary search the suffixes, without rebuilding any full element.
+        :param search_elem: Element to search for.
+        :return: Index of element/location to traverse to, True if found, False otherwise.
+        """
+        prefix = self.prefix
+        suffixes = self.suffixes
+
+        # An element that leaves the prefix sorts before or after every element of the node
+        if not search_elem.startswith(prefix):
+            return (0 if search_elem < prefix else len(suffixes)), False
+
+        suffix = search_elem[len(prefix):]
+        index = bisect.bisect_left(suffixes, suffix)
+        return index, index < len(suffixes) and suffixes[index] == suffix
+
+    def _suffix(self, element: str) -> str:
+        """
+        Get the suffix to store for an element, shortening the prefix first if the element does not share all of it.
+        :param element: Element about to be stored.
+        :return: The element after the prefix.
+        """
+        prefix = self.prefix
+        if not self.suffixes:
+            # The only element shares all of itself
+            self.prefix = element
+            return ""
+
+        if not element.startswith(prefix):
+            shared = common_prefix(prefix, element)
+            # Put back the part of the prefix that is no longer shared in front of every suffix
+            moved = prefix[len(shared):]
+            self.suffixes = [moved + suffix for suffix in self.suffixes]
+            self.prefix = prefix = shared
+
+        return element[len(prefix):]
+
+    def _tighten(self) -> None:
+        """
+        Move whatever the suffixes now all start with into the prefix.
+        :return: None
+        """
+        suffixes = self.suffixes
+        if not suffixes:
+            return
+
+        extra = common_prefix(suffixes[0], suffixes[-1])
+        if extra:
+            self.prefix += extra
+            cut = len(extra)
+            self.suffixes = [suffix[cut:] for suffix in suffixes]
+
+    def __len__(self) -> int:
+        return len(self.suffixes)
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.prefix.__add__, self.suffixes)
+
+    def __getitem__(self, index: int | slice) -> 'str | PrefixElements':
+        if isinstance(index, slice):
+            # A slice can share more than the whole list did
+            part = PrefixElements()
+            part.prefix = self.prefix
+            part.suffixes = self.suffixes[index]
+            part._tighten()
+            return part
+
+        return self.prefix + self.suffixes[index]
+
+    def __setitem__(self, index: int, element: str) -> None:
+        suffix = self._suffix(element)
+        self.suffixes[index] = suffix
+
+    def insert(self, index: int, element: str) -> None:
+        suffix = self._suffix(element)
+        self.suffixes.insert(index, suffix)
+
+    def append(self, element: str) -> None:
+        suffix = self._suffix(element)
+        self.suffixes.append(suffix)
+
+    def pop(self, index: int = -1) -> str:
+        return self.prefix + self.suffixes.pop(index)
+
+    def __iadd__(self, elements: Iterable[str]) -> 'PrefixElements':
+        for element in elements:
+            self.append(element)
+        return self
+
+    def __add__(self, elements: Iterable[str]) -> 'PrefixElements':
+        return PrefixElements([*self, *elements])
+
+    def __radd__(self, elements: Iterable[str]) -> 'PrefixElements':
+        return PrefixElements([*elements, *self])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, PrefixElements)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PrefixElements({list(self)!r})"
+
+
+class PrefixBTNode(BTNode):
+    """
+    Class representing a B-Tree node whose elements are front coded, so the prefix they share is stored once per node
+    instead of once per key, and searches compare only the suffixes.
+    """
+
+    __slots__ = ()
+
+    @property
+    def elements(self) -> PrefixElements:
+        return _ELEMENTS_SLOT.__get__(self)
+
+    @elements.setter
+    def elements(self, elements: Iterable[str]) -> None:
+        if not isinstance(elements, PrefixElements):
+            elements = PrefixElements(elements)
+        _ELEMENTS_SLOT.__set__(self, elements)
+
+    def search(self, search_elem: str) -> tuple[int, bool]:
+        """
+        Binary search function for B-Tree node, on the suffixes after the node prefix.
+        :param search_elem: Element to search for.
+        :return: Index of element/location to traverse to, True if found, False otherwise.
+        """
+        # Same search as PrefixElements.search, inlined since it runs on every node of every descent
+        elements = _ELEMENTS_SLOT.__get__(self)
+        prefix = elements.prefix
+        suffixes = elements.suffixes
+
+        if not search_elem.startswith(prefix):
+            return (0 if search_elem < prefix else len(suffixes)), False
+
+        suffix = search_elem[len(prefix):]
+        index = bisect.bisect_left(suffixes, suffix)
+        return index, index < len(suffixes) and suffixes[index] == suffix
+
+
+class PrefixCompressedBTree(BTree):
+    """
+    Class representing a B-Tree for keys with long shared prefixes, such as URLs, paths or namespaced ids. Every node
+    stores the prefix its keys share once and only the rest of each key.
+    """
+
+    # Class used to create the nodes of the tree
+    node_class = PrefixBTNode
@@ -0,0 +1,292 @@
+import bisect
+import itertools
+import multiprocessing
+from collections.abc import Iterable, Iterator
+
+from btree import DELETED, INSERTED, BTree
+
+# Elements sent back by a shard for each page of a scan
+SCAN_PAGE_SIZE = 4096
+
+
+def boundaries_from_sample(sample: Iterable[str], shards: int) -> list[str]:
+    """
+    Pick shard boundaries that split a sample of the keys into shards of about the same size.
+    :param sample: Keys representative of the ones that will be stored.
+    :param shards: Number of shards.
+    :return: The shards - 1 boundaries, in increasing order.
+    """
+    keys = sorted(set(sample))
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    if len(keys) < shards:
+        raise ValueError("The sample needs at least one distinct key per shard")
+
+    return [keys[len(keys) * shard // shards] for shard in range(1, shards)]
+
+
+def _count(tree: BTree) -> int:
+    """
+    Count the elements of a shard, in O(1) for trees that keep their size.
+    :param tree: Tree of the shard.
+    :return: Number of elements.
+    """
+    try:
+        return len(tree)
+    except TypeError:
+        return sum(1 for _ in tree)
+
+
+def _scan(tree: BTree, lo: str | None, hi: str | None, inclusive: tuple[bool, bool]) -> list[str]:
+    """
+    Read one page of a range scan from a shard.
+    :param tree: Tree of the shard.
+    :param lo: Lower bound, None to start from the smallest element.
+    :param hi: Upper bound, None to run until the largest element.
+    :param inclusive: Whether lo and hi themselves are included.
+    :return: Up to SCAN_PAGE_SIZE elements of the range.
+    """
+    return list(itertools.islice(tree.range(lo, hi, inclusive), SCAN_PAGE_SIZE))
+
+
+def _shard_worker(connection, tree_class: type[BTree], degree: int) -> None:
+    """
+    Serve the requests for one shard until told to stop. Each request is a method name and its arguments, each
+    reply is a success flag and the result or the exception raised.
+    :param connection: End of the pipe to the ShardedBTree.
+    :param tree_class: B-Tree class of the shard.
+    :param degree: Degree of the B-Tree.
+    :return: None
+    """
+    tree = tree_class(degree)
+    handlers = {
+        "insert_many": tree.insert_many,
+        "delete_many": tree.delete_many,
+        "contains_many": lambda elements: [tree.contains(element) for element in elements],
+        "get": tree.get,
+        "scan": lambda lo, hi, inclusive: _scan(tree, lo, hi, inclusive),
+        "count": lambda: _count(tree),
+    }
+
+    while True:
+        command, args = connection.recv()
+        if command == "close":
+            connection.close()
+            return
+
+        try:
+            connection.send((True, handlers[command](*args)))
+        except Exception as error:
+            connection.send((False, error))
+
+
+class ShardedBTree:
+    """
+    Class representing a B-Tree split into range partitioned shards, each one a B-Tree in its own worker process so
+    that work on different shards runs on different cores. Shard i holds the keys from boundaries[i - 1] up to but
+    not including boundaries[i]. Batches are split by shard, sent to every shard before any reply is awaited, and
+    answered in parallel.
+
+    Since the shards cover disjoint, increasing ranges, the k-way merge of their ordered streams is simply each shard's
+    stream in turn, which is how ordered iteration reads them.
+
+    Attributes:
+        boundaries: Smallest key of each shard after the first.
+    """
+
+    def __init__(self, degree: int, boundaries: list[str], tree_class: type[BTree] = BTree) -> None:
+        """
+        Constructor for sharded B-Tree, starting one worker process per shard.
+        :param degree: Degree of the B-Tree of each shard.
+        :param boundaries: Smallest key of each shard after the first, in strictly increasing order.
+        :param tree_class: B-Tree class of the shards.
+        """
+        if any(not boundaries[index - 1] < boundaries[index] for index in range(1, len(boundaries))):
+            raise ValueError("Boundaries must be sorted in strictly increasing order")
+
+        self.boundaries = list(boundaries)
+        self._connections = []
+        self._workers = []
+
+        for _ in range(len(self.boundaries) + 1):
+            parent_end, child_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_shard_worker, args=(child_end, tree_class, degree), daemon=True)
+            worker.start()
+            child_end.close()
+
+            self._connections.append(parent_end)
+            self._workers.append(worker)
+
+    def shard_of(self, element: str) -> int:
+        """
+        Get the shard an element belongs to.
+        :param element: Element to route.
+        :return: Index of the shard.
+        """
+        return bisect.bisect_right(self.boundaries, element)
+
+    def _call(self, requests: dict[int, tuple[str, tuple]]) -> dict[int, object]:
+        """
+        Send requests to shards, then wait for all their replies.
+        :param requests: Method name and arguments by shard.
+        :return: Result by shard.
+        """
+        # Every shard gets its request before any reply is read, so they all work at once
+        for shard, request in requests.items():
+            self._connections[shard].send(request)
+
+        results = {}
+        error = None
+        for shard in requests:
+            is_ok, result = self._connections[shard].recv()
+            if is_ok:
+                results[shard] = result
+            elif error is None:
+                error = result
+
+        if error is not None:
+            raise error
+        return results
+
+    def _partition(self, elements: Iterable[str]) -> dict[int, list[str]]:
+        """
+        Split elements by the shard they belong to.
+        :param elements: Elements to split.
+        :return: Elements by shard, only for shards that got any.
+        """
+        parts = {}
+        for element in elements:
+            parts.setdefault(self.shard_of(element), []).append(element)
+        return parts
+
+    def insert_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Insert a batch of elements, every shard inserting its part at the same time.
+        :param elements: Elements to insert.
+        :return: Each element in sorted order with its outcome, INSERTED or DUPLICATE.
+        """
+        return self._batch("insert_many", elements)
+
+    def delete_many(self, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Delete a batch of elements, every shard deleting its part at the same time.
+        :param elements: Elements to delete.
+        :return: Each element in sorted order with its outcome, DELETED or NOT_FOUND.
+        """
+        return self._batch("delete_many", elements)
+
+    def _batch(self, command: str, elements: Iterable[str]) -> list[tuple[str, str]]:
+        """
+        Run a batch method on every shard with its part of the elements.
+        :param command: insert_many or delete_many.
+        :param elements: Elements of the batch.
+        :return: The outcomes of every shard, in shard order and so in sorted order.
+        """
+        results = self._call({shard: (command, (part,)) for shard, part in self._partition(elements).items()})
+
+        outcomes = []
+        for shard in sorted(results):
+            outcomes += results[shard]
+        return outcomes
+
+    def contains_many(self, elements: Iterable[str]) -> list[bool]:
+        """
+        Check a batch of elements, every shard looking up its part at the same time.
+        :param elements: Elements to search for.
+        :return: For each element in the given order, True if it is in the tree, False otherwise.
+        """
+        batch = list(elements)
+        parts = self._partition(batch)
+        results = self._call({shard: ("contains_many", (part,)) for shard, part in parts.items()})
+
+        # Put the answers back in the order the elements were given
+        found = {}
+        for shard, part in parts.items():
+            found.update(zip(part, results[shard]))
+        return [found[element] for element in batch]
+
+    def insert(self, element: str) -> bool:
+        return self.insert_many([element])[0][1] == INSERTED
+
+    def delete(self, element: str) -> str | None:
+        return element if self.delete_many([element])[0][1] == DELETED else None
+
+    def get(self, element: str, default: str | None = None) -> str | None:
+        shard = self.shard_of(element)
+        return self._call({shard: ("get", (element, default))})[shard]
+
+    def contains(self, element: str) -> bool:
+        return self.contains_many([element])[0]
+
+    def __contains__(self, element: str) -> bool:
+        return self.contains(element)
+
+    def __len__(self) -> int:
+        return sum(self._call({shard: ("count", ()) for shard in range(len(self._connections))}).values())
+
+    def __iter__(self) -> Iterator[str]:
+        return self.range()
+
+    def range(self, lo: str | None = None, hi: str | None = None,
+              inclusive: tuple[bool, bool] = (True, True)) -> Iterator[str]:
+        """
+        Lazily iterate over the elements between lo and hi in order, reading each shard a page at a time.
+        :param lo: Lower bound, None to start from the smallest element.
+        :param hi: Upper bound, None to run until the largest element.
+        :param inclusive: Whether lo and hi themselves are included.
+        :return: An iterator over the ordered elements in the range.
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        first_shard = 0 if lo is None else self.shard_of(lo)
+        last_shard = len(self.boundaries) if hi is None else self.shard_of(hi)
+
+        # The shards are in key order, so chaining their streams is their merge
+        for shard in range(first_shard, last_shard + 1):
+            page_lo, page_inclusive = lo, lo_inclusive
+            while True:
+                page = self._call({shard: ("scan", (page_lo, hi, (page_inclusive, hi_inclusive)))})[shard]
+                yield from page
+                if len(page) < SCAN_PAGE_SIZE:
+                    break
+                # Carry on right after the last element of the page
+                page_lo, page_inclusive = page[-1], False
+
+    def prefix_scan(self, prefix: str, limit: int | None = None) -> Iterator[str]:
+        """
+        Lazily iterate over the elements that start with prefix in order.
+        :param prefix: Prefix the elements must start with.
+        :param limit: Maximum number of elements to yield, None for no limit.
+        :return: An iterator over the ordered elements with the prefix.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        count = 0
+        for element in self.range(prefix):
+            if not element.startswith(prefix):
+                return
+
+            yield element
+
+            count += 1
+            if count == limit:
+                return
+
+    def close(self) -> None:
+        """
+        Stop the worker processes.
+        :return: None
+        """
+        for connection in self._connections:
+            connection.send(("close", ()))
+            connection.close()
+        for worker in self._workers:
+            worker.join()
+        self._connections = []
+        self._workers = []
+
+    def __enter__(self) -> 'ShardedBTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
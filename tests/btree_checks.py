@@ -0,0 +1,63 @@
+def check_btree(test_case, tree):
+    """
+    Assert that a B-Tree keeps its structural invariants.
+    :param test_case: The unittest test case to report failures through.
+    :param tree: The B-Tree to check.
+    :return: The in-order elements of the tree.
+    """
+    if tree.root is None:
+        return []
+
+    leaf_depths = set()
+    elements = []
+
+    def visit(node, depth, is_root):
+        start = len(elements)
+        visit_children(node, depth, is_root)
+        # Counted nodes must know how many elements are in their subtree
+        if hasattr(node, "size"):
+            test_case.assertEqual(node.size, len(elements) - start)
+
+    def visit_children(node, depth, is_root):
+        if not is_root:
+            test_case.assertGreaterEqual(len(node.elements), tree.t - 1)
+        test_case.assertLessEqual(len(node.elements), 2 * tree.t - 1)
+
+        if node.is_leaf:
+            leaf_depths.add(depth)
+            elements.extend(node.elements)
+            return
+
+        test_case.assertEqual(len(node.children), len(node.elements) + 1)
+        for index, child in enumerate(node.children):
+            visit(child, depth + 1, False)
+            if index < len(node.elements):
+                elements.append(node.elements[index])
+
+    visit(tree.root, 0, True)
+
+    test_case.assertEqual(len(leaf_depths), 1)
+    test_case.assertEqual(elements, sorted(set(elements)))
+    return elements
+
+
+def shape(node):
+    """
+    Get the shape of a subtree, the elements of each node in order, to compare trees built apart.
+    :param node: Root of the subtree.
+    :return: The elements of a leaf, [elements, child shapes] for an internal node.
+    """
+    if node.is_leaf:
+        return node.elements
+    return [node.elements, [shape(child) for child in node.children]]
+
+
+def structure(node):
+    """
+    Get the structure of a subtree, to check that an operation left every node in place.
+    :param node: Root of the subtree, None for an empty tree.
+    :return: Nested (id, elements, children) tuples, None for an empty tree.
+    """
+    if node is None:
+        return None
+    return id(node), list(node.elements), [structure(child) for child in node.children]
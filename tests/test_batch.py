@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, BTree, OrderStatisticBTree
+from btree_checks import check_btree
+
+
+class TestBatch(unittest.TestCase):
+    def test_matches_single_operations(self):
+        random.seed(8)
+        for tree_class in (BTree, OrderStatisticBTree):
+            for degree in (2, 3, 5):
+                tree = tree_class(degree)
+                expected = set()
+                for _ in range(40):
+                    batch = [f"w{random.randint(0, 2000):04d}" for _ in range(random.randint(0, 150))]
+                    if random.random() < 0.55:
+                        outcomes = tree.insert_many(batch)
+                        want = []
+                        for word in sorted(batch):
+                            want.append((word, DUPLICATE if word in expected else INSERTED))
+                            expected.add(word)
+                    else:
+                        outcomes = tree.delete_many(batch)
+                        want = []
+                        for word in sorted(batch):
+                            want.append((word, DELETED if word in expected else NOT_FOUND))
+                            expected.discard(word)
+                    self.assertEqual(outcomes, want)
+                    self.assertEqual(check_btree(self, tree), sorted(expected))
+                    if tree_class is OrderStatisticBTree:
+                        self.assertEqual(len(tree), len(expected))
+
+    def test_empty_batches_and_tree(self):
+        tree = BTree(2)
+        self.assertEqual(tree.insert_many([]), [])
+        self.assertEqual(tree.delete_many(["a", "a"]), [("a", NOT_FOUND), ("a", NOT_FOUND)])
+        self.assertEqual(tree.insert_many(["b", "a", "b"]), [("a", INSERTED), ("b", INSERTED), ("b", DUPLICATE)])
+        self.assertEqual(tree.delete_many(["b", "a"]), [("a", DELETED), ("b", DELETED)])
+        self.assertIsNone(tree.root)
@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from bplustree import BPlusTree
+from btree import DELETED, NOT_FOUND
+
+
+def check_bplustree(test_case, tree):
+    """
+    Assert that a B+Tree keeps its structural invariants and that its leaves are linked in order.
+    :param test_case: The unittest test case to report failures through.
+    :param tree: The B+Tree to check.
+    :return: The keys of the tree, in order.
+    """
+    if tree.root is None:
+        test_case.assertEqual(len(tree), 0)
+        return []
+
+    leaves = []
+    leaf_depths = set()
+
+    def visit(node, depth, lower, upper):
+        if node is not tree.root:
+            test_case.assertGreaterEqual(len(node.elements), tree.t - 1)
+        test_case.assertLessEqual(len(node.elements), 2 * tree.t - 1)
+        test_case.assertEqual(list(node.elements), sorted(set(node.elements)))
+        # Separators route keys equal to them to the right
+        for element in node.elements:
+            test_case.assertTrue(lower is None or element >= lower)
+            test_case.assertTrue(upper is None or element < upper)
+
+        if node.is_leaf:
+            leaf_depths.add(depth)
+            leaves.append(node)
+            return
+
+        test_case.assertEqual(len(node.children), len(node.elements) + 1)
+        bounds = [lower] + list(node.elements) + [upper]
+        for index, child in enumerate(node.children):
+            visit(child, depth + 1, bounds[index], bounds[index + 1])
+
+    visit(tree.root, 0, None, None)
+    test_case.assertEqual(len(leaf_depths), 1)
+
+    # Following the links visits the leaves in the same order as the tree does
+    test_case.assertIsNone(leaves[0].prev_leaf)
+    test_case.assertIsNone(leaves[-1].next_leaf)
+    for left, right in zip(leaves, leaves[1:]):
+        test_case.assertIs(left.next_leaf, right)
+        test_case.assertIs(right.prev_leaf, left)
+
+    keys = [key for leaf in leaves for key in leaf.elements]
+    test_case.assertEqual(len(tree), len(keys))
+    return keys
+
+
+class TestBPlusTree(unittest.TestCase):
+    def test_matches_a_set(self):
+        random.seed(21)
+        for degree in (2, 3, 5):
+            tree = BPlusTree(degree)
+            expected = set()
+            for step in range(5000):
+                key = f"k{random.randrange(1500):04d}"
+                choice = random.random()
+                if choice < 0.5:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                elif choice < 0.85:
+                    self.assertEqual(tree.delete(key), key if key in expected else None)
+                    expected.discard(key)
+                else:
+                    self.assertEqual(tree.get(key), key if key in expected else None)
+
+                if step % 500 == 0:
+                    self.assertEqual(check_bplustree(self, tree), sorted(expected))
+
+            self.assertEqual(check_bplustree(self, tree), sorted(expected))
+            self.assertEqual(list(tree), sorted(expected))
+
+            # Emptying the tree goes all the way back to no root
+            for element, outcome in tree.delete_many(list(expected) + ["missing"]):
+                self.assertEqual(outcome, NOT_FOUND if element == "missing" else DELETED)
+            self.assertIsNone(tree.root)
+
+    def test_range_and_prefix_scan(self):
+        keys = [f"key{number:04d}" for number in range(0, 3000, 3)]
+        for degree in (2, 4, 16):
+            tree = BPlusTree.bulk_load(keys, degree, fill_factor=0.7)
+            self.assertEqual(check_bplustree(self, tree), keys)
+
+            for lo, hi in (("key0300", "key0600"), ("key0301", "key0599"), (None, "key0010"), ("key2990", None)):
+                for inclusive in ((True, True), (False, False), (True, False)):
+                    expected = [key for key in keys
+                                if (lo is None or key > lo or (inclusive[0] and key == lo))
+                                and (hi is None or key < hi or (inclusive[1] and key == hi))]
+                    self.assertEqual(list(tree.range(lo, hi, inclusive)), expected)
+
+            self.assertEqual(list(tree.prefix_scan("key12")), [key for key in keys if key.startswith("key12")])
+            self.assertEqual(list(tree.prefix_scan("key1", 4)), ["key1002", "key1005", "key1008", "key1011"])
+            self.assertEqual(list(tree.prefix_scan("key1", 0)), [])
+
+    def test_bulk_load_sizes(self):
+        for degree in (2, 3, 5):
+            for count in range(60):
+                keys = [f"k{number:02d}" for number in range(count)]
+                for fill_factor in (0.1, 0.6, 1.0):
+                    tree = BPlusTree.bulk_load(keys, degree, fill_factor)
+                    self.assertEqual(len(tree), count)
+                    if keys:
+                        self.assertEqual(check_bplustree(self, tree), keys)
+                    else:
+                        self.assertIsNone(tree.root)
+
+        with self.assertRaises(ValueError):
+            BPlusTree.bulk_load(["b", "a"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from btree import DELETED, INSERTED
+from btree_checks import check_btree
+from btree_map import BTreeMap
+from btree_multiset import BTreeMultiset
+from durable_btree import DurableBTree
+
+
+def check_map(test_case, tree):
+    """
+    Assert that a B-Tree map keeps its structural invariants and a value for every key.
+    :param test_case: The unittest test case to report failures through.
+    :param tree: The B-Tree map to check.
+    :return: The (key, value) pairs of the map, in order.
+    """
+    keys = check_btree(test_case, tree)
+    stack = [tree.root] if tree.root else []
+    while stack:
+        node = stack.pop()
+        test_case.assertEqual(len(node.values), len(node.elements))
+        stack += node.children
+
+    items = list(tree.items())
+    test_case.assertEqual([key for key, _ in items], keys)
+    test_case.assertEqual(len(tree), len(keys))
+    return items
+
+
+class TestBTreeMap(unittest.TestCase):
+    def test_matches_a_dict(self):
+        random.seed(23)
+        for degree in (2, 3, 5):
+            tree = BTreeMap(degree)
+            expected = {}
+            for step in range(5000):
+                key = f"k{random.randrange(1500):04d}"
+                choice = random.random()
+                if choice < 0.45:
+                    tree[key] = step
+                    expected[key] = step
+                elif choice < 0.75:
+                    self.assertEqual(tree.pop(key, None), expected.pop(key, None))
+                elif choice < 0.85:
+                    self.assertEqual(tree.setdefault(key, -step), expected.setdefault(key, -step))
+                else:
+                    self.assertEqual(tree.get(key), expected.get(key))
+
+                if step % 500 == 0:
+                    self.assertEqual(check_map(self, tree), sorted(expected.items()))
+
+            self.assertEqual(check_map(self, tree), sorted(expected.items()))
+            self.assertEqual(list(tree.values()), [expected[key] for key in sorted(expected)])
+            self.assertEqual(list(tree.keys()), sorted(expected))
+
+    def test_missing_keys(self):
+        tree = BTreeMap(2)
+        tree["a"] = None
+        self.assertIsNone(tree["a"])
+        self.assertIn("a", tree)
+        with self.assertRaises(KeyError):
+            tree["b"]
+        with self.assertRaises(KeyError):
+            del tree["b"]
+        self.assertEqual(tree.pop("b", 0), 0)
+        del tree["a"]
+        self.assertIsNone(tree.root)
+        self.assertEqual(len(tree), 0)
+
+    def test_batches_and_bulk_load(self):
+        items = [(f"key{number:04d}", number) for number in range(0, 3000, 3)]
+        for degree in (2, 4, 16):
+            tree = BTreeMap.bulk_load(items, degree, fill_factor=0.7)
+            self.assertEqual(check_map(self, tree), items)
+            self.assertEqual(list(tree.items("key0300", "key0330", (False, True))),
+                             [(key, value) for key, value in items if "key0300" < key <= "key0330"])
+
+            # Keys added in a batch have no value until one is put
+            self.assertEqual(tree.insert_many(["key0001", "key0002"]), [("key0001", INSERTED), ("key0002", INSERTED)])
+            self.assertIsNone(tree["key0001"])
+            self.assertEqual(tree.delete_many(["key0000", "key0003"]), [("key0000", DELETED), ("key0003", DELETED)])
+            self.assertEqual(len(tree), len(items))
+            self.assertEqual(tree["key2997"], 2997)
+            check_map(self, tree)
+
+    def test_snapshot_keeps_old_values(self):
+        tree = BTreeMap(2)
+        for number in range(200):
+            tree[f"k{number:03d}"] = number
+
+        snapshot = tree.snapshot()
+        for number in range(0, 200, 2):
+            tree[f"k{number:03d}"] = -number
+        for number in range(1, 200, 4):
+            del tree[f"k{number:03d}"]
+
+        self.assertEqual(list(snapshot.items()),
+                         [(f"k{number:03d}", number) for number in range(200)])
+        self.assertEqual(check_map(self, tree),
+                         [(f"k{number:03d}", -number if number % 2 == 0 else number)
+                          for number in range(200) if number % 4 != 1])
+        self.assertEqual(snapshot.get("k002"), 2)
+
+    def test_dump_and_load_keep_values(self):
+        # Enough data for the keys to be read in several chunks, with the last one running into the values
+        items = [(f"key{number:06d}", number if number % 3 else ("v" * 40, None)) for number in range(40000)]
+        tree = BTreeMap.bulk_load(items, 4, fill_factor=0.6)
+        buffer = io.BytesIO()
+        tree.dump(buffer)
+
+        loaded = BTreeMap.load(io.BytesIO(buffer.getvalue()))
+        self.assertEqual(check_map(self, loaded), items)
+        self.assertEqual(loaded.t, 4)
+        with self.assertRaises(ValueError):
+            BTreeMap.load(io.BytesIO(buffer.getvalue()[:-3]))
+
+        multiset = BTreeMultiset.bulk_load([("a", 2), ("b", 5)], 2)
+        buffer = io.BytesIO()
+        multiset.dump(buffer)
+        loaded = BTreeMultiset.load(io.BytesIO(buffer.getvalue()))
+        self.assertEqual(list(loaded.items()), [("a", 2), ("b", 5)])
+        self.assertEqual(len(loaded), 7)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "map.snapshot")
+            BTreeMap(3).dump(path)
+            self.assertEqual(len(BTreeMap.load(path)), 0)
+
+            # A durable map checkpoints and reopens with its values
+            durable = DurableBTree(directory, 3, tree_class=BTreeMap, checkpoint_every=None)
+            durable.insert_many([f"k{number:03d}" for number in range(300)])
+            durable.checkpoint()
+            durable.close()
+            with DurableBTree(directory, 3, tree_class=BTreeMap) as reopened:
+                self.assertIsInstance(reopened.tree, BTreeMap)
+                self.assertEqual(check_map(self, reopened.tree), [(f"k{number:03d}", None) for number in range(300)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import random
+import unittest
+from collections import Counter
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND
+from btree_checks import check_btree, structure
+from btree_multiset import BTreeMultiset
+
+
+class TestBTreeMultiset(unittest.TestCase):
+    def test_matches_a_counter(self):
+        random.seed(24)
+        for degree in (2, 3, 5):
+            tree = BTreeMultiset(degree)
+            expected = Counter()
+            for step in range(6000):
+                word = f"w{random.randrange(400):03d}"
+                choice = random.random()
+                if choice < 0.55:
+                    self.assertEqual(tree.insert(word), word not in expected)
+                    expected[word] += 1
+                elif choice < 0.9:
+                    self.assertEqual(tree.delete(word), word if word in expected else None)
+                    expected -= Counter([word])
+                else:
+                    self.assertEqual(tree.count(word), expected[word])
+
+                if step % 1000 == 0:
+                    self.assertEqual(check_btree(self, tree), sorted(expected))
+
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(list(tree.items()), sorted(expected.items()))
+            self.assertEqual(list(tree.elements()), sorted(expected.elements()))
+            self.assertEqual(len(tree), expected.total())
+            self.assertEqual(tree.size, len(expected))
+
+    def test_repeats_keep_the_shape(self):
+        tree = BTreeMultiset(2)
+        for number in range(100):
+            tree.insert(f"w{number:03d}")
+        before = structure(tree.root)
+
+        for number in range(0, 100, 3):
+            tree.insert(f"w{number:03d}")
+            tree.insert(f"w{number:03d}")
+        for number in range(0, 100, 3):
+            tree.delete(f"w{number:03d}")
+        self.assertEqual(structure(tree.root), before)
+        self.assertEqual(tree.count("w003"), 2)
+        self.assertEqual(len(tree), 134)
+
+        # Only the last occurrence comes out of the tree
+        tree.delete("w003")
+        self.assertEqual(structure(tree.root), before)
+        tree.delete("w003")
+        self.assertNotIn("w003", tree)
+        self.assertEqual(check_btree(self, tree), [f"w{number:03d}" for number in range(100) if number != 3])
+
+    def test_batches_match_a_counter(self):
+        random.seed(124)
+        for degree in (2, 3, 5):
+            tree = BTreeMultiset(degree)
+            expected = Counter()
+            for step in range(300):
+                batch = [f"w{random.randrange(300):03d}" for _ in range(random.randrange(1, 40))]
+                if step == 150:
+                    frozen, frozen_items = tree.snapshot(), sorted(expected.items())
+
+                if random.random() < 0.55:
+                    outcomes = tree.insert_many(batch)
+                    wanted = []
+                    for element in sorted(batch):
+                        wanted.append((element, DUPLICATE if expected[element] else INSERTED))
+                        expected[element] += 1
+                else:
+                    outcomes = tree.delete_many(batch)
+                    wanted = []
+                    for element in sorted(batch):
+                        wanted.append((element, DELETED if expected[element] else NOT_FOUND))
+                        expected -= Counter([element])
+                self.assertEqual(outcomes, wanted)
+
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(list(tree.items()), sorted(expected.items()))
+            self.assertEqual(len(tree), expected.total())
+            self.assertEqual(tree.size, len(expected))
+            self.assertEqual(list(frozen.items()), frozen_items)
+
+    def test_repeat_batches_keep_the_shape(self):
+        tree = BTreeMultiset(2)
+        tree.insert_many(f"w{number:03d}" for number in range(100))
+        before = structure(tree.root)
+
+        repeats = [f"w{number:03d}" for number in range(0, 100, 3)]
+        self.assertEqual(tree.insert_many(repeats * 2), [(element, DUPLICATE) for element in sorted(repeats * 2)])
+        self.assertEqual(structure(tree.root), before)
+        self.assertEqual(tree.delete_many(repeats), [(element, DELETED) for element in repeats])
+        self.assertEqual(structure(tree.root), before)
+        self.assertEqual(len(tree), 134)
+
+        # The final occurrences come out of the tree
+        tree.delete_many(repeats * 2)
+        self.assertEqual(check_btree(self, tree),
+                         [f"w{number:03d}" for number in range(100) if f"w{number:03d}" not in repeats])
+
+    def test_batches_pop_and_bulk_load(self):
+        tree = BTreeMultiset.bulk_load([("a", 2), ("b", 1), ("c", 5)], 2)
+        self.assertEqual(len(tree), 8)
+        self.assertEqual(tree.insert_many(["d", "a", "d"]), [("a", DUPLICATE), ("d", INSERTED), ("d", DUPLICATE)])
+        self.assertEqual(tree.delete_many(["b", "b", "z"]), [("b", DELETED), ("b", NOT_FOUND), ("z", NOT_FOUND)])
+        self.assertEqual(dict(tree.items()), {"a": 3, "c": 5, "d": 2})
+
+        self.assertEqual(tree.pop("c"), 5)
+        self.assertEqual(tree.pop("c", 1), 1)
+        with self.assertRaises(KeyError):
+            tree.pop("c")
+        tree["a"] = 1
+        self.assertEqual(len(tree), 3)
+
+        # Counts below 1 are rejected, leaving the multiset as it was
+        for count in (0, -3):
+            with self.assertRaises(ValueError):
+                tree.put("x", count)
+            with self.assertRaises(ValueError):
+                BTreeMultiset.bulk_load([("a", 1), ("b", count)], 2)
+        self.assertNotIn("x", tree)
+        self.assertEqual(len(tree), 3)
+
+    def test_snapshot_keeps_old_counts(self):
+        tree = BTreeMultiset(2)
+        for number in range(50):
+            tree.insert(f"w{number:02d}")
+
+        snapshot = tree.snapshot()
+        for number in range(50):
+            tree.insert(f"w{number:02d}")
+        tree.delete("w00")
+        tree.delete("w00")
+
+        self.assertEqual(list(snapshot.values()), [1] * 50)
+        self.assertEqual(list(tree.values()), [2] * 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
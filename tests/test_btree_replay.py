@@ -0,0 +1,43 @@
+import io
+import random
+import unittest
+
+from btree import BTree
+from btree_checks import check_btree
+from btree_replay import replay, write_keys
+
+
+class TestBTreeReplay(unittest.TestCase):
+    def test_matches_commands_applied_one_by_one(self):
+        random.seed(17)
+        lines = [f"{random.choice(('insert', 'delete', 'insert'))} w{random.randint(0, 300):03d}\n"
+                 for _ in range(3000)]
+
+        expected = BTree(3)
+        for line in lines:
+            command, word = line.split()
+            getattr(expected, command)(word)
+
+        for batch_size in (1, 7, 500, 10_000):
+            tree = BTree(3)
+            commands, size = replay(tree, iter(lines), batch_size)
+            self.assertEqual(commands, 3000)
+            self.assertEqual(check_btree(self, tree), list(expected))
+            self.assertEqual(size, len(list(expected)))
+
+    def test_order_within_a_batch_is_kept(self):
+        tree = BTree(2)
+        lines = ["insert a", "delete a", "insert a", "", "insert b", "delete b", "insert c d"]
+        self.assertEqual(replay(tree, lines), (6, 2))
+
+        output = io.StringIO()
+        write_keys(tree, output)
+        self.assertEqual(output.getvalue(), "a\nc d\n")
+
+    def test_malformed_line(self):
+        with self.assertRaisesRegex(ValueError, "Line 2"):
+            replay(BTree(2), ["insert a", "upsert b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from btree import OrderStatisticBTree
+from btree_server import BTreeServer, serve
+
+
+class TestBTreeServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = BTreeServer(OrderStatisticBTree(3))
+        self.listener = await serve(self.server, "127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def request_lines(self, lines, reply_lines):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write("".join(line + "\n" for line in lines).encode())
+        await writer.drain()
+        replies = [(await reader.readline()).decode().rstrip("\n") for _ in range(reply_lines)]
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    async def test_pipelined_requests_answer_in_order(self):
+        lines = [f"insert key{number:03d}" for number in range(200)]
+        lines += ["insert key005", "get key005", "delete key005", "get key005", "delete key005", "insert a b c",
+                  "get a b c", "count", "count key100 key109", "range key010 key012", "range * key001 1",
+                  "prefix key19 3", "bogus", "range onlyone", "count key100"]
+        replies = await self.request_lines(lines, 200 + 21)
+
+        self.assertEqual(replies[:200], ["OK inserted"] * 200)
+        self.assertEqual(replies[200:207], ["OK duplicate", "OK key005", "OK deleted", "NOT_FOUND", "OK not found",
+                                            "OK inserted", "OK a b c"])
+        self.assertEqual(replies[207:209], ["OK 200", "OK 10"])
+        self.assertEqual(replies[209:213], ["OK 3", "key010", "key011", "key012"])
+        self.assertEqual(replies[213:215], ["OK 1", "a b c"])
+        self.assertEqual(replies[215:219], ["OK 3", "key190", "key191", "key192"])
+        self.assertTrue(all(reply.startswith("ERR ") for reply in replies[219:]))
+
+        # The pipelined inserts were applied in a few batch passes, not one pass each
+        self.assertLess(self.server.batches, 20)
+
+    async def test_missing_keys_are_errors(self):
+        replies = await self.request_lines(["insert", "get", "delete", "insert ", "get ", "delete ", "count"], 7)
+        self.assertTrue(all(reply.startswith("ERR ") for reply in replies[:6]))
+        self.assertEqual(replies[6], "OK 0")
+        self.assertEqual(len(self.server.tree), 0)
+
+    async def test_writes_from_many_connections_share_batches(self):
+        async def client(number):
+            return await self.request_lines([f"insert c{number}-{index}" for index in range(20)] + ["insert shared"],
+                                            21)
+
+        results = await asyncio.gather(*(client(number) for number in range(10)))
+        self.assertTrue(all(replies[:20] == ["OK inserted"] * 20 for replies in results))
+        # Exactly one connection got to insert the shared key first
+        self.assertEqual(sorted(replies[20] for replies in results), ["OK duplicate"] * 9 + ["OK inserted"])
+        self.assertEqual(len(self.server.tree), 201)
+        self.assertLess(self.server.batches, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
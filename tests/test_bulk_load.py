@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from btree import BTree
+from btree_checks import check_btree
+
+
+class TestBulkLoad(unittest.TestCase):
+    def test_sizes_and_degrees(self):
+        for degree in (2, 3, 5, 8):
+            for size in (0, 1, 2, 3, degree, 2 * degree - 1, 2 * degree, 50, 333):
+                keys = [f"key{index:05d}" for index in range(size)]
+                tree = BTree.bulk_load(keys, degree)
+                self.assertEqual(check_btree(self, tree), keys)
+
+    def test_fill_factor(self):
+        keys = [f"key{index:05d}" for index in range(500)]
+        for fill_factor in (0.01, 0.5, 0.75, 1.0):
+            tree = BTree.bulk_load(keys, 4, fill_factor=fill_factor)
+            self.assertEqual(check_btree(self, tree), keys)
+
+    def test_mutations_after_load(self):
+        random.seed(1)
+        keys = sorted({f"w{random.randint(0, 10 ** 6)}" for _ in range(400)})
+        for degree in (2, 3, 6):
+            tree = BTree.bulk_load(keys, degree, fill_factor=0.6)
+            expected = set(keys)
+            for _ in range(600):
+                word = f"w{random.randint(0, 10 ** 6)}" if random.random() < 0.5 else random.choice(keys)
+                if random.random() < 0.5:
+                    tree.insert(word)
+                    expected.add(word)
+                else:
+                    tree.delete(word)
+                    expected.discard(word)
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(tree.get_tree_ordered_elems(), sorted(expected))
+
+    def test_rejects_unsorted_input(self):
+        with self.assertRaises(ValueError):
+            BTree.bulk_load(["b", "a"], 2)
+        with self.assertRaises(ValueError):
+            BTree.bulk_load(["a", "a"], 2)
+        with self.assertRaises(ValueError):
+            BTree.bulk_load(["a"], 2, fill_factor=0)
@@ -0,0 +1,109 @@
+import io
+import random
+import threading
+import unittest
+
+from btree import BTree
+from btree_checks import check_btree
+from concurrent_btree import ConcurrentBTree
+
+
+class TestConcurrentBTree(unittest.TestCase):
+    def test_matches_set_single_threaded(self):
+        random.seed(17)
+        for degree in (2, 3, 5):
+            tree = ConcurrentBTree(degree)
+            expected = set()
+            for _ in range(4000):
+                key = f"k{random.randrange(600):03d}"
+                if random.random() < 0.55:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                else:
+                    self.assertEqual(tree.delete(key), key if key in expected else None)
+                    expected.discard(key)
+
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(list(tree), sorted(expected))
+            self.assertEqual(list(tree.range("k100", "k300", (False, True))),
+                             sorted(key for key in expected if "k100" < key <= "k300"))
+            self.assertEqual(list(tree.prefix_scan("k2", limit=5)), sorted(k for k in expected if k[:2] == "k2")[:5])
+            self.assertTrue(all(tree.contains(key) for key in expected))
+
+    def test_threads_read_and_write(self):
+        tree = ConcurrentBTree(3)
+        stable = [f"stable{number:04d}" for number in range(500)]
+        tree.insert_many(stable)
+        errors = []
+
+        def writer(thread_number):
+            generator = random.Random(thread_number)
+            keys = [f"w{thread_number}-{number:04d}" for number in range(400)]
+            for key in keys:
+                tree.insert(key)
+            for key in generator.sample(keys, 200):
+                if tree.delete(key) != key:
+                    errors.append(("delete", key))
+
+        def reader():
+            for _ in range(20):
+                if not all(tree.contains(key) for key in stable[::25]):
+                    errors.append("lookup")
+                scanned = list(tree)
+                # Scans stay ordered and always see the elements nobody touches
+                if scanned != sorted(set(scanned)) or not set(stable) <= set(scanned):
+                    errors.append("scan")
+
+        threads = [threading.Thread(target=writer, args=(number,)) for number in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(check_btree(self, tree)), 500 + 4 * 200)
+
+    def test_whole_tree_reads_during_writes(self):
+        tree = ConcurrentBTree(2)
+        stable = [f"stable{number:04d}" for number in range(300)]
+        tree.insert_many(stable)
+        other = BTree.bulk_load(["stable0000", "zz"], 2)
+        done = threading.Event()
+
+        def writer(thread_number):
+            keys = [f"w{thread_number}-{number:04d}" for number in range(300)]
+            while not done.is_set():
+                for key in keys:
+                    tree.insert(key)
+                for key in keys:
+                    tree.delete(key)
+
+        threads = [threading.Thread(target=writer, args=(number,)) for number in range(3)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(5):
+                # A dump is of one state of the tree, so it loads back into a valid B-Tree
+                buffer = io.BytesIO()
+                tree.dump(buffer)
+                loaded = check_btree(self, BTree.load(io.BytesIO(buffer.getvalue())))
+                self.assertTrue(set(stable) <= set(loaded))
+
+                snapshot = list(tree.snapshot())
+                self.assertEqual(snapshot, sorted(set(snapshot)))
+                self.assertTrue(set(stable) <= set(snapshot))
+
+                for elements in (tree.get_tree_ordered_elems(), list(tree | other)):
+                    self.assertEqual(elements, sorted(set(elements)))
+                    self.assertTrue(set(stable) <= set(elements))
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(check_btree(self, tree), stable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import gc
+import random
+import unittest
+
+from btree import BTree, OrderStatisticBTree
+from btree_checks import check_btree
+
+
+class TestCopyOnWriteSnapshot(unittest.TestCase):
+    def test_snapshot_is_frozen(self):
+        random.seed(15)
+        for tree_class in (BTree, OrderStatisticBTree):
+            for degree in (2, 3, 4):
+                tree = tree_class(degree)
+                expected = set()
+                snapshots = []
+                for step in range(3000):
+                    key = f"k{random.randrange(800):03d}"
+                    if random.random() < 0.55:
+                        tree.insert(key)
+                        expected.add(key)
+                    else:
+                        tree.delete(key)
+                        expected.discard(key)
+
+                    if step % 500 == 0:
+                        snapshots.append((tree.snapshot(), sorted(expected)))
+
+                self.assertEqual(check_btree(self, tree), sorted(expected))
+                for snapshot, elements in snapshots:
+                    self.assertEqual(check_btree(self, snapshot), elements)
+                    self.assertEqual(list(snapshot), elements)
+
+    def test_scan_while_writing(self):
+        keys = [f"key{number:04d}" for number in range(2000)]
+        tree = OrderStatisticBTree.bulk_load(keys, 3)
+
+        scan = tree.snapshot().range("key0500", "key1499")
+        scanned = [next(scan)]
+        random.seed(16)
+        for number in random.sample(range(2000), 900):
+            tree.delete(f"key{number:04d}")
+            tree.insert(f"new{number:04d}")
+            scanned.append(next(scan))
+        scanned.extend(scan)
+
+        # The scan kept going after the snapshot itself was dropped
+        self.assertEqual(scanned, keys[500:1500])
+        self.assertEqual(len(tree), 2000)
+        check_btree(self, tree)
+
+    def test_read_only_view(self):
+        tree = OrderStatisticBTree.bulk_load(["a", "b", "c", "d"], 2)
+        snapshot = tree.snapshot()
+        tree.insert("e")
+        tree.delete("a")
+
+        self.assertEqual(len(snapshot), 4)
+        self.assertEqual(snapshot.select(0), "a")
+        self.assertEqual(snapshot.rank("c"), 2)
+        self.assertEqual(snapshot.count_range("b", "e"), 3)
+        self.assertTrue("a" in snapshot)
+        self.assertEqual(snapshot.get("e", "missing"), "missing")
+        self.assertEqual(list(snapshot.prefix_scan("")), ["a", "b", "c", "d"])
+        for name in ("insert", "delete", "insert_many", "delete_many"):
+            with self.assertRaises(AttributeError):
+                getattr(snapshot, name)
+
+    def test_copies_stop_with_last_snapshot(self):
+        tree = BTree.bulk_load([f"key{number:04d}" for number in range(1000)], 2)
+        root = tree.root
+
+        snapshot = tree.snapshot()
+        tree.insert("key0500x")
+        self.assertIsNot(tree.root, root)
+        self.assertIs(snapshot.root, root)
+
+        del snapshot
+        gc.collect()
+        leftmost_leaf = tree.root
+        while not leftmost_leaf.is_leaf:
+            leftmost_leaf = leftmost_leaf.children[0]
+        tree.insert("key0000x")
+        self.assertIn("key0000x", leftmost_leaf.elements)
+        self.assertIsNone(tree._owned)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import durable_btree
+from btree import OrderStatisticBTree
+from btree_checks import check_btree
+from durable_btree import LOG_FILE, SNAPSHOT_FILE, DurableBTree
+
+
+class TestDurableBTree(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_recovers_without_close(self):
+        random.seed(13)
+        expected = set()
+        tree = DurableBTree(self.directory, 3, checkpoint_every=None)
+        for _ in range(2000):
+            key = f"k{random.randrange(500):03d}"
+            if random.random() < 0.6:
+                tree.insert(key)
+                expected.add(key)
+            else:
+                tree.delete(key)
+                expected.discard(key)
+        tree.insert_many(["batch1", "batch2"])
+        tree.delete_many(["batch2"])
+        expected.add("batch1")
+
+        # Every acknowledged mutation is already on disk, so no close is needed
+        recovered = DurableBTree(self.directory, 3)
+        self.assertEqual(check_btree(self, recovered.tree), sorted(expected))
+        self.assertTrue(recovered.contains("batch1"))
+        recovered.close()
+        tree.log.file.close()
+
+    def test_checkpoint_truncates_log(self):
+        keys = [f"key{number:04d}" for number in range(1000)]
+        with DurableBTree(self.directory, 4, tree_class=OrderStatisticBTree, checkpoint_every=300) as tree:
+            for key in keys:
+                tree.insert(key)
+            for key in keys[:150]:
+                tree.delete(key)
+            # 1150 mutations, the last checkpoint was taken after the 900th
+            self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+            self.assertLess(os.path.getsize(os.path.join(self.directory, LOG_FILE)), 300 * 20)
+
+        with DurableBTree(self.directory, 4, tree_class=OrderStatisticBTree) as tree:
+            self.assertEqual(len(tree), 850)
+            self.assertEqual(tree.select(0), "key0150")
+            self.assertEqual(check_btree(self, tree.tree), keys[150:])
+
+            tree.checkpoint()
+            self.assertEqual(os.path.getsize(os.path.join(self.directory, LOG_FILE)), 0)
+
+        with DurableBTree(self.directory, 4) as tree:
+            self.assertEqual(list(tree), keys[150:])
+
+    def test_unlogged_methods_are_not_passed_through(self):
+        with DurableBTree(self.directory, 2) as tree:
+            tree.insert("a")
+            self.assertEqual(tree.get("a"), "a")
+            self.assertEqual(list(tree.range("a")), ["a"])
+            for name in ("put", "pop", "bulk_load", "load", "snapshot", "_insert", "_delete", "root"):
+                with self.assertRaises(AttributeError):
+                    getattr(tree, name)
+
+    def test_torn_record_is_dropped(self):
+        with DurableBTree(self.directory, 2) as tree:
+            tree.insert_many(["a", "b", "c"])
+
+        # A crash in the middle of an append leaves part of a record behind
+        with open(os.path.join(self.directory, LOG_FILE), "ab") as file:
+            file.write(durable_btree.encode_record(durable_btree.INSERT, "torn")[:-3])
+
+        with DurableBTree(self.directory, 2) as tree:
+            self.assertEqual(list(tree), ["a", "b", "c"])
+            tree.insert("d")
+
+        with DurableBTree(self.directory, 2) as tree:
+            self.assertEqual(list(tree), ["a", "b", "c", "d"])
+
+    def test_group_commit_shares_syncs(self):
+        real_fsync = os.fsync
+
+        def slow_fsync(descriptor):
+            time.sleep(0.002)
+            real_fsync(descriptor)
+
+        with mock.patch("os.fsync", slow_fsync), DurableBTree(self.directory, 3, checkpoint_every=None) as tree:
+            def worker(thread_number):
+                for number in range(25):
+                    self.assertTrue(tree.insert(f"t{thread_number}-{number:02d}"))
+
+            threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(len(list(tree)), 200)
+            self.assertLess(tree.log.syncs, 200)
+            self.assertEqual(tree.log.durable, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
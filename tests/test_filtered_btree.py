@@ -0,0 +1,80 @@
+import random
+import unittest
+
+from btree import DELETED, NOT_FOUND
+from btree_checks import check_btree, structure
+from filtered_btree import CountingBloomFilter, FilteredBTree
+
+
+class TestFilteredBTree(unittest.TestCase):
+    def test_matches_a_set(self):
+        random.seed(18)
+        for degree in (2, 3, 5):
+            tree = FilteredBTree(degree, capacity=16)
+            expected = set()
+            for _ in range(4000):
+                key = f"k{random.randrange(1500):04d}"
+                choice = random.random()
+                if choice < 0.5:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                elif choice < 0.8:
+                    self.assertEqual(tree.delete(key), key if key in expected else None)
+                    expected.discard(key)
+                else:
+                    self.assertEqual(tree.contains(key), key in expected)
+
+            batch = [f"k{random.randrange(3000):04d}" for _ in range(400)]
+            outcomes = tree.delete_many(batch)
+            self.assertEqual([element for element, _ in outcomes], sorted(batch))
+            for element, outcome in outcomes:
+                self.assertEqual(outcome, DELETED if element in expected else NOT_FOUND)
+                expected.discard(element)
+
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(tree.filter.count, len(expected))
+            # The filter grew as the tree did instead of saturating
+            self.assertGreater(tree.filter.capacity, 16)
+
+    def test_batches_crossing_capacity(self):
+        tree = FilteredBTree(3, capacity=10)
+        keys = [f"k{number:03d}" for number in range(100)]
+        for start in (0, 5, 60):
+            tree.insert_many(keys[start:start + 40])
+            self.assertEqual(tree.filter.count, len(tree.get_tree_ordered_elems()))
+
+        tree.delete_many(keys)
+        self.assertEqual(tree.filter.count, 0)
+        self.assertFalse(any(tree.filter.counters))
+
+    def test_definite_miss_leaves_the_tree_alone(self):
+        tree = FilteredBTree.bulk_load([f"key{number:04d}" for number in range(0, 2000, 2)], 2)
+        misses = [f"key{number:04d}" for number in range(1, 2000, 2) if f"key{number:04d}" not in tree.filter]
+        self.assertGreater(len(misses), 900)
+
+        before = structure(tree.root)
+        for key in misses:
+            self.assertIsNone(tree.delete(key))
+        self.assertEqual(tree.delete_many(misses), [(key, NOT_FOUND) for key in misses])
+        self.assertEqual(structure(tree.root), before)
+
+    def test_snapshot_ignores_later_deletes(self):
+        tree = FilteredBTree.bulk_load(["a", "b", "c"], 2)
+        snapshot = tree.snapshot()
+        tree.delete("b")
+        self.assertTrue(snapshot.contains("b"))
+        self.assertFalse(tree.contains("b"))
+
+    def test_stuck_counters(self):
+        bloom = CountingBloomFilter(100)
+        for _ in range(300):
+            bloom.add("stuck")
+        for _ in range(300):
+            bloom.discard("stuck")
+        # Counters that overflowed stay set, so the filter can only err towards maybe
+        self.assertIn("stuck", bloom)
+        self.assertEqual(bloom.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from btree import BTree, OrderStatisticBTree
+from btree_checks import check_btree
+
+
+class CountingBTree(BTree):
+    descents = 0
+
+    def traverse_to_leaf(self, *args, **kwargs):
+        self.descents += 1
+        return super().traverse_to_leaf(*args, **kwargs)
+
+
+class TestFinger(unittest.TestCase):
+    def test_ascending_inserts_skip_the_root(self):
+        tree = CountingBTree(4)
+        keys = [f"id{number:06d}" for number in range(2000)]
+        for key in keys:
+            self.assertTrue(tree.insert(key))
+        self.assertEqual(check_btree(self, tree), keys)
+        # Only inserts that find the finger leaf full walk down from the root
+        self.assertLess(tree.descents, len(keys) // 3)
+        self.assertFalse(tree.insert(keys[-1]))
+        self.assertTrue(all(key in tree for key in keys))
+
+    def test_mixed_operations(self):
+        random.seed(9)
+        for tree_class in (BTree, OrderStatisticBTree):
+            for degree in (2, 3, 5):
+                tree = tree_class(degree)
+                expected = set()
+                counter = 0
+                for _ in range(3000):
+                    roll = random.random()
+                    if roll < 0.4:
+                        counter += random.randint(1, 3)
+                        word = f"w{counter:05d}"
+                        self.assertEqual(tree.insert(word), word not in expected)
+                        expected.add(word)
+                    elif roll < 0.55:
+                        word = f"w{random.randint(0, counter + 5):05d}"
+                        self.assertEqual(tree.insert(word), word not in expected)
+                        expected.add(word)
+                    elif roll < 0.7:
+                        word = f"w{random.randint(0, counter + 5):05d}"
+                        self.assertEqual(tree.delete(word) is not None, word in expected)
+                        expected.discard(word)
+                    else:
+                        word = f"w{random.randint(0, counter + 5):05d}"
+                        self.assertEqual(word in tree, word in expected)
+                        self.assertEqual(tree.get(word), word if word in expected else None)
+                self.assertEqual(check_btree(self, tree), sorted(expected))
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from btree import BTree
+
+
+class TestIteration(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+        self.words = sorted({f"w{random.randint(0, 3000):04d}" for _ in range(400)})
+        self.trees = []
+        for degree in (2, 3, 6):
+            tree = BTree(degree)
+            for word in random.sample(self.words, len(self.words)):
+                tree.insert(word)
+            self.trees.append(tree)
+
+    def test_iter_matches_ordered_elems(self):
+        self.assertEqual(list(BTree(2)), [])
+        for tree in self.trees:
+            self.assertEqual(list(tree), self.words)
+            self.assertEqual(list(tree), tree.get_tree_ordered_elems())
+
+    def test_range_bounds(self):
+        probes = [None, "a", "w0000", "z"] + random.sample(self.words, 20) + [f"w{n:04d}" for n in range(0, 3000, 97)]
+        for tree in self.trees:
+            for _ in range(200):
+                lo, hi = random.choice(probes), random.choice(probes)
+                inclusive = (random.random() < 0.5, random.random() < 0.5)
+                expected = [word for word in self.words
+                            if (lo is None or word > lo or (inclusive[0] and word == lo))
+                            and (hi is None or word < hi or (inclusive[1] and word == hi))]
+                self.assertEqual(list(tree.range(lo, hi, inclusive=inclusive)), expected)
+
+    def test_range_is_lazy(self):
+        tree = self.trees[0]
+        scan = tree.range(self.words[10])
+        self.assertEqual(next(scan), self.words[10])
+        self.assertEqual(next(scan), self.words[11])
+
+    def test_prefix_scan(self):
+        for tree in self.trees:
+            for prefix in ("", "w", "w0", "w01", "w012", "w2999", "x", "a", "w00000"):
+                expected = [word for word in self.words if word.startswith(prefix)]
+                self.assertEqual(list(tree.prefix_scan(prefix)), expected)
+                self.assertEqual(list(tree.prefix_scan(prefix, limit=3)), expected[:3])
+            self.assertEqual(list(tree.prefix_scan("w", limit=0)), [])
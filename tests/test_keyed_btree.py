@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, BTree
+from btree_checks import check_btree
+from keyed_btree import KeyedBTree
+
+
+class TestKeyedBTree(unittest.TestCase):
+    def test_case_folded_strings(self):
+        random.seed(22)
+        for degree in (2, 3, 6):
+            tree = KeyedBTree(degree, key=str.casefold)
+            expected = {}
+            for _ in range(3000):
+                word = "".join(random.choice("aAbB") for _ in range(5))
+                choice = random.random()
+                if choice < 0.5:
+                    self.assertEqual(tree.insert(word), word.casefold() not in expected)
+                    expected.setdefault(word.casefold(), word)
+                elif choice < 0.8:
+                    self.assertEqual(tree.delete(word), expected.pop(word.casefold(), None))
+                else:
+                    self.assertEqual(tree.get(word.upper()), expected.get(word.casefold()))
+
+            self.assertEqual(list(tree), [expected[key] for key in sorted(expected)])
+            self.assertEqual(len(tree), len(expected))
+            self.assertEqual([key for key, _ in check_btree(self, tree._tree)], sorted(expected))
+            self.assertEqual(list(tree.range("AAB", "abA", (True, False))),
+                             [expected[key] for key in sorted(expected) if "aab" <= key < "aba"])
+
+    def test_key_runs_once_per_element(self):
+        calls = []
+
+        def key(record):
+            calls.append(record["id"])
+            return record["id"]
+
+        tree = KeyedBTree(3, key=key)
+        records = [{"id": number} for number in random.Random(7).sample(range(5000), 2000)]
+        for record in records:
+            tree.insert(record)
+        self.assertEqual(len(calls), len(records))
+
+        # Searching compares cached keys, only the probe itself gets a key computed
+        calls.clear()
+        self.assertIs(tree.get({"id": records[5]["id"]}), records[5])
+        self.assertEqual(len(calls), 1)
+
+        # Repeats and batches get their outcome from the pair tree itself, one key per element
+        calls.clear()
+        self.assertFalse(tree.insert({"id": records[0]["id"]}))
+        tree.insert_many(records[:100] + [{"id": 5000 + number} for number in range(100)])
+        tree.delete_many(records[100:300])
+        self.assertEqual(len(calls), 401)
+        self.assertEqual(len(tree), len(records) - 100)
+
+    def test_batches_of_incomparable_records(self):
+        tree = KeyedBTree(2, key=lambda record: record["id"])
+        first, second, third = {"id": 1, "v": "a"}, {"id": 1, "v": "b"}, {"id": 0}
+        self.assertEqual(tree.insert_many([first, second, third]),
+                         [(third, INSERTED), (first, INSERTED), (second, DUPLICATE)])
+        self.assertEqual(tree.delete_many([{"id": 1}, {"id": 1}, {"id": 5}]),
+                         [({"id": 1}, DELETED), ({"id": 1}, NOT_FOUND), ({"id": 5}, NOT_FOUND)])
+        self.assertEqual(list(tree), [third])
+
+    def test_native_keys(self):
+        for keys in (random.Random(1).sample(range(10 ** 6), 500), [number.to_bytes(4, "big") for number in range(500)],
+                     [(number % 7, str(number)) for number in range(500)]):
+            tree = BTree(3)
+            for key in keys:
+                tree.insert(key)
+            self.assertEqual(check_btree(self, tree), sorted(keys))
+            self.assertTrue(all(tree.contains(key) for key in keys))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from btree import BTree
+from btree_checks import check_btree
+
+
+def node_ids(node):
+    if node is None:
+        return []
+    ids = [(id(node), tuple(node.elements))]
+    if not node.is_leaf:
+        for child in node.children:
+            ids += node_ids(child)
+    return ids
+
+
+class TestLookup(unittest.TestCase):
+    def test_empty_tree(self):
+        tree = BTree(2)
+        self.assertFalse(tree.contains("a"))
+        self.assertNotIn("a", tree)
+        self.assertIsNone(tree.get("a"))
+        self.assertEqual(tree.get("a", "missing"), "missing")
+
+    def test_hits_and_misses(self):
+        random.seed(2)
+        for degree in (2, 3, 7):
+            tree = BTree(degree)
+            words = {f"w{random.randint(0, 5000)}" for _ in range(300)}
+            for word in words:
+                tree.insert(word)
+            for probe in (f"w{number}" for number in range(0, 5000, 7)):
+                self.assertEqual(probe in tree, probe in words)
+                self.assertEqual(tree.get(probe), probe if probe in words else None)
+
+    def test_lookup_does_not_restructure(self):
+        random.seed(3)
+        tree = BTree(2)
+        for number in range(200):
+            tree.insert(f"w{number:04d}")
+        before = node_ids(tree.root)
+        for number in range(0, 400, 3):
+            tree.contains(f"w{number:04d}")
+            tree.get(f"w{number:04d}")
+        self.assertEqual(node_ids(tree.root), before)
+        check_btree(self, tree)
@@ -0,0 +1,25 @@
+import unittest
+
+from btree import LEAF_CHILDREN, BTNode, BTree, OrderStatisticBTree
+
+
+class TestNodeLayout(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in (BTNode(), BTNode(True), OrderStatisticBTree.node_class(True)):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaves_share_children(self):
+        tree = BTree(2)
+        for number in range(100):
+            tree.insert(f"w{number:03d}")
+        for number in range(0, 100, 3):
+            tree.delete(f"w{number:03d}")
+
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            if node.is_leaf:
+                self.assertIs(node.children, LEAF_CHILDREN)
+            else:
+                self.assertIsInstance(node.children, list)
+                stack += node.children
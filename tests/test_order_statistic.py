@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from btree import OrderStatisticBTree
+from btree_checks import check_btree
+
+
+class TestOrderStatistic(unittest.TestCase):
+    def test_sizes_follow_mutations(self):
+        random.seed(5)
+        for degree in (2, 3, 5):
+            tree = OrderStatisticBTree(degree)
+            expected = set()
+            for _ in range(1500):
+                word = f"w{random.randint(0, 600):03d}"
+                if random.random() < 0.55:
+                    self.assertEqual(tree.insert(word), word not in expected)
+                    expected.add(word)
+                else:
+                    self.assertEqual(tree.delete(word), word if word in expected else None)
+                    expected.discard(word)
+                self.assertEqual(len(tree), len(expected))
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+
+    def test_rank_select_count_range(self):
+        random.seed(6)
+        words = sorted({f"w{random.randint(0, 5000):04d}" for _ in range(700)})
+        for tree in (OrderStatisticBTree.bulk_load(words, 3, fill_factor=0.7),
+                     OrderStatisticBTree.bulk_load(words, 2)):
+            check_btree(self, tree)
+            for index, word in enumerate(words):
+                self.assertEqual(tree.select(index), word)
+                self.assertEqual(tree.rank(word), index)
+            self.assertEqual(tree.select(-1), words[-1])
+            with self.assertRaises(IndexError):
+                tree.select(len(words))
+
+            for _ in range(200):
+                lo = f"w{random.randint(0, 5000):04d}"
+                hi = f"w{random.randint(0, 5000):04d}"
+                inclusive = (random.random() < 0.5, random.random() < 0.5)
+                self.assertEqual(tree.count_range(lo, hi, inclusive), len(list(tree.range(lo, hi, inclusive))))
+                self.assertEqual(tree.rank(lo), sum(1 for word in words if word < lo))
+            self.assertEqual(tree.count_range(), len(words))
+
+    def test_empty_tree(self):
+        tree = OrderStatisticBTree(2)
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(tree.rank("a"), 0)
+        self.assertEqual(tree.count_range("a", "z"), 0)
+        self.assertIsNone(tree.delete("a"))
+        with self.assertRaises(IndexError):
+            tree.select(0)
@@ -0,0 +1,126 @@
+import os
+import random
+import tempfile
+import unittest
+
+from btree_checks import check_btree
+from paged_btree import PagedBTree, degree_for_page_size
+
+
+class TestPagedBTree(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tree.pages")
+
+    def test_degree_follows_page_size(self):
+        self.assertEqual(degree_for_page_size(128, 20), 2)
+        self.assertGreater(degree_for_page_size(4096, 16), degree_for_page_size(1024, 16))
+        with PagedBTree(self.path, page_size=4096, max_key_bytes=16) as tree:
+            self.assertEqual(tree.t, degree_for_page_size(4096, 16))
+        with self.assertRaises(ValueError):
+            PagedBTree(self.path, page_size=1024)
+
+    def test_reopen_answers_queries(self):
+        random.seed(10)
+        keys = [f"key{number:05d}" for number in random.sample(range(10000), 3000)]
+        with PagedBTree(self.path, page_size=128, max_key_bytes=20) as tree:
+            for key in keys:
+                self.assertTrue(tree.insert(key))
+            self.assertFalse(tree.insert(keys[0]))
+
+        with PagedBTree(self.path) as tree:
+            self.assertEqual(tree.t, 2)
+            # Only the nodes on the path of the lookup are read back
+            self.assertTrue(tree.contains(keys[5]))
+            self.assertLess(len(tree.pager.resident), 20)
+            self.assertFalse(tree.contains("key99999"))
+            self.assertEqual(list(tree.range("key01000", "key01100")),
+                             sorted(key for key in keys if "key01000" <= key <= "key01100"))
+            self.assertEqual(check_btree(self, tree), sorted(keys))
+
+    def test_deletes_reuse_pages(self):
+        random.seed(11)
+        keys = [f"key{number:05d}" for number in range(2000)]
+        with PagedBTree(self.path, page_size=128, max_key_bytes=20, cache_pages=50) as tree:
+            tree.insert_many(keys)
+            removed = random.sample(keys, 1500)
+            for key in removed:
+                self.assertEqual(tree.delete(key), key)
+            self.assertIsNone(tree.delete(removed[0]))
+            page_count = tree.pager.page_count
+
+            tree.insert_many(removed)
+            # Pages released by merges are handed out again before the file grows
+            self.assertLessEqual(tree.pager.page_count, page_count + 10)
+
+        with PagedBTree(self.path, cache_pages=50) as tree:
+            self.assertEqual(list(tree), keys)
+            self.assertEqual([outcome for _, outcome in tree.delete_many(keys)], ["deleted"] * len(keys))
+            self.assertIsNone(tree.root)
+
+        with PagedBTree(self.path) as tree:
+            self.assertIsNone(tree.root)
+            self.assertEqual(list(tree), [])
+
+    def test_small_cache_matches_memory_tree(self):
+        random.seed(12)
+        expected = set()
+        with PagedBTree(self.path, page_size=256, max_key_bytes=16, cache_pages=8) as tree:
+            for _ in range(5000):
+                key = f"k{random.randrange(2000):04d}"
+                if random.random() < 0.6:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                else:
+                    self.assertEqual(tree.delete(key), key if key in expected else None)
+                    expected.discard(key)
+                self.assertLessEqual(len(tree.pager.resident), 8 + 2 * tree.t)
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+
+        with PagedBTree(self.path, cache_pages=8) as tree:
+            self.assertEqual(list(tree), sorted(expected))
+
+    def test_rejects_long_keys(self):
+        with PagedBTree(self.path, page_size=128, max_key_bytes=20) as tree:
+            with self.assertRaises(ValueError):
+                tree.insert("x" * 21)
+            with self.assertRaises(ValueError):
+                tree.insert_many(["a", "y" * 21])
+            self.assertIsNone(tree.root)
+
+    def test_bulk_load_writes_pages(self):
+        keys = [f"key{number:05d}" for number in range(0, 30000, 3)]
+        with PagedBTree.bulk_load(keys, self.path, page_size=128, max_key_bytes=20, fill_factor=0.7) as tree:
+            # Every level below the root was written out and unloaded as it was packed
+            self.assertLessEqual(len(tree.pager.resident) + len(tree.pager.created), 1)
+            self.assertEqual(list(tree.range("key00300", "key00330")), ["key00300", "key00303", "key00306",
+                                                                        "key00309", "key00312", "key00315",
+                                                                        "key00318", "key00321", "key00324",
+                                                                        "key00327", "key00330"])
+            self.assertTrue(tree.insert("key00001"))
+
+        with PagedBTree(self.path, cache_pages=50) as tree:
+            self.assertEqual(check_btree(self, tree), sorted(keys + ["key00001"]))
+
+        with self.assertRaises(ValueError):
+            PagedBTree.bulk_load(["a"], self.path)
+        with self.assertRaises(ValueError):
+            PagedBTree.bulk_load(["b", "a"], self.path + ".unsorted")
+        with self.assertRaises(ValueError):
+            PagedBTree.bulk_load(["x" * 21], self.path + ".long", page_size=128, max_key_bytes=20)
+        with PagedBTree.bulk_load([], self.path + ".empty") as tree:
+            self.assertIsNone(tree.root)
+
+    def test_only_in_place_methods(self):
+        with PagedBTree(self.path) as tree:
+            tree.insert_many(["a", "b"])
+            self.assertIn("a", tree)
+            self.assertEqual(list(tree.prefix_scan("b")), ["b"])
+            for name in ("snapshot", "dump", "load", "union", "get_tree_ordered_elems"):
+                with self.assertRaises(AttributeError):
+                    getattr(tree, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
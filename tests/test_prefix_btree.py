@@ -0,0 +1,76 @@
+import io
+import random
+import unittest
+
+from btree_checks import check_btree
+from prefix_btree import PrefixBTNode, PrefixCompressedBTree, PrefixElements
+
+
+def url(number):
+    return f"https://example.com/{'users' if number % 3 else 'teams'}/{number:05d}/profile"
+
+
+def nodes(node):
+    yield node
+    for child in node.children:
+        yield from nodes(child)
+
+
+class TestPrefixBTree(unittest.TestCase):
+    def test_matches_a_set(self):
+        random.seed(20)
+        for degree in (2, 3, 8):
+            tree = PrefixCompressedBTree(degree)
+            expected = set()
+            for _ in range(4000):
+                key = url(random.randrange(1500))
+                choice = random.random()
+                if choice < 0.55:
+                    self.assertEqual(tree.insert(key), key not in expected)
+                    expected.add(key)
+                elif choice < 0.85:
+                    self.assertEqual(tree.delete(key), key if key in expected else None)
+                    expected.discard(key)
+                else:
+                    self.assertEqual(tree.get(key), key if key in expected else None)
+
+            # Short keys that leave the prefixes force them to shrink
+            for key in ("a", "https://", "zzz"):
+                tree.insert(key)
+                expected.add(key)
+
+            self.assertEqual(check_btree(self, tree), sorted(expected))
+            self.assertEqual(list(tree.range(url(100), url(200))),
+                             sorted(key for key in expected if url(100) <= key <= url(200)))
+
+    def test_nodes_store_shared_prefix_once(self):
+        keys = sorted(url(number) for number in range(3000))
+        tree = PrefixCompressedBTree.bulk_load(keys, 16)
+        for node in nodes(tree.root):
+            self.assertIsInstance(node, PrefixBTNode)
+            self.assertTrue(node.elements.prefix.startswith("https://example.com/"))
+            self.assertTrue(all(len(suffix) < 20 for suffix in node.elements.suffixes))
+
+        # Snapshots load back into front coded nodes
+        snapshot = io.BytesIO()
+        tree.dump(snapshot)
+        snapshot.seek(0)
+        loaded = PrefixCompressedBTree.load(snapshot)
+        self.assertEqual(check_btree(self, loaded), keys)
+        self.assertIsInstance(loaded.root.elements, PrefixElements)
+
+    def test_search_outside_the_prefix(self):
+        elements = PrefixElements(["abc1", "abc2", "abc3"])
+        self.assertEqual(elements.prefix, "abc")
+        self.assertEqual(elements.search("abc2"), (1, True))
+        self.assertEqual(elements.search("ab"), (0, False))
+        self.assertEqual(elements.search("abd"), (3, False))
+        self.assertEqual(elements.search("abc25"), (2, False))
+
+        elements.insert(0, "ab")
+        self.assertEqual(elements.prefix, "ab")
+        self.assertEqual(list(elements), ["ab", "abc1", "abc2", "abc3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from btree import DELETED, NOT_FOUND, BTree, OrderStatisticBTree
+from btree_checks import check_btree, structure
+
+
+class TestProbeDelete(unittest.TestCase):
+    def test_matches_a_set(self):
+        random.seed(19)
+        for tree_class in (BTree, OrderStatisticBTree):
+            for degree in (2, 3, 5):
+                tree = tree_class(degree)
+                tree.probe_deletes = True
+                expected = set()
+                for _ in range(3000):
+                    key = f"k{random.randrange(1200):04d}"
+                    if random.random() < 0.5:
+                        tree.insert(key)
+                        expected.add(key)
+                    else:
+                        self.assertEqual(tree.delete(key), key if key in expected else None)
+                        expected.discard(key)
+
+                batch = [f"k{random.randrange(2400):04d}" for _ in range(300)]
+                for element, outcome in tree.delete_many(batch):
+                    self.assertEqual(outcome, DELETED if element in expected else NOT_FOUND)
+                    expected.discard(element)
+
+                self.assertEqual(check_btree(self, tree), sorted(expected))
+                if tree_class is OrderStatisticBTree:
+                    self.assertEqual(len(tree), len(expected))
+
+    def test_miss_leaves_the_tree_alone(self):
+        keys = [f"key{number:04d}" for number in range(0, 2000, 2)]
+        misses = [f"key{number:04d}" for number in range(1, 2000, 2)]
+
+        tree = BTree.bulk_load(keys, 2, fill_factor=0.1)
+        tree.probe_deletes = True
+        before = structure(tree.root)
+        for key in misses:
+            self.assertIsNone(tree.delete(key))
+        self.assertEqual(tree.delete_many(misses), [(key, NOT_FOUND) for key in misses])
+        self.assertEqual(structure(tree.root), before)
+
+        # Without the probe the same misses merge the minimal nodes on the way down
+        proactive = BTree.bulk_load(keys, 2, fill_factor=0.1)
+        before = structure(proactive.root)
+        for key in misses:
+            proactive.delete(key)
+        self.assertNotEqual(structure(proactive.root), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+from collections import Counter
+
+from btree import BTree, OrderStatisticBTree
+from btree_checks import check_btree
+from btree_map import BTreeMap
+from btree_multiset import BTreeMultiset
+
+
+class TestSetAlgebra(unittest.TestCase):
+    def test_matches_python_sets(self):
+        random.seed(25)
+        for tree_class in (BTree, OrderStatisticBTree):
+            for degree in (2, 3, 16):
+                for size_a, size_b in ((0, 0), (0, 50), (300, 0), (500, 2000), (2000, 40)):
+                    set_a = {f"k{number:05d}" for number in random.sample(range(3000), size_a)}
+                    set_b = {f"k{number:05d}" for number in random.sample(range(3000), size_b)}
+                    tree_a = tree_class.bulk_load(sorted(set_a), degree)
+                    tree_b = BTree.bulk_load(sorted(set_b), 5)
+
+                    for result, expected in ((tree_a | tree_b, set_a | set_b), (tree_a & tree_b, set_a & set_b),
+                                             (tree_a - tree_b, set_a - set_b), (tree_a ^ tree_b, set_a ^ set_b)):
+                        self.assertIs(type(result), tree_class)
+                        self.assertEqual(result.t, degree)
+                        self.assertEqual(check_btree(self, result), sorted(expected))
+                        if tree_class is OrderStatisticBTree:
+                            self.assertEqual(len(result), len(expected))
+
+                    # The operands are left as they were
+                    self.assertEqual(list(tree_a), sorted(set_a))
+                    self.assertEqual(list(tree_b), sorted(set_b))
+
+    def test_merge_marks_sides(self):
+        merged = BTree._merge_sorted(iter(["a", "c", "d", "f"]), (element for element in ["b", "c", "f", "g", "h"]))
+        self.assertEqual(list(merged), [("a", True, False), ("b", False, True), ("c", True, True), ("d", True, False),
+                                        ("f", True, True), ("g", False, True), ("h", False, True)])
+        self.assertEqual(list(BTree._merge_sorted([], ["a"])), [("a", False, True)])
+        self.assertEqual(list(BTree._merge_sorted(["a", "b"], [])), [("a", True, False), ("b", True, False)])
+
+    def test_snapshot_operands(self):
+        tree = BTree.bulk_load([f"k{number:03d}" for number in range(100)], 3)
+        snapshot = tree.snapshot()
+        for number in range(0, 100, 2):
+            tree.delete(f"k{number:03d}")
+        tree.insert("z")
+
+        self.assertEqual(list(tree.union(snapshot)), [f"k{number:03d}" for number in range(100)] + ["z"])
+        self.assertEqual(list(snapshot.difference(tree)), [f"k{number:03d}" for number in range(0, 100, 2)])
+
+    def test_map_values(self):
+        base = BTreeMap.bulk_load([("a", 1), ("b", 2), ("c", 3)], 2)
+        delta = BTreeMap.bulk_load([("b", 20), ("d", 40)], 2)
+
+        self.assertEqual(list((base | delta).items()), [("a", 1), ("b", 20), ("c", 3), ("d", 40)])
+        self.assertEqual(list((base & delta).items()), [("b", 20)])
+        self.assertEqual(list((base - delta).items()), [("a", 1), ("c", 3)])
+        self.assertEqual(len(base ^ delta), 3)
+
+    def test_multiset_counts(self):
+        random.seed(26)
+        counter_a = Counter(f"w{random.randrange(300):03d}" for _ in range(3000))
+        counter_b = Counter(f"w{random.randrange(300):03d}" for _ in range(1000))
+        tree_a = BTreeMultiset.bulk_load(sorted(counter_a.items()), 3)
+        tree_b = BTreeMultiset.bulk_load(sorted(counter_b.items()), 3)
+
+        for result, expected in ((tree_a | tree_b, counter_a | counter_b), (tree_a & tree_b, counter_a & counter_b),
+                                 (tree_a - tree_b, counter_a - counter_b), (tree_a + tree_b, counter_a + counter_b),
+                                 (tree_a ^ tree_b, (counter_a - counter_b) + (counter_b - counter_a))):
+            self.assertEqual(list(result.items()), sorted(expected.items()))
+            self.assertEqual(len(result), expected.total())
+            check_btree(self, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+import sharded_btree
+from btree import DELETED, DUPLICATE, INSERTED, NOT_FOUND, OrderStatisticBTree
+from sharded_btree import ShardedBTree, boundaries_from_sample
+
+
+class TestShardedBTree(unittest.TestCase):
+    def setUp(self):
+        random.seed(18)
+        self.keys = [f"key{number:05d}" for number in random.sample(range(20000), 3000)]
+        self.tree = ShardedBTree(3, boundaries_from_sample(self.keys, 4), OrderStatisticBTree)
+        self.addCleanup(self.tree.close)
+
+    def test_batches_are_routed_to_shards(self):
+        outcomes = self.tree.insert_many(self.keys + self.keys[:10])
+        self.assertEqual([element for element, _ in outcomes], sorted(self.keys + self.keys[:10]))
+        self.assertEqual(sum(outcome == INSERTED for _, outcome in outcomes), 3000)
+        self.assertEqual(sum(outcome == DUPLICATE for _, outcome in outcomes), 10)
+        self.assertEqual(len(self.tree), 3000)
+
+        removed = self.keys[:1000]
+        outcomes = dict(self.tree.delete_many(removed + ["missing"]))
+        self.assertEqual(outcomes["missing"], NOT_FOUND)
+        self.assertTrue(all(outcomes[key] == DELETED for key in removed))
+
+        probe = ["missing"] + self.keys[995:1005]
+        self.assertEqual(self.tree.contains_many(probe), [key in self.keys[1000:] for key in probe])
+        self.assertEqual(self.tree.get(self.keys[2000]), self.keys[2000])
+        self.assertIsNone(self.tree.delete("missing"))
+        self.assertTrue(self.tree.insert("missing"))
+        self.assertIn("missing", self.tree)
+
+    def test_ordered_scans_cross_shards(self):
+        self.tree.insert_many(self.keys)
+        sharded_btree.SCAN_PAGE_SIZE = 100
+        self.addCleanup(setattr, sharded_btree, "SCAN_PAGE_SIZE", 4096)
+
+        self.assertEqual(list(self.tree), sorted(self.keys))
+        lo, hi = self.tree.boundaries[0], self.tree.boundaries[2]
+        self.assertEqual(list(self.tree.range(lo, hi, (False, True))),
+                         sorted(key for key in self.keys if lo < key <= hi))
+        self.assertEqual(list(self.tree.prefix_scan("key1", limit=7)),
+                         sorted(key for key in self.keys if key.startswith("key1"))[:7])
+
+    def test_errors_come_back(self):
+        with ShardedBTree(2, []) as tree:
+            # Raised by sorting the batch inside the worker process
+            with self.assertRaises(TypeError):
+                tree.insert_many([1, "a"])
+            self.assertTrue(tree.insert("a"))
+            self.assertEqual(len(tree), 1)
+        with self.assertRaises(ValueError):
+            boundaries_from_sample(["a"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from btree import BTree, OrderStatisticBTree
+from btree_checks import check_btree, shape
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_round_trip_keeps_shape(self):
+        random.seed(14)
+        for degree in (2, 3, 5):
+            tree = BTree(degree)
+            for number in random.sample(range(5000), 1500):
+                tree.insert(f"key{number:04d}")
+            for number in random.sample(range(5000), 600):
+                tree.delete(f"key{number:04d}")
+
+            buffer = io.BytesIO()
+            tree.dump(buffer)
+            buffer.seek(0)
+            loaded = BTree.load(buffer)
+
+            self.assertEqual(loaded.t, degree)
+            self.assertEqual(shape(loaded.root), shape(tree.root))
+            self.assertEqual(check_btree(self, loaded), list(tree))
+            # The loaded tree is a normal tree that can keep changing
+            self.assertTrue(loaded.insert("zzz"))
+            self.assertEqual(loaded.delete(list(tree)[0]), list(tree)[0])
+            check_btree(self, loaded)
+
+    def test_path_unicode_and_empty(self):
+        keys = sorted(["", "ascii", "naïve", "日本語", "emoji 🌲", "a\nb", "x" * 70000])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.snapshot")
+            OrderStatisticBTree.bulk_load(keys, 2).dump(path)
+            loaded = OrderStatisticBTree.load(path)
+            self.assertEqual(check_btree(self, loaded), keys)
+            self.assertEqual(len(loaded), len(keys))
+            self.assertEqual(loaded.select(3), keys[3])
+
+            BTree(4).dump(path)
+            empty = BTree.load(path)
+            self.assertIsNone(empty.root)
+            self.assertEqual(empty.t, 4)
+
+    def test_rejects_bad_snapshots(self):
+        buffer = io.BytesIO()
+        BTree.bulk_load([f"key{number:04d}" for number in range(500)], 3).dump(buffer)
+        data = buffer.getvalue()
+
+        with self.assertRaises(ValueError):
+            BTree.load(io.BytesIO(b"nope" + data[4:]))
+        with self.assertRaises(ValueError):
+            BTree.load(io.BytesIO(data[:-5]))
+        with self.assertRaises(ValueError):
+            BTree.load(io.BytesIO(data[:10]))
+
+
+if __name__ == "__main__":
+    unittest.main()